@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+
+# System.
+import os
+import csv
+import json
+
+# Arguments.
+import sys
+import argparse
+
+# Data.
+import pandas as pd
+
+# Types.
+from typing import List
+
+# Hyperplanning.
+from hyperplanning import Hyperplanning
+from classroom import Classroom
+
+# Dates.
+from datetime import datetime, timedelta
+from dateutil.tz import tz
+from helper import Helper
+
+# Utility.
+from itertools import accumulate
+
+
+class Analytics:
+    """
+    Occupancy analytics of the schedule system.
+    """
+
+    # The number of seconds in an hour.
+    HOUR = 3600
+
+    # The days of the week.
+    DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+    @staticmethod
+    def __get_busy_intervals(classroom: Classroom, start: float, end: float):
+        """
+        Returns the merged busy intervals of a classroom within a time window.
+
+        :param classroom: The classroom.
+        :param start: The window start timestamp.
+        :param end: The window end timestamp.
+        :return: The sorted list of disjoint busy intervals (as timestamps).
+        """
+        intervals = []
+        if classroom.schedule is None:
+            return intervals
+
+        # Browse sorted courses.
+        for course in classroom.schedule.get_courses_between(int(start), int(end)):
+            course_start = max(course.start, start)
+            course_end = min(course.end, end)
+
+            # Outside of the window.
+            if course_start >= course_end:
+                continue
+
+            # Overlapping course.
+            if intervals and course_start <= intervals[-1][1]:
+                intervals[-1][1] = max(intervals[-1][1], course_end)
+
+            # Disjoint course.
+            else:
+                intervals.append([course_start, course_end])
+
+        return intervals
+
+    @staticmethod
+    def __get_building(classroom: Classroom):
+        """
+        Returns the building alias of a classroom.
+        Falls back to the location alias when the classroom has no building.
+
+        :param classroom: The classroom.
+        :return: The building alias of the classroom.
+        """
+        if classroom.building is not None:
+            return classroom.building.alias
+        if classroom.location is not None:
+            return classroom.location.alias
+        return "NA"
+
+    @staticmethod
+    def __split_hours(start: float, end: float, timezone):
+        """
+        Splits an interval on the hour boundaries of a timezone.
+
+        :param start: The interval start timestamp.
+        :param end: The interval end timestamp.
+        :param timezone: The timezone of the hours.
+        :return: The generator of hours of the week (from 0 to 167) and durations (in seconds).
+        """
+        current = start
+        while current < end:
+            date = datetime.fromtimestamp(current, timezone)
+            boundary = min(date.replace(minute=0, second=0, microsecond=0).timestamp() + Analytics.HOUR, end)
+            yield date.weekday() * 24 + date.hour, boundary - current
+            current = boundary
+
+    @staticmethod
+    def __get_busy_durations(hyperplanning: Hyperplanning, start: datetime, end: datetime):
+        """
+        Returns the busy duration of each classroom within a time window.
+
+        :param hyperplanning: The hyperplanning object.
+        :param start: The window start datetime.
+        :param end: The window end datetime.
+        :return: The list of classrooms and busy durations (in seconds), and the window duration (in seconds).
+        """
+        # Convert the window to timestamps.
+        start = start.astimezone(tz.tzutc()).timestamp()
+        end = end.astimezone(tz.tzutc()).timestamp()
+
+        results = []
+        for classroom in hyperplanning.classrooms:
+            busy = sum(interval_end - interval_start for interval_start, interval_end
+                       in Analytics.__get_busy_intervals(classroom, start, end))
+            results.append((classroom, busy))
+        return results, max(end - start, 1)
+
+    @staticmethod
+    def get_room_occupancy(hyperplanning: Hyperplanning, start: datetime, end: datetime):
+        """
+        Returns the occupancy rate of each classroom within a time window.
+
+        :param hyperplanning: The hyperplanning object.
+        :param start: The window start datetime.
+        :param end: The window end datetime.
+        :return: The list of classroom occupancies.
+        """
+        durations, window = Analytics.__get_busy_durations(hyperplanning, start, end)
+        return [
+            {
+                "name": classroom.name,
+                "building": Analytics.__get_building(classroom),
+                "busy_hours": round(busy / Analytics.HOUR, 2),
+                "ratio": round(busy / window, 4)
+            }
+            for classroom, busy in durations
+        ]
+
+    @staticmethod
+    def get_building_occupancy(hyperplanning: Hyperplanning, start: datetime, end: datetime):
+        """
+        Returns the occupancy rate of each building within a time window.
+
+        :param hyperplanning: The hyperplanning object.
+        :param start: The window start datetime.
+        :param end: The window end datetime.
+        :return: The list of building occupancies.
+        """
+        durations, window = Analytics.__get_busy_durations(hyperplanning, start, end)
+
+        # Aggregate the classrooms by building.
+        buildings = {}
+        for classroom, busy in durations:
+            building = buildings.setdefault(Analytics.__get_building(classroom), {"rooms": 0, "busy": 0})
+            building["rooms"] += 1
+            building["busy"] += busy
+
+        return [
+            {
+                "building": name,
+                "rooms": building["rooms"],
+                "busy_hours": round(building["busy"] / Analytics.HOUR, 2),
+                "ratio": round(building["busy"] / (building["rooms"] * window), 4)
+            }
+            for name, building in buildings.items()
+        ]
+
+    @staticmethod
+    def get_hourly_occupancy(hyperplanning: Hyperplanning, start: datetime, end: datetime):
+        """
+        Returns the occupancy rate of the classrooms for each hour of the week within a time window.
+
+        :param hyperplanning: The hyperplanning object.
+        :param start: The window start datetime.
+        :param end: The window end datetime.
+        :return: The list of hourly occupancies (168 entries, from Monday 0h to Sunday 23h).
+        """
+        # Convert the window to timestamps.
+        local = tz.tzlocal()
+        start_timestamp = start.astimezone(tz.tzutc()).timestamp()
+        end_timestamp = end.astimezone(tz.tzutc()).timestamp()
+
+        # Compute the available seconds of each hour of the week.
+        available = [0.0] * 168
+        for bucket, duration in Analytics.__split_hours(start_timestamp, end_timestamp, local):
+            available[bucket] += duration
+
+        # Compute the busy seconds of each hour of the week.
+        busy = [0.0] * 168
+        for classroom in hyperplanning.classrooms:
+            for interval_start, interval_end in Analytics.__get_busy_intervals(classroom, start_timestamp,
+                                                                               end_timestamp):
+                for bucket, duration in Analytics.__split_hours(interval_start, interval_end, local):
+                    busy[bucket] += duration
+
+        # Compute the occupancy rates.
+        rooms = max(len(hyperplanning.classrooms), 1)
+        return [
+            {
+                "day": Analytics.DAYS[bucket // 24],
+                "hour": bucket % 24,
+                "ratio": round(busy[bucket] / (available[bucket] * rooms), 4) if available[bucket] > 0 else 0.0
+            }
+            for bucket in range(168)
+        ]
+
+    @staticmethod
+    def get_free_places_timeline(hyperplanning: Hyperplanning, start: datetime, end: datetime):
+        """
+        Returns the number of free places of the campus over a time window.
+        The timeline is built by sweeping over the boundaries of all courses.
+
+        :param hyperplanning: The hyperplanning object.
+        :param start: The window start datetime.
+        :param end: The window end datetime.
+        :return: The list of steps of the timeline (each step lasts until the next one).
+        """
+        # Convert the window to timestamps.
+        start = start.astimezone(tz.tzutc()).timestamp()
+        end = end.astimezone(tz.tzutc()).timestamp()
+
+        # Collect the place variations at the course boundaries.
+        total = 0
+        variations = {start: 0}
+        for classroom in hyperplanning.classrooms:
+            if pd.isna(classroom.places):
+                continue
+            places = int(classroom.places)
+            total += places
+            for interval_start, interval_end in Analytics.__get_busy_intervals(classroom, start, end):
+                variations[interval_start] = variations.get(interval_start, 0) - places
+                if interval_end < end:
+                    variations[interval_end] = variations.get(interval_end, 0) + places
+
+        # Sweep over the sorted boundaries.
+        timestamps = sorted(variations)
+        free_places = accumulate((variations[timestamp] for timestamp in timestamps), initial=total)
+        next(free_places)
+
+        local = tz.tzlocal()
+        return [
+            {
+                "date": datetime.fromtimestamp(timestamp, local).isoformat(),
+                "free_places": places
+            }
+            for timestamp, places in zip(timestamps, free_places)
+        ]
+
+    @staticmethod
+    def export_csv(rows: List[dict], path: str):
+        """
+        Exports analytics results to a CSV file.
+
+        :param rows: The analytics results.
+        :param path: The storage path of the CSV file.
+        """
+        with open(path, "w", newline="") as file:
+            if not rows:
+                return
+            writer = csv.DictWriter(file, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    @staticmethod
+    def export_json(rows: List[dict], path: str):
+        """
+        Exports analytics results to a JSON file.
+
+        :param rows: The analytics results.
+        :param path: The storage path of the JSON file.
+        """
+        with open(path, "w") as file:
+            json.dump(rows, file, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def __parse_arguments(arguments):
+        """
+        Parses the arguments.
+
+        :param arguments: The list of arguments.
+        :return: The dictionary of options.
+        """
+        parser = argparse.ArgumentParser(description="Export occupancy analytics of the classrooms.")
+
+        # Window.
+        parser.add_argument("--start", type=Analytics.__parse_datetime, required=True,
+                            help="set the start of the analysis window")
+        parser.add_argument("--end", type=Analytics.__parse_datetime, required=True,
+                            help="set the end of the analysis window")
+
+        # Output.
+        parser.add_argument("-o", "--output", default="analytics", help="set the output folder")
+        parser.add_argument("--format", choices=["csv", "json"], default="csv", help="set the output format")
+
+        # Dataset.
+        parser.add_argument("--dataset", default=None, help="select a dataset (the first dataset by default)")
+
+        # Reload.
+        parser.add_argument("--reload", dest="max_age", action="store_const", const=timedelta(0),
+                            help="force the reloading of schedules")
+        parser.add_argument("--no-reload", dest="max_age", action="store_const", const=None,
+                            help="disable the reloading of schedules")
+        parser.add_argument("--max-age", dest="max_age", type=Analytics.__parse_duration,
+                            help="reload the schedules older than a specified duration")
+        parser.set_defaults(max_age=None, deadline=None)
+
+        # Threads.
+        parser.add_argument("-j", "--threads", type=int, default=os.cpu_count(),
+                            help="set the number of threads to use")
+
+        # Parse the arguments.
+        return vars(parser.parse_args(arguments))
+
+    @staticmethod
+    def __parse_datetime(text: str):
+        """
+        Parses a datetime.
+
+        :param text: The input text.
+        :return: The parsed datetime.
+        """
+        try:
+            return Helper.parse_datetime(text)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(e)
+
+    @staticmethod
+    def __parse_duration(text: str):
+        """
+        Parses a duration.
+
+        :param text: The input text.
+        :return: The parsed duration.
+        """
+        try:
+            return Helper.parse_duration(text)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(e)
+
+    @staticmethod
+    def run():
+        """
+        Runs the analytics export.
+        """
+        # Utility.
+        from application import Application
+
+        # Parse the arguments.
+        options = Analytics.__parse_arguments(sys.argv[1:])
+
+        # Create the hyperplanning.
+        hyperplanning = Application.get_hyperplanning(options)
+
+        # Compute the analytics with the revalidated schedules.
+        Application.wait_for_schedules()
+
+        # Compute the analytics.
+        reports = {
+            "rooms": Analytics.get_room_occupancy,
+            "buildings": Analytics.get_building_occupancy,
+            "hours": Analytics.get_hourly_occupancy,
+            "free_places": Analytics.get_free_places_timeline
+        }
+
+        # Export the analytics.
+        if not os.path.exists(options["output"]):
+            os.makedirs(options["output"])
+        for name, report in reports.items():
+            rows = report(hyperplanning, options["start"], options["end"])
+            path = "{folder}/{name}.{format}".format(folder=options["output"], name=name, format=options["format"])
+            if options["format"] == "csv":
+                Analytics.export_csv(rows, path)
+            else:
+                Analytics.export_json(rows, path)
+            print(f"Exported {path}.")
+
+
+# Run the analytics.
+if __name__ == "__main__":
+    Analytics.run()
@@ -7,10 +7,30 @@ from typing import List
 
 # Hyperplanning.
 from hyperplanning import Hyperplanning
+from availability import Availability
 from classroom import Classroom
+from transitions import TransitionIndex
+from assignment import Assignment
+from registry import Registry
+from fetcher import Fetcher
+from memory import MemoryReport
+from store import Store
+from snapshot import Snapshot
+from changes import ChangeFeed
+from pager import Pager
+
+# Colors.
+from colorama import Fore, Style
+
+# Utility.
+from functools import partial
+
+# Threading.
+from threading import Thread, Lock
 
 # Dates.
-from datetime import datetime
+from datetime import datetime, timedelta
+from time import time
 from helper import Helper
 
 
@@ -19,6 +39,17 @@ class Application:
     Application.
     """
 
+    # The minimum interval between two reloadings of the schedules in watch mode.
+    WATCH_REFRESH = timedelta(minutes=15)
+
+    # The registry of the datasets.
+    registry = None
+
+    # The threads saving the loaded schedules, and the data times of the last saved schedules of each dataset.
+    savers = []
+    saved = {}
+    saved_lock = Lock()
+
     @staticmethod
     def __format_request(hyperplanning: Hyperplanning, options: dict):
         """
@@ -45,6 +76,27 @@ class Application:
         if options["name"] is not None:
             result += f"named '{options['name']}' "
 
+        # Name prefix.
+        if options["name_prefix"] is not None:
+            result += f"with a name starting with '{options['name_prefix']}' "
+
+        # Search.
+        if options["search"] is not None:
+            result += f"matching '{options['search']}' "
+
+        # Proximity.
+        if options["near"] is not None:
+            result += f"near '{options['near']}' "
+
+        # Limit.
+        if options["limit"] is not None:
+            result += f"(at most {options['limit']}) "
+
+        # Archived schedules.
+        if options["as_of"] is not None:
+            as_of = Helper.format_timestamp(int(options["as_of"].timestamp()), "%d/%m/%Y %Hh%M")
+            result += f"according to the schedules of {as_of} "
+
         # Floor.
         if options["floor"] is not None:
             result += f"on the floor {options['floor']} "
@@ -104,81 +156,271 @@ class Application:
 
         return result + ":\n"
 
+    @staticmethod
+    def __format_full_information(availability: Availability, color: bool = False):
+        """
+        Formats the full information about a classroom, between separating lines.
+
+        :param availability: The classroom availability.
+        :param color: Whether to use color on the output.
+        :return: The formatted classroom.
+        """
+        return "=" * 40 + "\n" + availability.classroom.get_full_information(availability, color) + "\n" + "=" * 40
+
+    @staticmethod
+    def __get_classroom_pieces(
+        availabilities: List[Availability],
+        verbose: int = 0,
+        color: bool = False
+    ):
+        """
+        Returns the pieces of a formatted list of classrooms, each classroom being only formatted once rendered.
+
+        :param availabilities: The list of classroom availabilities.
+        :param verbose: The verbosity level of the output.
+        :param color: Whether to use color on the output.
+        :return: The list of pieces (as separator and function formatting the classroom).
+        """
+        # No classrooms.
+        if len(availabilities) == 0:
+            return [("", "No classrooms found.")]
+
+        # Minimum.
+        if verbose == 0:
+            separator = ", "
+            formats = [partial(x.classroom.get_minimum_information, x, color) for x in availabilities]
+
+        # Regular.
+        elif verbose == 1:
+            separator = "\n"
+            formats = [partial(x.classroom.get_regular_information, x, color) for x in availabilities]
+
+        # Full.
+        else:
+            separator = "\n"
+            formats = [partial(Application.__format_full_information, x, color) for x in availabilities]
+
+        return [(separator if index > 0 else "", piece) for index, piece in enumerate(formats)]
+
     @staticmethod
     def __format_classrooms(
-        classrooms: List[Classroom],
-        date: datetime = datetime.now(),
+        availabilities: List[Availability],
         verbose: int = 0,
         color: bool = False
     ):
         """
         Formats a list of classrooms.
 
-        :param classrooms: The list of classrooms.
-        :param date: The date to check for availability.
+        :param availabilities: The list of classroom availabilities.
         :param verbose: The verbosity level of the output.
         :param color: Whether to use color on the output.
         :return: The formatted list of classrooms.
         """
-        # No classrooms.
-        if len(classrooms) == 0:
-            return "No classrooms found."
+        return Pager.join(Application.__get_classroom_pieces(availabilities, verbose, color))
 
-        # Initialize the result.
-        result = ""
+    @staticmethod
+    def get_registry(options: dict):
+        """
+        Returns the registry of the datasets from the environment variables.
+        The registry, and thus its download and parse pools, is shared by the requests of the process.
 
-        # Format the classrooms.
-        for index, classroom in enumerate(classrooms):
-            # Minimum.
-            if verbose == 0:
-                result += classroom.get_minimum_information(date, color)
-                if index < len(classrooms) - 1:
-                    result += ", "
-
-            # Regular.
-            elif verbose == 1:
-                result += classroom.get_regular_information(date, color)
-                if index < len(classrooms) - 1:
-                    result += "\n"
-
-            # Full.
-            else:
-                result += "=" * 40 + "\n"
-                result += classroom.get_full_information(date, color) + "\n"
-                result += "=" * 40
-                if index < len(classrooms) - 1:
-                    result += "\n"
+        :param options: The request options.
+        :return: The registry of the datasets.
+        """
+        if Application.registry is None:
+            # Load the variables.
+            load_dotenv()
+
+            # Create the registry.
+            Application.registry = Registry(
+                Registry.get_datasets(),
+                int(os.getenv("DOWNLOAD_WORKERS") or Fetcher.WORKERS),
+                options["threads"],
+                float(os.getenv("DOWNLOAD_RATE")) if os.getenv("DOWNLOAD_RATE") else None
+            )
+
+        return Application.registry
+
+    @staticmethod
+    def get_download_report(options: dict):
+        """
+        Returns the limits and the observed throughput of the schedule downloads.
 
+        :param options: The request options.
+        :return: The formatted report.
+        """
+        report = Application.get_registry(options).schedule_pools[0].get_report()
+        result = "Downloads : {requests} requests, {errors} errors".format(**report)
+        if report["throughput"] is not None:
+            result += ", {0:.1f} requests/s, {1:.2f} s per request".format(report["throughput"], report["latency"])
+        result += "\nConcurrency : {0:.1f} (at most {1})".format(report["concurrency"], report["workers"])
+        result += "\nRate limit : {0}".format(
+            "{0:g} requests/s".format(report["rate"]) if report["rate"] is not None else "none"
+        )
         return result
 
     @staticmethod
-    def get_classrooms(options: dict):
+    def get_memory_report():
+        """
+        Returns the memory used by the subsystems of the application.
+        Only the allocations made since the start of the tracing are attributed.
+
+        :return: The formatted report.
+        """
+        hyperplannings = list(Application.registry.hyperplannings.values()) if Application.registry is not None else []
+        return MemoryReport().format(hyperplannings)
+
+    @staticmethod
+    def __save_when_loaded(name: str, variables: dict, hyperplanning: Hyperplanning):
+        """
+        Saves the schedules of a dataset in the background, once their loading (or reloading) is finished.
+
+        :param name: The dataset name.
+        :param variables: The environment variables of the dataset.
+        :param hyperplanning: The hyperplanning of the dataset.
+        """
+        if not any(variables[key] for key in ["SCHEDULE_DATABASE", "SCHEDULE_SNAPSHOT", "CHANGE_FEED"]) \
+                and hyperplanning.archive is None:
+            return
+        saver = Thread(target=Application.__save_hyperplanning, args=(name, variables, hyperplanning), daemon=True)
+        saver.start()
+        Application.savers = [saver for saver in Application.savers if saver.is_alive()] + [saver]
+
+    @staticmethod
+    def __save_hyperplanning(name: str, variables: dict, hyperplanning: Hyperplanning):
+        """
+        Saves the loaded schedules of a dataset to its database, snapshot, change feed and archive, once they are loaded.
+        The schedules are only saved if their data has changed since the last saving of the dataset.
+
+        :param name: The dataset name.
+        :param variables: The environment variables of the dataset.
+        :param hyperplanning: The hyperplanning of the dataset.
+        """
+        # Wait for the schedules.
+        hyperplanning.join()
+
+        with Application.saved_lock:
+            # Schedules unchanged since the last saving.
+            times = [
+                (classroom.name, classroom.schedule.data_updated)
+                for classroom in hyperplanning.classrooms if classroom.schedule is not None
+            ]
+            if Application.saved.get(name) == times:
+                return
+            Application.saved[name] = times
+
+            # Save the schedules to the database.
+            if variables["SCHEDULE_DATABASE"]:
+                store = Store(variables["SCHEDULE_DATABASE"])
+                store.save(hyperplanning)
+                store.close()
+
+            # Publish a snapshot of the schedules.
+            if variables["SCHEDULE_SNAPSHOT"]:
+                Snapshot.write(hyperplanning, variables["SCHEDULE_SNAPSHOT"])
+
+            # Record the course changes since the previous refresh.
+            if variables["CHANGE_FEED"]:
+                ChangeFeed(variables["CHANGE_FEED"]).record(hyperplanning)
+
+            # Archive the new versions of the schedules.
+            if hyperplanning.archive is not None:
+                hyperplanning.archive.record(hyperplanning.classrooms)
+
+    @staticmethod
+    def wait_for_schedules():
         """
-        Returns a formatted list of classrooms.
+        Waits for the schedules loading in the background, and for their saving.
+        """
+        if Application.registry is None:
+            return
+        Application.registry.join()
+        for saver in list(Application.savers):
+            saver.join()
+
+    @staticmethod
+    def get_hyperplannings(options: dict, names: List[str]):
+        """
+        Creates the hyperplannings of some datasets.
 
         :param options: The request options.
-        :return: The formatted list of classrooms.
+        :param names: The list of dataset names.
+        :return: The dictionary of hyperplannings, by dataset name.
         """
-        # Load the variables.
-        load_dotenv()
+        # Create the hyperplannings.
+        registry = Application.get_registry(options)
+        hyperplannings = registry.load(names, options["max_age"], options["deadline"])
 
-        # Create the hyperplanning.
-        hyperplanning = Hyperplanning(
-            os.getenv("DATA_FOLDER"),
-            os.getenv("SCHEDULE_FOLDER"),
-            os.getenv("SCHEDULE_URL"),
-            options["threads"],
-            options["reload"]
-        )
+        for name, hyperplanning in hyperplannings.items():
+            variables = registry.datasets[name]
 
-        # Get the description.
-        result = Application.__format_request(
-            hyperplanning,
-            options
-        )
+            # Save the schedules, once they are loaded.
+            Application.__save_when_loaded(name, variables, hyperplanning)
 
-        # Get the classrooms.
-        classrooms = hyperplanning.get_classrooms(
+        return hyperplannings
+
+    @staticmethod
+    def get_hyperplanning(options: dict):
+        """
+        Creates the hyperplanning of the selected dataset (the first dataset by default).
+
+        :param options: The request options.
+        :return: The hyperplanning object.
+        """
+        name = Application.get_registry(options).get_names(options["dataset"])[0]
+        return Application.get_hyperplannings(options, [name])[name]
+
+    @staticmethod
+    def __fan_out_pieces(options: dict, function):
+        """
+        Runs a request on the selected dataset, or on all the datasets, without rendering its result.
+
+        :param options: The request options.
+        :param function: The function returning the pieces of the result of a hyperplanning.
+        :return: The pieces of the result, with a section per dataset if there are several datasets.
+        """
+        # Create the hyperplannings.
+        names = Application.get_registry(options).get_names(options["dataset"])
+        hyperplannings = Application.get_hyperplannings(options, names)
+
+        # Single dataset.
+        if len(names) == 1:
+            return function(hyperplannings[names[0]], options)
+
+        # Several datasets (only the ones with the reference classroom).
+        pieces = []
+        for name in names:
+            hyperplanning = hyperplannings[name]
+            if options["near"] is not None and options["near"] not in hyperplanning.distance_model.positions:
+                continue
+            pieces.append(("\n\n" if pieces else "", f"[{name}]\n"))
+            pieces.extend(function(hyperplanning, options))
+
+        if not pieces:
+            raise ValueError(f"Unknown classroom '{options['near']}'.")
+        return pieces
+
+    @staticmethod
+    def __fan_out(options: dict, function):
+        """
+        Runs a request on the selected dataset, or on all the datasets.
+
+        :param options: The request options.
+        :param function: The function formatting the result of a hyperplanning.
+        :return: The formatted result, with a section per dataset if there are several datasets.
+        """
+        return Pager.join(Application.__fan_out_pieces(options, lambda x, y: [("", function(x, y))]))
+
+    @staticmethod
+    def __get_availabilities(hyperplanning: Hyperplanning, options: dict):
+        """
+        Returns the availabilities of the classrooms matching a request.
+
+        :param hyperplanning: The hyperplanning object.
+        :param options: The request options.
+        :return: The list of availabilities of the matching classrooms.
+        """
+        return hyperplanning.get_classrooms(
             options["name"],
             options["floor"],
             options["sub_building"],
@@ -191,15 +433,473 @@ class Application:
             options["audio"],
             options["available"],
             options["duration"],
-            options["date"]
+            options["date"],
+            options["name_prefix"],
+            options["search"],
+            options["near"],
+            options["limit"],
+            options["as_of"]
         )
 
+    @staticmethod
+    def get_matching_classrooms(hyperplanning: Hyperplanning, options: dict):
+        """
+        Returns the classrooms matching the filters of a request, regardless of their availability.
+
+        :param hyperplanning: The hyperplanning object.
+        :param options: The request options.
+        :return: The list of matching classrooms.
+        """
+        availabilities = Application.__get_availabilities(
+            hyperplanning,
+            dict(options, available=None, duration=None, near=None, limit=None, as_of=None)
+        )
+        return [availability.classroom for availability in availabilities]
+
+    @staticmethod
+    def get_classrooms(options: dict):
+        """
+        Returns a formatted list of classrooms, from the selected dataset or from all the datasets.
+
+        :param options: The request options.
+        :return: The formatted list of classrooms.
+        """
+        return Pager.join(Application.__fan_out_pieces(options, Application.__get_dataset_classroom_pieces))
+
+    @staticmethod
+    def get_classroom_pages(options: dict, size: int = Pager.SIZE):
+        """
+        Returns the pages of a formatted list of classrooms, from the selected dataset or from all the datasets.
+        The classrooms are only formatted once a page holding them is requested.
+
+        :param options: The request options.
+        :param size: The maximum length of a page.
+        :return: The pager of the formatted list of classrooms.
+        """
+        return Pager(Application.__fan_out_pieces(options, Application.__get_dataset_classroom_pieces), size)
+
+    @staticmethod
+    def __get_dataset_classroom_pieces(hyperplanning: Hyperplanning, options: dict):
+        """
+        Returns the pieces of a formatted list of classrooms of a dataset.
+
+        :param hyperplanning: The hyperplanning of the dataset.
+        :param options: The request options.
+        :return: The pieces of the formatted list of classrooms.
+        """
+        # Get the classrooms.
+        classrooms = Application.__get_availabilities(hyperplanning, options)
+
+        return Application.__get_availability_pieces(hyperplanning, options, classrooms)
+
+    @staticmethod
+    def __get_availability_pieces(hyperplanning: Hyperplanning, options: dict, classrooms: List[Availability]):
+        """
+        Returns the pieces of the formatted classrooms of a request on a dataset.
+
+        :param hyperplanning: The hyperplanning of the dataset.
+        :param options: The request options.
+        :param classrooms: The list of availabilities of the classrooms matching the request.
+        :return: The pieces of the formatted list of classrooms (the description first).
+        """
+        # Get the description.
+        pieces = [("", Application.__format_request(hyperplanning, options))]
+
         # Format the classrooms.
-        result += Application.__format_classrooms(
+        pieces.extend(Application.__get_classroom_pieces(
             classrooms,
-            options["date"],
             options["verbose"],
             options["color"]
+        ))
+
+        # Suggest close names.
+        if len(classrooms) == 0 and options["name"] is not None:
+            suggestions = hyperplanning.name_index.get_suggestions(options["name"], 5)
+            if suggestions and options["name"] not in suggestions:
+                pieces.append(("\n", "Did you mean: " + ", ".join(suggestions) + "?"))
+
+        return pieces
+
+    @staticmethod
+    def get_classrooms_batch(options: dict, queries: List[dict]):
+        """
+        Returns the formatted lists of classrooms of several requests at once,
+        from the selected dataset or from all the datasets.
+        The requests share the date and the schedules, and are evaluated in a single pass over each dataset.
+
+        :param options: The common options (date, dataset, reloading and output).
+        :param queries: The filters of each request (the missing filters are taken from the common options).
+        :return: The list of formatted lists of classrooms, for each request.
+        """
+        # Create the hyperplannings.
+        names = Application.get_registry(options).get_names(options["dataset"])
+        hyperplannings = Application.get_hyperplannings(options, names)
+        queries = [
+            dict(options, **{
+                filter_name: value for filter_name, value in query.items()
+                if filter_name in Hyperplanning.QUERY
+            })
+            for query in queries
+        ]
+
+        sections = [[] for _ in queries]
+        for name in names:
+            hyperplanning = hyperplannings[name]
+
+            # Requests of the dataset (only the ones with the reference classroom if there are several datasets).
+            indexes = [
+                index for index, query in enumerate(queries)
+                if len(names) == 1 or query["near"] is None or query["near"] in hyperplanning.distance_model.positions
+            ]
+
+            # Evaluate the requests at once (or one by one on the archived schedules).
+            if options["as_of"] is not None:
+                results = [Application.__get_availabilities(hyperplanning, queries[index]) for index in indexes]
+            else:
+                results = hyperplanning.get_classrooms_batch([
+                    {filter_name: queries[index][filter_name] for filter_name in Hyperplanning.QUERY}
+                    for index in indexes
+                ], options["date"])
+
+            # Format the classrooms.
+            for index, classrooms in zip(indexes, results):
+                result = Pager.join(Application.__get_availability_pieces(hyperplanning, queries[index], classrooms))
+                sections[index].append(f"[{name}]\n" + result if len(names) > 1 else result)
+
+        for query, section in zip(queries, sections):
+            if not section:
+                raise ValueError(f"Unknown classroom '{query['near']}'.")
+        return ["\n\n".join(section) for section in sections]
+
+    @staticmethod
+    def get_changes(options: dict):
+        """
+        Returns a formatted list of the changes of availability of classrooms within a duration,
+        from the selected dataset or from all the datasets.
+
+        :param options: The request options (the availability selects the kind of changes).
+        :return: The formatted list of changes.
+        """
+        return Application.__fan_out(options, Application.__format_dataset_changes)
+
+    @staticmethod
+    def __format_dataset_changes(hyperplanning: Hyperplanning, options: dict):
+        """
+        Returns a formatted list of the changes of availability of classrooms of a dataset.
+
+        :param hyperplanning: The hyperplanning of the dataset.
+        :param options: The request options (the availability selects the kind of changes).
+        :return: The formatted list of changes.
+        """
+        # Get the description.
+        result = Application.__format_request(hyperplanning, dict(options, duration=None, limit=None))
+        result = result[:-2] + f"changing within {Helper.format_duration(options['changes_within'])} :\n"
+
+        # Get the changes.
+        start = int(options["date"].timestamp())
+        end = start + int(options["changes_within"].total_seconds())
+        kind = None
+        if options["available"] is not None:
+            kind = TransitionIndex.AVAILABLE if options["available"] else TransitionIndex.UNAVAILABLE
+        transitions = hyperplanning.transition_index.get_transitions(
+            start,
+            end + 1,
+            Application.get_matching_classrooms(hyperplanning, options),
+            kind
         )
 
-        return result
+        # No changes.
+        if len(transitions) == 0:
+            return result + "No changes found."
+
+        # Format the changes.
+        for timestamp, classroom, kind in transitions:
+            available = kind == TransitionIndex.AVAILABLE
+            result += "{time} | {name} | {color}{status}{reset}\n".format(
+                time=Helper.format_timestamp(timestamp, "%d/%m/%Y %Hh%M"),
+                name=classroom.name,
+                color=(Fore.GREEN if available else Fore.RED) if options["color"] else "",
+                status="Becomes available" if available else "Becomes unavailable",
+                reset=Style.RESET_ALL if options["color"] else ""
+            )
+
+        return result[:-1]
+
+    @staticmethod
+    def get_courses(options: dict):
+        """
+        Returns a formatted list of the courses matching a text on the day of the request date,
+        from the selected dataset or from all the datasets.
+
+        :param options: The request options (the course option being the text to find).
+        :return: The formatted list of courses.
+        """
+        return Application.__fan_out(options, Application.__format_dataset_courses)
+
+    @staticmethod
+    def __format_dataset_courses(hyperplanning: Hyperplanning, options: dict):
+        """
+        Returns a formatted list of the courses matching a text of a dataset.
+
+        :param hyperplanning: The hyperplanning of the dataset.
+        :param options: The request options (the course option being the text to find).
+        :return: The formatted list of courses.
+        """
+        # Get the description.
+        date = options["date"]
+        result = f"Courses matching '{options['course']}' on {date.strftime('%d/%m/%Y')} :\n"
+
+        # Get the courses until the end of the day.
+        end = datetime.combine(date.date() + timedelta(1), datetime.min.time())
+        courses = hyperplanning.course_index.search(
+            options["course"],
+            int(date.timestamp()),
+            int(end.timestamp()),
+            Application.get_matching_classrooms(hyperplanning, options)
+        )
+
+        # No courses.
+        if len(courses) == 0:
+            return result + "No courses found."
+
+        # Format the courses.
+        for classroom, course in courses:
+            result += "{start} - {end} | {name} | {description}\n".format(
+                start=Helper.format_timestamp(course.start, "%Hh%M"),
+                end=Helper.format_timestamp(course.end, "%Hh%M"),
+                name=classroom.name,
+                description=course.description
+            )
+
+        return result[:-1]
+
+    @staticmethod
+    def get_assignment(options: dict):
+        """
+        Returns a formatted assignment of classrooms to the session requests of a file,
+        on the selected dataset (the first dataset by default).
+
+        :param options: The request options (the assign option being the path of the requests file).
+        :return: The formatted assignment, with the reason of each unsatisfied session.
+        """
+        # Read the requests.
+        sessions = Assignment.read_requests(options["assign"])
+
+        # Assign the classrooms.
+        hyperplanning = Application.get_hyperplanning(options)
+        classrooms, reasons = Assignment(hyperplanning).solve(sessions)
+
+        # Format the assignment.
+        unsatisfied = sum(classroom is None for classroom in classrooms)
+        result = "Assignment of {0} sessions ({1} assigned, {2} unsatisfied) :\n".format(
+            len(sessions), len(sessions) - unsatisfied, unsatisfied
+        )
+        for session, classroom, reason in zip(sessions, classrooms, reasons):
+            result += "{start} - {end} | {request} #{number} | {color}{classroom}{reset}\n".format(
+                start=Helper.format_timestamp(session["start"], "%d/%m/%Y %Hh%M"),
+                end=Helper.format_timestamp(session["end"], "%Hh%M"),
+                request=session["request"],
+                number=session["number"],
+                color=(Fore.GREEN if classroom is not None else Fore.RED) if options["color"] else "",
+                classroom=classroom.name if classroom is not None else reason,
+                reset=Style.RESET_ALL if options["color"] else ""
+            )
+
+        return result[:-1]
+
+    @staticmethod
+    def get_change_feeds():
+        """
+        Returns the course change feeds of the datasets.
+
+        :return: The dictionary of change feeds, by dataset name (only the datasets with a change feed).
+        """
+        load_dotenv()
+        return {
+            name: ChangeFeed(variables["CHANGE_FEED"])
+            for name, variables in Registry.get_datasets().items()
+            if variables["CHANGE_FEED"]
+        }
+
+    @staticmethod
+    def format_change(change: dict):
+        """
+        Formats a course change of a change feed.
+
+        :param change: The course change.
+        :return: The formatted change.
+        """
+        course = "{description} | {start} - {end}".format(
+            description=change["description"],
+            start=Helper.format_timestamp(change["start"], "%d/%m/%Y %Hh%M"),
+            end=Helper.format_timestamp(change["end"], "%Hh%M")
+        )
+
+        # Added or removed course.
+        if change["kind"] == ChangeFeed.ADDED:
+            return f"{change['classroom']} | Added | {course}"
+        if change["kind"] == ChangeFeed.REMOVED:
+            return f"{change['classroom']} | Removed | {course}"
+
+        # Moved course.
+        return "{classroom} | Moved from {start} - {end} | {course}".format(
+            classroom=change["classroom"],
+            start=Helper.format_timestamp(change["old_start"], "%d/%m/%Y %Hh%M"),
+            end=Helper.format_timestamp(change["old_end"], "%Hh%M"),
+            course=course
+        )
+
+    @staticmethod
+    def get_suggestions(text: str, limit: int = 10, dataset: str = None):
+        """
+        Returns the classroom names starting with or close to a text.
+        Only the classrooms are loaded, without their schedules.
+
+        :param text: The beginning of the name, or an approximate name.
+        :param limit: The maximum number of suggestions.
+        :param dataset: The dataset name (None for all the datasets).
+        :return: The list of classroom names.
+        """
+        # Load the variables.
+        load_dotenv()
+        datasets = Registry.get_datasets()
+        if dataset is not None and dataset not in datasets:
+            raise ValueError(f"Unknown dataset '{dataset}'.")
+
+        suggestions = []
+        for name, variables in datasets.items():
+            if dataset is not None and name != dataset:
+                continue
+
+            # Create the hyperplanning without the schedules.
+            hyperplanning = Hyperplanning(
+                variables["DATA_FOLDER"],
+                variables["SCHEDULE_FOLDER"],
+                variables["SCHEDULE_URL"],
+                0
+            )
+            suggestions.extend(hyperplanning.name_index.get_suggestions(text, limit))
+
+        return list(dict.fromkeys(suggestions))[:limit]
+
+    @staticmethod
+    def __get_status(availability: Availability):
+        """
+        Returns the status of a classroom availability, regardless of the time elapsed.
+
+        :param availability: The classroom availability.
+        :return: The status of the classroom availability.
+        """
+        return (
+            availability.available,
+            (availability.current_course.description, availability.current_course.start, availability.current_course.end)
+            if availability.current_course is not None else None,
+            (availability.next_course.description, availability.next_course.start, availability.next_course.end)
+            if availability.next_course is not None else None,
+            availability.outdated is not None
+        )
+
+    @staticmethod
+    def __get_next_transition(
+        hyperplanning: Hyperplanning,
+        classrooms: List[Classroom],
+        timestamp: int,
+        duration: timedelta = None
+    ):
+        """
+        Returns the time of the next change of availability among classrooms.
+
+        :param hyperplanning: The hyperplanning object.
+        :param classrooms: The list of classrooms.
+        :param timestamp: The current UTC timestamp.
+        :param duration: The minimum availability duration, if any.
+        :return: The UTC timestamp of the next change, if any.
+        """
+        transitions = [hyperplanning.transition_index.get_next_transition(timestamp, classrooms)]
+
+        # First second below the minimum availability duration before a course.
+        if duration is not None:
+            seconds = int(duration.total_seconds())
+            start = hyperplanning.transition_index.get_next_transition(
+                timestamp + seconds - 1,
+                classrooms,
+                TransitionIndex.UNAVAILABLE
+            )
+            transitions.append(start - seconds + 1 if start is not None else None)
+
+        return min((transition for transition in transitions if transition is not None), default=None)
+
+    @staticmethod
+    def watch_classrooms(options: dict, output=print):
+        """
+        Outputs a list of classrooms, then the classrooms whose availability changes.
+        The schedules are loaded once, and the list is only updated when a course starts or ends,
+        or when a schedule is reloaded.
+
+        :param options: The request options.
+        :param output: The function to output the formatted classrooms.
+        """
+        # Create the hyperplanning.
+        registry = Application.get_registry(options)
+        name = registry.get_names(options["dataset"])[0]
+        hyperplanning = Application.get_hyperplannings(options, [name])[name]
+        output(Application.__format_request(hyperplanning, options)[:-1])
+
+        # Reloading interval.
+        if options["max_age"] is not None:
+            refresh = max(options["max_age"], Application.WATCH_REFRESH).total_seconds()
+            next_refresh = time() + refresh
+        else:
+            next_refresh = None
+
+        statuses = None
+        while True:
+            # Get the classrooms.
+            hyperplanning.updated.clear()
+            date = datetime.now()
+            timestamp = int(date.timestamp())
+            classrooms = Application.__get_availabilities(hyperplanning, dict(options, date=date))
+            new_statuses = {
+                availability.classroom.name: Application.__get_status(availability)
+                for availability in classrooms
+            }
+
+            # Output all the classrooms.
+            if statuses is None:
+                output(Application.__format_classrooms(classrooms, options["verbose"], options["color"]))
+
+            # Output the changes.
+            else:
+                changes = [
+                    availability for availability in classrooms
+                    if statuses.get(availability.classroom.name) != new_statuses[availability.classroom.name]
+                ]
+                removed = [name for name in statuses if name not in new_statuses]
+                if changes or removed:
+                    result = Helper.format_timestamp(timestamp, "%d/%m/%Y %Hh%M") + ":\n"
+                    if changes:
+                        result += Application.__format_classrooms(
+                            changes,
+                            max(options["verbose"], 1),
+                            options["color"]
+                        ) + "\n"
+                    for name in removed:
+                        result += f"{name} | No longer matching\n"
+                    output(result[:-1])
+            statuses = new_statuses
+
+            # Wait for the next change of the classrooms matching the filters.
+            transition = Application.__get_next_transition(
+                hyperplanning,
+                Application.get_matching_classrooms(hyperplanning, dict(options, date=date)),
+                timestamp,
+                options["duration"]
+            )
+            deadlines = [deadline for deadline in [transition, next_refresh] if deadline is not None]
+            hyperplanning.updated.wait(max(min(deadlines) - time(), 0) if deadlines else None)
+
+            # Reload the outdated schedules.
+            if next_refresh is not None and time() >= next_refresh:
+                hyperplanning.refresh()
+                Application.__save_when_loaded(name, registry.datasets[name], hyperplanning)
+                next_refresh = time() + refresh
@@ -0,0 +1,338 @@
+# System.
+import os
+import json
+import zlib
+import hashlib
+
+# Types.
+from typing import List
+
+# Classrooms.
+from classroom import Classroom
+from availability import Availability
+from course import Course
+
+# Dates.
+from datetime import timedelta
+
+# Utility.
+from helper import Helper
+
+# Search.
+from bisect import bisect_right
+from heapq import merge
+from itertools import accumulate
+
+# Cache.
+from collections import OrderedDict
+from threading import Lock
+
+
+class Archive:
+    """
+    Represents an append-only archive of the successive versions of the classroom schedules.
+
+    Each version is the sorted list of courses of a schedule (with the recurring courses expanded),
+    identified by the hash of its content, so that identical versions are only stored once.
+    A version is stored as the courses removed from and added to a previous version of the same classroom,
+    with a complete version every few versions, so that a version is rebuilt from a few records only.
+    The archive folder holds:
+    - the compressed records of the versions (courses.bin),
+    - the location of each record and the version it is based on (versions.jsonl),
+    - the time from which each version is the current version of a classroom (index.jsonl).
+    """
+
+    # The maximum number of records to rebuild a version (a complete version being stored after that).
+    MAX_DEPTH = 16
+
+    # The maximum number of rebuilt versions kept in memory.
+    CACHE = 64
+
+    # The duration after their first occurrence until which the recurring courses without end are expanded.
+    HORIZON = timedelta(365)
+
+    # The locks of the archive folders of the process.
+    __locks = {}
+
+    def __init__(self, folder: str):
+        """
+        Initializes the archive.
+
+        :param folder: The storage folder of the archive.
+        """
+        self.folder = folder
+        self.data_path = os.path.join(folder, "courses.bin")
+        self.versions_path = os.path.join(folder, "versions.jsonl")
+        self.index_path = os.path.join(folder, "index.jsonl")
+        self.versions = {}
+        self.times = {}
+        self.hashes = {}
+        self.cursors = {"versions": 0, "index": 0}
+        self.recorded = {}
+        self.__cache = OrderedDict()
+        self.__lock = Archive.__locks.setdefault(os.path.abspath(folder), Lock())
+
+    @staticmethod
+    def __read_lines(path: str, cursor: int):
+        """
+        Reads the new lines of an append-only file.
+
+        :param path: The storage path of the file.
+        :param cursor: The byte offset of the first line to read.
+        :return: The list of lines in JSON, and the cursor of the next line.
+        """
+        if not os.path.exists(path):
+            return [], cursor
+        with open(path, "rb") as file:
+            file.seek(cursor)
+            data = file.read()
+
+        # Complete lines only (a line may be being written).
+        length = data.rfind(b"\n") + 1
+        return [json.loads(line) for line in data[:length].splitlines() if line.strip()], cursor + length
+
+    def __refresh(self):
+        """
+        Reads the versions and the index entries appended since the last reading.
+        """
+        # Versions.
+        versions, self.cursors["versions"] = self.__read_lines(self.versions_path, self.cursors["versions"])
+        for version in versions:
+            self.versions[version["hash"]] = version
+
+        # Index.
+        entries, self.cursors["index"] = self.__read_lines(self.index_path, self.cursors["index"])
+        for entry in entries:
+            if entry["hash"] in self.versions:
+                self.times.setdefault(entry["classroom"], []).append(entry["time"])
+                self.hashes.setdefault(entry["classroom"], []).append(entry["hash"])
+
+    @staticmethod
+    def __get_hash(courses: List[tuple]):
+        """
+        Returns the content hash of a version.
+
+        :param courses: The sorted list of courses (as start, end and description).
+        :return: The hexadecimal hash.
+        """
+        return hashlib.sha256(json.dumps(courses, ensure_ascii=False, separators=(",", ":")).encode()).hexdigest()
+
+    def __read_record(self, version: dict):
+        """
+        Reads the record of a version.
+
+        :param version: The location of the record.
+        :return: The record (the courses of a complete version, or the courses removed and added).
+        """
+        with open(self.data_path, "rb") as file:
+            file.seek(version["offset"])
+            return json.loads(zlib.decompress(file.read(version["size"])))
+
+    def __get_version(self, version_hash: str):
+        """
+        Rebuilds a version from its records.
+
+        :param version_hash: The content hash of the version.
+        :return: The sorted list of courses (as start, end and description), and the running maximum of their ends.
+        """
+        # Cached version.
+        if version_hash in self.__cache:
+            self.__cache.move_to_end(version_hash)
+            return self.__cache[version_hash]
+
+        # Records from the complete version, or from a cached version.
+        chain = [self.versions[version_hash]]
+        while chain[-1]["parent"] is not None and chain[-1]["parent"] not in self.__cache:
+            chain.append(self.versions[chain[-1]["parent"]])
+        courses = self.__cache[chain[-1]["parent"]][0] if chain[-1]["parent"] is not None else []
+
+        # Apply the records.
+        for version in reversed(chain):
+            record = self.__read_record(version)
+            if "courses" in record:
+                courses = [tuple(course) for course in record["courses"]]
+            else:
+                removed = set(record["removed"])
+                courses = list(merge(
+                    (course for index, course in enumerate(courses) if index not in removed),
+                    (tuple(course) for course in record["added"])
+                ))
+
+        return self.__cache_version(version_hash, courses)
+
+    def __cache_version(self, version_hash: str, courses: List[tuple]):
+        """
+        Keeps a rebuilt version in memory.
+
+        :param version_hash: The content hash of the version.
+        :param courses: The sorted list of courses (as start, end and description).
+        :return: The sorted list of courses, and the running maximum of their ends.
+        """
+        self.__cache[version_hash] = (courses, list(accumulate((course[1] for course in courses), max)))
+        while len(self.__cache) > self.CACHE:
+            self.__cache.popitem(last=False)
+        return self.__cache[version_hash]
+
+    def __write_version(self, courses: List[tuple], version_hash: str, parent: str = None):
+        """
+        Appends a new version to the archive.
+
+        :param courses: The sorted list of courses (as start, end and description).
+        :param version_hash: The content hash of the version.
+        :param parent: The content hash of the previous version of the classroom, if any.
+        :return: The location of the record of the version.
+        """
+        # Complete version, or changes since the previous version.
+        if parent is None or self.versions[parent]["depth"] + 1 >= self.MAX_DEPTH:
+            record = {"courses": courses}
+            parent, depth = None, 0
+        else:
+            removed, added = Helper.diff_sorted(self.__get_version(parent)[0], courses)
+            record = {"removed": removed, "added": added}
+            depth = self.versions[parent]["depth"] + 1
+
+        # Append the record.
+        data = zlib.compress(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode())
+        with open(self.data_path, "ab") as file:
+            offset = file.tell()
+            file.write(data)
+        version = {"hash": version_hash, "parent": parent, "depth": depth, "offset": offset, "size": len(data)}
+
+        # Append the location of the record.
+        with open(self.versions_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(version) + "\n")
+        self.__cache_version(version_hash, courses)
+        return version
+
+    def record(self, classrooms: List[Classroom], timestamp: int = None):
+        """
+        Records the current version of the loaded schedules, from a given time.
+        Only the classrooms whose courses have changed since their last version get a new version.
+
+        :param classrooms: The list of classrooms.
+        :param timestamp: The time from which the versions are current (as a UTC timestamp, defaults to the time
+        of the data of each schedule).
+        :return: The number of classrooms with a new version.
+        """
+        with self.__lock:
+            # Create the archive folder.
+            if not os.path.exists(self.folder):
+                os.makedirs(self.folder, exist_ok=True)
+            self.__refresh()
+
+            entries = []
+            for classroom in classrooms:
+                schedule = classroom.schedule
+                if schedule is None or not schedule.is_loaded():
+                    continue
+
+                # Schedule unchanged since its last recording.
+                if self.recorded.get(classroom.name) == (schedule, schedule.version):
+                    continue
+                self.recorded[classroom.name] = (schedule, schedule.version)
+
+                # Courses unchanged since the current version (expanded independently of the recording time).
+                courses = [
+                    (course.start, course.end, str(course.description))
+                    for course in schedule.get_all_courses(self.HORIZON)
+                ]
+                courses.sort()
+                version_hash = self.__get_hash(courses)
+                hashes = self.hashes.get(classroom.name, [])
+                if hashes and hashes[-1] == version_hash:
+                    continue
+
+                # Store the version once, even if several classrooms or times share it.
+                if version_hash not in self.versions:
+                    self.versions[version_hash] = self.__write_version(
+                        courses, version_hash, hashes[-1] if hashes else None
+                    )
+
+                # Index the version, from the time of its data.
+                time_index = int(schedule.data_updated.timestamp()) if timestamp is None else timestamp
+                time_index = max(time_index, self.times[classroom.name][-1]) if hashes else time_index
+                entries.append({"classroom": classroom.name, "time": time_index, "hash": version_hash})
+                self.times.setdefault(classroom.name, []).append(time_index)
+                self.hashes.setdefault(classroom.name, []).append(version_hash)
+
+            # Append the index entries.
+            if entries:
+                with open(self.index_path, "a", encoding="utf-8") as file:
+                    file.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+                self.cursors["index"] = os.path.getsize(self.index_path)
+            self.cursors["versions"] = os.path.getsize(self.versions_path) if os.path.exists(self.versions_path) else 0
+
+        return len(entries)
+
+    def get_history(self, name: str):
+        """
+        Returns the successive versions of the schedule of a classroom.
+
+        :param name: The classroom name.
+        :return: The list of versions (as the time from which each version is current, and its content hash).
+        """
+        with self.__lock:
+            self.__refresh()
+            return list(zip(self.times.get(name, []), self.hashes.get(name, [])))
+
+    def __get_current_version(self, name: str, as_of: int):
+        """
+        Returns the version of the schedule of a classroom current at a given time.
+
+        :param name: The classroom name.
+        :param as_of: The time of the version (as a UTC timestamp).
+        :return: The sorted list of courses and the running maximum of their ends, if the classroom had a version then.
+        """
+        with self.__lock:
+            self.__refresh()
+            index = bisect_right(self.times.get(name, []), as_of) - 1
+            if index < 0:
+                return None
+            return self.__get_version(self.hashes[name][index])
+
+    def get_courses(self, name: str, as_of: int):
+        """
+        Returns the courses of the version of the schedule of a classroom current at a given time.
+
+        :param name: The classroom name.
+        :param as_of: The time of the version (as a UTC timestamp).
+        :return: The sorted list of courses (as start, end and description), if the classroom had a version then.
+        """
+        version = self.__get_current_version(name, as_of)
+        return version[0] if version is not None else None
+
+    def get_availability(self, classroom: Classroom, timestamp: int, as_of: int):
+        """
+        Returns the availability of a classroom at a given time, according to the version of its schedule
+        current at another time.
+
+        :param classroom: The classroom.
+        :param timestamp: The UTC timestamp to check.
+        :param as_of: The time of the version (as a UTC timestamp).
+        :return: The availability of the classroom.
+        """
+        # No version at that time.
+        version = self.__get_current_version(classroom.name, as_of)
+        if version is None:
+            return Availability(classroom, timestamp, None, None, None, timedelta(0), timedelta(0))
+        courses, ends = version
+
+        # Courses that started before the time, and first of these courses that has not ended yet.
+        index = bisect_right(courses, (timestamp, float("inf")))
+        current_index = bisect_right(ends, timestamp, 0, index)
+        current_course = None
+        if current_index < index:
+            current_course = Course(courses[current_index][2], courses[current_index][0], courses[current_index][1])
+
+        # First course that starts after the time.
+        next_course = Course(courses[index][2], courses[index][0], courses[index][1]) if index < len(courses) else None
+
+        return Availability(
+            classroom,
+            timestamp,
+            current_course is None,
+            current_course,
+            next_course,
+            timedelta(seconds=next_course.start - timestamp) if next_course is not None else timedelta(365),
+            timedelta(seconds=current_course.end - timestamp) if current_course is not None else timedelta(0)
+        )
@@ -0,0 +1,264 @@
+# System.
+import os
+import csv
+
+# Data.
+import pandas as pd
+
+# Types.
+from typing import List
+
+# Hyperplanning.
+from hyperplanning import Hyperplanning
+from classroom import Classroom
+
+# Dates.
+from helper import Helper
+
+# Utility.
+from collections import deque
+
+
+class Assignment:
+    """
+    Represents the assignment of classrooms to a batch of session requests.
+
+    The sessions are split into the connected components of their interval graph, which never share a classroom
+    at the same time. Within a component, the sessions starting at the same time are matched to the free classrooms
+    with the Hopcroft-Karp algorithm (the smallest classrooms first), and keep their classroom until they end.
+
+    Each matching is only maximum for its start time: the assignment is greedy over the start times of a component,
+    and does not always satisfy the largest number of sessions (which is NP-hard with the classroom constraints).
+    """
+
+    # The filters of the requests file (the other columns being the name, the start, the end and the count).
+    FILTERS = ["floor", "sub_building", "building", "location", "places", "outlets", "computers", "projector", "audio"]
+
+    # The filters with a number value.
+    NUMBERS = ["floor", "places", "outlets", "computers"]
+
+    # The reasons of the unsatisfied requests.
+    NO_MATCH = "No classroom matches the constraints."
+    NO_FREE = "No matching classroom is free."
+    CONFLICT = "The free matching classrooms are assigned to other sessions."
+
+    def __init__(self, hyperplanning: Hyperplanning):
+        """
+        Initializes the assignment.
+
+        :param hyperplanning: The hyperplanning object.
+        """
+        self.hyperplanning = hyperplanning
+        self.positions = {classroom: position for position, classroom in enumerate(hyperplanning.classrooms)}
+
+    @staticmethod
+    def read_requests(path: str):
+        """
+        Reads the session requests from a CSV file.
+        Each request has a name, a start and an end (e.g. '01/02/2021 14h00'), an optional number of sessions,
+        and optional filters (with 'Yes' or 'No' for the projector and the audio system).
+
+        :param path: The storage path of the requests file.
+        :return: The list of sessions.
+        """
+        if not os.path.isfile(path):
+            raise ValueError(f"Unknown requests file '{path}'.")
+
+        sessions = []
+        with open(path, newline="", encoding="utf-8") as file:
+            for line, row in enumerate(csv.DictReader(file), 2):
+                try:
+                    # Time window.
+                    start = int(Helper.parse_datetime(row["start"]).timestamp())
+                    end = int(Helper.parse_datetime(row["end"]).timestamp())
+                    if end <= start:
+                        raise ValueError("The end must be after the start.")
+
+                    # Filters.
+                    filters = {}
+                    for filter_name in Assignment.FILTERS:
+                        value = (row.get(filter_name) or "").strip()
+                        if not value:
+                            continue
+                        if filter_name in Assignment.NUMBERS:
+                            filters[filter_name] = int(value)
+                        elif filter_name in ["projector", "audio"]:
+                            filters[filter_name] = value == "Yes"
+                        else:
+                            filters[filter_name] = value
+                    count = int(row.get("count") or 1)
+
+                # Invalid request.
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ValueError(f"Invalid request in '{path}' (line {line}). {e}")
+
+                # Create the sessions.
+                for number in range(1, count + 1):
+                    sessions.append({
+                        "request": row.get("name") or f"Line {line}",
+                        "number": number,
+                        "start": start,
+                        "end": end,
+                        "filters": filters
+                    })
+        return sessions
+
+    @staticmethod
+    def get_components(sessions: List[dict]):
+        """
+        Returns the connected components of the interval graph of the sessions.
+
+        :param sessions: The list of sessions.
+        :return: The list of components (the indexes of their sessions, by start time).
+        """
+        components = []
+        end = None
+        for index in sorted(range(len(sessions)), key=lambda x: (sessions[x]["start"], sessions[x]["end"])):
+            # Disjoint session.
+            if end is None or sessions[index]["start"] >= end:
+                components.append([])
+                end = sessions[index]["end"]
+
+            # Overlapping session.
+            else:
+                end = max(end, sessions[index]["end"])
+            components[-1].append(index)
+        return components
+
+    @staticmethod
+    def match(adjacency: List[List[int]]):
+        """
+        Returns a maximum matching of the sessions to the classrooms (Hopcroft-Karp algorithm).
+
+        :param adjacency: The classrooms of each session, by order of preference.
+        :return: The matched classroom of each session (None if unmatched).
+        """
+        matches = [None] * len(adjacency)
+        owners = {}
+
+        def augment(session: int):
+            for classroom in adjacency[session]:
+                owner = owners.get(classroom)
+                if owner is None or (layers[owner] == layers[session] + 1 and augment(owner)):
+                    matches[session] = classroom
+                    owners[classroom] = session
+                    return True
+            layers[session] = None
+            return False
+
+        while True:
+            # Layers of the alternating paths from the unmatched sessions (breadth-first search).
+            layers = [0 if match is None else None for match in matches]
+            queue = deque(session for session, match in enumerate(matches) if match is None)
+            found = False
+            while queue:
+                session = queue.popleft()
+                for classroom in adjacency[session]:
+                    owner = owners.get(classroom)
+                    if owner is None:
+                        found = True
+                    elif layers[owner] is None:
+                        layers[owner] = layers[session] + 1
+                        queue.append(owner)
+
+            # Maximum matching.
+            if not found:
+                return matches
+
+            # Augmenting paths along the layers (depth-first search).
+            for session, match in enumerate(matches):
+                if match is None and layers[session] is not None:
+                    augment(session)
+
+    def __get_candidates(self, sessions: List[dict]):
+        """
+        Returns the classrooms matching the filters of each session, the smallest first.
+
+        :param sessions: The list of sessions.
+        :return: The list of matching classroom positions, for each session.
+        """
+        # Check each distinct set of filters once.
+        filter_sets = list({tuple(sorted(session["filters"].items())): None for session in sessions})
+        results = self.hyperplanning.get_classrooms_batch([
+            dict(filters, available=None) for filters in filter_sets
+        ])
+
+        # Smallest classrooms first (the classrooms without a number of places last).
+        places = [
+            float("inf") if pd.isna(classroom.places) else classroom.places
+            for classroom in self.hyperplanning.classrooms
+        ]
+        candidates = {}
+        for filters, availabilities in zip(filter_sets, results):
+            positions = [self.positions[availability.classroom] for availability in availabilities]
+            candidates[filters] = sorted(positions, key=lambda x: (places[x], x))
+        return [candidates[tuple(sorted(session["filters"].items()))] for session in sessions]
+
+    @staticmethod
+    def __is_free(classroom: Classroom, start: int, end: int):
+        """
+        Checks if a classroom has no course within a time window.
+
+        :param classroom: The classroom.
+        :param start: The window start (as a UTC timestamp).
+        :param end: The window end (as a UTC timestamp).
+        :return: Whether the classroom is known to be free.
+        """
+        if classroom.schedule is None or not classroom.schedule.is_loaded():
+            return False
+        return len(classroom.schedule.get_courses_between(start, end)) == 0
+
+    def solve(self, sessions: List[dict]):
+        """
+        Assigns classrooms to sessions, greedily by start time.
+
+        :param sessions: The list of sessions.
+        :return: The assigned classroom of each session (None if unsatisfied), and why each session is unsatisfied.
+        """
+        classrooms = self.hyperplanning.classrooms
+        matching = self.__get_candidates(sessions)
+        assigned = [None] * len(sessions)
+        reasons = [None] * len(sessions)
+
+        # Free matching classrooms of each session.
+        free = {}
+        candidates = []
+        for index, session in enumerate(sessions):
+            window = (session["start"], session["end"])
+            for position in matching[index]:
+                if (position, window) not in free:
+                    free[(position, window)] = self.__is_free(classrooms[position], *window)
+            candidates.append([position for position in matching[index] if free[(position, window)]])
+
+        for component in self.get_components(sessions):
+            # Sessions starting at the same time.
+            groups = {}
+            for index in component:
+                groups.setdefault(sessions[index]["start"], []).append(index)
+
+            held = {}
+            for start, group in groups.items():
+                # Classrooms still held by the previous sessions.
+                held = {position: end for position, end in held.items() if end > start}
+
+                # Match the sessions to the remaining classrooms.
+                matches = self.match([
+                    [position for position in candidates[index] if position not in held]
+                    for index in group
+                ])
+                for index, position in zip(group, matches):
+                    if position is not None:
+                        assigned[index] = classrooms[position]
+                        held[position] = sessions[index]["end"]
+
+        # Reasons of the unsatisfied sessions.
+        for index in range(len(sessions)):
+            if assigned[index] is None:
+                if not matching[index]:
+                    reasons[index] = self.NO_MATCH
+                elif not candidates[index]:
+                    reasons[index] = self.NO_FREE
+                else:
+                    reasons[index] = self.CONFLICT
+
+        return assigned, reasons
@@ -0,0 +1,38 @@
+# Types.
+from typing import NamedTuple, Optional
+
+# Courses.
+from course import Course
+
+# Dates.
+from datetime import timedelta
+
+
+class Availability(NamedTuple):
+    """
+    Represents the availability of a classroom at a given time.
+    """
+
+    # The classroom.
+    classroom: "Classroom"
+
+    # The time of the availability (as a UTC timestamp).
+    timestamp: int
+
+    # Whether the classroom is available (None if the schedule could not be loaded).
+    available: Optional[bool]
+
+    # The current course, if any.
+    current_course: Optional[Course]
+
+    # The next course, if any.
+    next_course: Optional[Course]
+
+    # The duration until the next course, if any.
+    available_duration: timedelta
+
+    # The duration until the end of the current course, if any.
+    unavailable_duration: timedelta
+
+    # The age of the schedule data, if it is outdated.
+    outdated: Optional[timedelta] = None
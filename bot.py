@@ -2,18 +2,26 @@
 
 # System.
 import os
+import asyncio
+import shlex
 from dotenv import load_dotenv
 
 # Discord.
+import discord
 from discord.ext import commands
 from discord.ext.commands import DefaultHelpCommand, CommandInvokeError
 from discord_argparse import ArgumentConverter, OptionalArgument, InvalidArgumentValueError, UnknownArgumentError
 
 # Utility.
 from application import Application
+from availability import Availability
+from notifier import Notifier, Subscription
+from memory import MemoryReport
+from pager import Pager
+from collections import OrderedDict
 
 # Dates.
-from datetime import datetime
+from datetime import datetime, timedelta
 from helper import Helper
 
 
@@ -73,6 +81,11 @@ hyperplanning_parser = ArgumentConverter(
         doc="Filters classrooms by availability at a specified date.",
         default=None
     ),
+    as_of=OptionalArgument(
+        str,
+        doc="Checks the availability on the archived schedules of a specified date.",
+        default=None
+    ),
     duration=OptionalArgument(
         str,
         doc="Filters classrooms by minimum availability duration.",
@@ -83,6 +96,16 @@ hyperplanning_parser = ArgumentConverter(
         doc="Filters classrooms by name.",
         default=None
     ),
+    name_prefix=OptionalArgument(
+        str,
+        doc="Filters classrooms by name prefix or glob pattern.",
+        default=None
+    ),
+    search=OptionalArgument(
+        str,
+        doc="Finds classrooms by approximate name, description or location.",
+        default=None
+    ),
     floor=OptionalArgument(
         int,
         doc="Filters classrooms by floor.",
@@ -103,6 +126,21 @@ hyperplanning_parser = ArgumentConverter(
         doc="Filters classrooms by location.",
         default=None
     ),
+    course=OptionalArgument(
+        str,
+        doc="Finds the courses of the day matching a text (e.g. a course, group or teacher).",
+        default=None
+    ),
+    near=OptionalArgument(
+        str,
+        doc="Sorts classrooms by distance from a specified classroom.",
+        default=None
+    ),
+    limit=OptionalArgument(
+        int,
+        doc="Sets the maximum number of classrooms to show.",
+        default=None
+    ),
     places=OptionalArgument(
         int,
         doc="Filters classrooms by minimum number of places.",
@@ -128,11 +166,26 @@ hyperplanning_parser = ArgumentConverter(
         doc="Filters classrooms by audio system availability.",
         default=None
     ),
+    dataset=OptionalArgument(
+        str,
+        doc="Selects a dataset (all the datasets by default).",
+        default=None
+    ),
     reload=OptionalArgument(
         bool,
         doc="Forces the reloading of schedules.",
         default=True
     ),
+    max_age=OptionalArgument(
+        str,
+        doc="Reloads the schedules older than a duration (using the cached ones meanwhile).",
+        default=None
+    ),
+    deadline=OptionalArgument(
+        str,
+        doc="Sets the maximum duration to wait for the schedules.",
+        default=None
+    ),
     verbose=OptionalArgument(
         int,
         doc="Enables a more detailed output (from 0 to 2).",
@@ -141,18 +194,32 @@ hyperplanning_parser = ArgumentConverter(
 )
 
 
+# The interval between two checks of the course change feeds (in seconds).
+CHANGES_INTERVAL = 60
+
+# The task posting the course changes.
+changes_task = None
+
+
 @bot.event
 async def on_ready():
     """
-    Notifies the administrator that the bot is ready.
+    Notifies the administrator that the bot is ready, and starts posting the course changes.
     """
+    global changes_task
     print(f"{bot.user.name} has been connected to Discord!")
 
+    # Post the course changes to the channel.
+    if os.getenv("CHANGES_CHANNEL") and changes_task is None:
+        changes_task = bot.loop.create_task(post_changes(int(os.getenv("CHANGES_CHANNEL"))))
 
-@bot.command()
-async def hyperplanning(ctx, *, options: hyperplanning_parser = hyperplanning_parser.defaults()):
+
+def parse_options(options: dict):
     """
-    Shows a list of available classrooms according to the specified filters.
+    Parses the options of a command.
+
+    :param options: The options of the command.
+    :return: The parsed options.
     """
     # Default.
     for name in hyperplanning_parser.arguments.keys():
@@ -165,10 +232,24 @@ async def hyperplanning(ctx, *, options: hyperplanning_parser = hyperplanning_pa
     else:
         options["date"] = datetime.now()
 
+    # Archived schedules.
+    if options["as_of"] is not None:
+        options["as_of"] = Helper.parse_datetime(options["as_of"])
+
     # Duration.
     if options["duration"] is not None:
         options["duration"] = Helper.parse_duration(options["duration"])
 
+    # Reload.
+    if options["max_age"] is not None:
+        options["max_age"] = Helper.parse_duration(options["max_age"])
+    elif options["reload"]:
+        options["max_age"] = timedelta(0)
+
+    # Deadline.
+    if options["deadline"] is not None:
+        options["deadline"] = Helper.parse_duration(options["deadline"])
+
     # Availability.
     if options["all"]:
         options["available"] = None
@@ -177,14 +258,253 @@ async def hyperplanning(ctx, *, options: hyperplanning_parser = hyperplanning_pa
     options["threads"] = os.cpu_count()
     options["color"] = False
 
+    return options
+
+
+async def parse_filters(ctx, line: str):
+    """
+    Parses the filters written on a line of a command, without the default values of the other filters.
+
+    :param ctx: The context of the command.
+    :param line: The line of filters.
+    :return: The parsed filters.
+    """
+    options = parse_options(await hyperplanning_parser.convert(ctx, line))
+
+    # Written filters (the availability being set by the "all" filter too).
+    names = {argument.split("=")[0].lower() for argument in shlex.split(line) if "=" in argument}
+    if "all" in names:
+        names.add("available")
+    return {name: options[name] for name in names if name in options}
+
+
+# The reactions to browse the pages of a response.
+PREVIOUS_PAGE = "\u25c0\ufe0f"
+NEXT_PAGE = "\u25b6\ufe0f"
+
+# The maximum length of a page (leaving room for the page number in a message of at most 2000 characters).
+PAGE_SIZE = 1980
+
+# The maximum number of responses whose pages can be browsed.
+PAGED_RESPONSES = 64
+
+# The responses whose pages can be browsed, by message identifier (as pager and current page number).
+paged_responses = OrderedDict()
+
+
+def format_page(pager: Pager, number: int):
+    """
+    Formats a page of a response, with the page number if there are several pages.
+
+    :param pager: The pager of the response.
+    :param number: The page number (from 0).
+    :return: The formatted page.
+    """
+    page = pager.get_page(number)
+    count = pager.get_count()
+    if count == 1:
+        return page
+    return f"{page}\n\nPage {number + 1}/{count if count is not None else '...'}"
+
+
+async def send_pages(ctx, pager: Pager):
+    """
+    Sends the first page of a response, with reactions to browse the next pages.
+
+    :param ctx: The context of the command.
+    :param pager: The pager of the response.
+    """
+    message = await ctx.send(format_page(pager, 0))
+    if pager.get_count() == 1:
+        return
+
+    # Keep the response to render the other pages on demand.
+    paged_responses[message.id] = [pager, 0]
+    while len(paged_responses) > PAGED_RESPONSES:
+        paged_responses.popitem(last=False)
+    for emoji in [PREVIOUS_PAGE, NEXT_PAGE]:
+        await message.add_reaction(emoji)
+
+
+@bot.event
+async def on_reaction_add(reaction, user):
+    """
+    Shows the previous or the next page of a response.
+    """
+    # Not a page reaction.
+    if user == bot.user or reaction.message.id not in paged_responses:
+        return
+    if str(reaction.emoji) not in [PREVIOUS_PAGE, NEXT_PAGE]:
+        return
+
+    # Render the page.
+    response = paged_responses[reaction.message.id]
+    number = response[1] + (1 if str(reaction.emoji) == NEXT_PAGE else -1)
+    try:
+        if response[0].get_page(number) is not None:
+            response[1] = number
+            await reaction.message.edit(content=format_page(response[0], number))
+
+        # Let the user react again (only possible in a server).
+        if isinstance(reaction.message.channel, discord.abc.GuildChannel):
+            await reaction.remove(user)
+    except discord.DiscordException as e:
+        print(e)
+
+
+@bot.command()
+async def hyperplanning(ctx, *, options: hyperplanning_parser = hyperplanning_parser.defaults()):
+    """
+    Shows a list of available classrooms according to the specified filters.
+    """
+    # Parse the options.
+    options = parse_options(options)
+
+    # Get the classrooms (formatted page by page), or their courses.
+    if options["course"] is not None:
+        pager = Pager.from_text(Application.get_courses(options), PAGE_SIZE)
+    else:
+        pager = Application.get_classroom_pages(options, PAGE_SIZE)
+
+    # Send the classrooms.
+    await send_pages(ctx, pager)
+
+
+# The notifiers of the available classrooms by dataset, each sharing a long-lived hyperplanning.
+notifiers = {}
+notifier_lock = asyncio.Lock()
+
+
+async def send_notification(subscription: Subscription, availability: Availability):
+    """
+    Notifies a user that a classroom is available.
+
+    :param subscription: The subscription of the user.
+    :param availability: The availability of the classroom.
+    """
+    ctx = subscription.context
+    try:
+        await ctx.send(f"{ctx.author.mention} {availability.classroom.get_regular_information(availability)}"[:2000])
+    except discord.DiscordException as e:
+        print(e)
+
+
+async def get_notifier(dataset: str = None):
+    """
+    Returns the notifier of a dataset, loading the schedules on first use.
+
+    :param dataset: The dataset name (the first dataset by default).
+    :return: The notifier.
+    """
+    async with notifier_lock:
+        if dataset not in notifiers:
+            # Load the schedules without blocking the bot.
+            options = {
+                "threads": os.cpu_count(),
+                "max_age": Application.WATCH_REFRESH,
+                "deadline": None,
+                "dataset": dataset
+            }
+            shared_hyperplanning = await bot.loop.run_in_executor(None, Application.get_hyperplanning, options)
+
+            # Start the notifier.
+            notifiers[dataset] = Notifier(shared_hyperplanning, send_notification, Application.WATCH_REFRESH)
+            bot.loop.create_task(notifiers[dataset].run())
+    return notifiers[dataset]
+
+
+async def post_changes(channel_id: int):
+    """
+    Posts the new course changes of the change feeds to a channel.
+    The changes of the schedules reloaded by the notifiers are recorded first.
+
+    :param channel_id: The identifier of the channel.
+    """
+    feeds = Application.get_change_feeds()
+    cursors = {name: feed.get_cursor() for name, feed in feeds.items()}
+
+    while True:
+        await asyncio.sleep(CHANGES_INTERVAL)
+
+        # Record the changes of the schedules reloaded in the background.
+        for dataset, current_notifier in list(notifiers.items()):
+            name = Application.registry.get_names(dataset)[0]
+            if name in feeds:
+                await bot.loop.run_in_executor(None, feeds[name].record, current_notifier.hyperplanning)
+
+        # Unknown channel (the changes are kept until the channel is available).
+        channel = bot.get_channel(channel_id)
+        if channel is None:
+            continue
+
+        # Read the new changes.
+        lines = []
+        for name, feed in feeds.items():
+            changes, cursors[name] = feed.read(cursors[name])
+            prefix = f"[{name}] " if len(feeds) > 1 else ""
+            lines.extend(prefix + Application.format_change(change) for change in changes)
+
+        # Post the changes (in messages of at most 2000 characters).
+        messages = [""]
+        for line in lines:
+            if messages[-1] and len(messages[-1]) + len(line) + 1 > 2000:
+                messages.append("")
+            messages[-1] = (messages[-1] + "\n" + line if messages[-1] else line)[:2000]
+        for message in messages:
+            if message:
+                try:
+                    await channel.send(message)
+                except discord.DiscordException as e:
+                    print(e)
+
+
+@bot.command()
+async def notify(ctx, *, options: hyperplanning_parser = hyperplanning_parser.defaults()):
+    """
+    Notifies you once a classroom matching the specified filters becomes available (in the first dataset by default).
+    """
+    # Parse the options.
+    options = parse_options(options)
+
+    # Get the matching classrooms.
+    current_notifier = await get_notifier(options["dataset"])
+    classrooms = Application.get_matching_classrooms(current_notifier.hyperplanning, options)
+    if not classrooms:
+        await ctx.send("No classrooms found.")
+        return
+
+    # Subscribe.
+    if await current_notifier.subscribe(classrooms, options["duration"], ctx) is not None:
+        await ctx.send(f"You will be notified once one of the {len(classrooms)} matching classrooms becomes available.")
+
+
+@bot.command()
+async def batch(ctx, *, text: str = ""):
+    """
+    Shows several lists of classrooms at once, with the filters of each list on its own line.
+    The first line holds the common options (e.g. date, dataset or reload) and the common filters.
+    """
+    lines = text.split("\n")
+
+    # Parse the common options.
+    options = parse_options(await hyperplanning_parser.convert(ctx, lines[0]))
+
+    # Parse the filters of each list (the other filters being the common ones).
+    queries = [await parse_filters(ctx, line) for line in lines[1:] if line.strip()]
+    if not queries:
+        await ctx.send("No filters found.")
+        return
+
     # Get the classrooms.
-    result = Application.get_classrooms(options)
+    results = Application.get_classrooms_batch(options, queries)
 
     # Send the classrooms.
-    await ctx.send(result[:2000])
+    await send_pages(ctx, Pager.from_text("\n\n".join(results), PAGE_SIZE))
 
 
 @hyperplanning.error
+@notify.error
+@batch.error
 async def hyperplanning_error(ctx, error):
     """
     Handles errors that occur while processing hyperplanning hyperplanning.
@@ -209,5 +529,52 @@ async def hyperplanning_error(ctx, error):
         print(error)
 
 
+@bot.command()
+async def classrooms(ctx, *, text: str = ""):
+    """
+    Suggests classroom names starting with or close to a text.
+    """
+    # Get the suggestions.
+    suggestions = Application.get_suggestions(text)
+
+    # Send the suggestions.
+    if suggestions:
+        await ctx.send(", ".join(suggestions)[:2000])
+    else:
+        await ctx.send("No classrooms found.")
+
+
+@bot.command()
+@commands.is_owner()
+async def memory(ctx):
+    """
+    Shows the memory used by each subsystem of the bot (owner only).
+    """
+    # Start tracing the memory allocations.
+    if not MemoryReport.start():
+        await ctx.send("The memory allocations are now traced, run the command again later to get a report.")
+        return
+
+    # Send the report.
+    result = await bot.loop.run_in_executor(None, Application.get_memory_report)
+    await ctx.send("```\n" + result[:1990] + "\n```")
+
+
+@memory.error
+async def memory_error(ctx, error):
+    """
+    Handles errors that occur while processing the memory command.
+    """
+    # Not the owner.
+    if isinstance(error, commands.NotOwner):
+        await ctx.send("Only the owner of the bot can use this command.")
+
+    # Other errors.
+    else:
+        await ctx.send("Unable to process your command.")
+        print(error)
+
+
 # Run the bot.
-bot.run(os.getenv("DISCORD_TOKEN"))
+if __name__ == "__main__":
+    bot.run(os.getenv("DISCORD_TOKEN"))
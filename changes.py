@@ -0,0 +1,205 @@
+# System.
+import os
+import json
+
+# Types.
+from typing import List
+
+# Hyperplanning.
+from hyperplanning import Hyperplanning
+from schedule import Schedule
+
+# Dates.
+from datetime import timedelta
+from time import time
+
+# Threading.
+from threading import Lock
+
+# Utility.
+from collections import deque
+from helper import Helper
+
+
+class ChangeFeed:
+    """
+    Represents an append-only log of the course changes of the classrooms (added, removed or moved courses).
+
+    Each refresh compares the courses of the loaded schedules within a horizon to the courses of the previous refresh,
+    which are kept in a state file next to the log, even across processes. Each line of the log is a change
+    in JSON, and the consumers read the log from a cursor (the byte offset of the next change).
+    """
+
+    # The kinds of changes.
+    ADDED = "added"
+    REMOVED = "removed"
+    MOVED = "moved"
+
+    # The default duration after now within which the courses are compared.
+    HORIZON = timedelta(weeks=4)
+
+    # The locks of the log files of the process.
+    __locks = {}
+
+    def __init__(self, path: str, horizon: timedelta = HORIZON):
+        """
+        Initializes the change feed.
+
+        :param path: The storage path of the log file.
+        :param horizon: The duration after now within which the courses are compared.
+        """
+        self.path = path
+        self.state_path = path + ".state"
+        self.horizon = horizon
+        self.__lock = ChangeFeed.__locks.setdefault(os.path.abspath(path), Lock())
+
+    @staticmethod
+    def __get_courses(schedule: Schedule, start: int, end: int):
+        """
+        Returns the courses of a schedule within a time window.
+
+        :param schedule: The classroom schedule.
+        :param start: The window start (as a UTC timestamp).
+        :param end: The window end (as a UTC timestamp).
+        :return: The sorted list of courses (as start, end and description).
+        """
+        return sorted((course.start, course.end, str(course.description))
+                      for course in schedule.get_courses_between(start, end))
+
+    @staticmethod
+    def __get_window(courses: List[tuple], start: int, end: int):
+        """
+        Returns the courses overlapping a time window.
+
+        :param courses: The sorted list of courses (as start, end and description).
+        :param start: The window start (as a UTC timestamp).
+        :param end: The window end (as a UTC timestamp).
+        :return: The sorted list of courses.
+        """
+        return [course for course in courses if course[1] > start and course[0] < end]
+
+    @staticmethod
+    def diff(old: List[tuple], new: List[tuple]):
+        """
+        Returns the changes between two sorted lists of courses, with a sorted merge.
+        A removed course and an added course with the same description make a moved course.
+
+        :param old: The previous sorted list of courses (as start, end and description).
+        :param new: The new sorted list of courses (as start, end and description).
+        :return: The list of changes (as kind, previous course and new course), by time.
+        """
+        # Courses only in one of the lists.
+        removed, added = Helper.diff_sorted(old, new)
+
+        # Moved courses (in the order of the courses with the same description).
+        pending = {}
+        for index in removed:
+            pending.setdefault(old[index][2], deque()).append(old[index])
+        changes = []
+        for course in added:
+            if pending.get(course[2]):
+                changes.append((ChangeFeed.MOVED, pending[course[2]].popleft(), course))
+            else:
+                changes.append((ChangeFeed.ADDED, None, course))
+        changes.extend((ChangeFeed.REMOVED, course, None) for courses in pending.values() for course in courses)
+
+        changes.sort(key=lambda x: (x[2] or x[1])[:2])
+        return changes
+
+    def __read_state(self):
+        """
+        Reads the courses of the previous refresh of each classroom.
+
+        :return: The window and the courses of each classroom, by classroom name.
+        """
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, encoding="utf-8") as file:
+            state = json.load(file)
+        return {
+            name: (start, end, [tuple(course) for course in courses])
+            for name, (start, end, courses) in state.items()
+        }
+
+    def __write_state(self, state: dict):
+        """
+        Replaces the courses of the previous refresh of each classroom.
+
+        :param state: The window and the courses of each classroom, by classroom name.
+        """
+        temporary_path = self.state_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(state, file, ensure_ascii=False)
+        os.replace(temporary_path, self.state_path)
+
+    def record(self, hyperplanning: Hyperplanning):
+        """
+        Appends the changes of the loaded schedules since their previous refresh to the log.
+        The classrooms seen for the first time only set the courses to compare to at the next refresh.
+
+        :param hyperplanning: The hyperplanning object.
+        :return: The list of recorded changes.
+        """
+        start = int(time())
+        end = start + int(self.horizon.total_seconds())
+
+        with self.__lock:
+            state = self.__read_state()
+
+            changes = []
+            for classroom in hyperplanning.classrooms:
+                if classroom.schedule is None or not classroom.schedule.is_loaded():
+                    continue
+                courses = self.__get_courses(classroom.schedule, start, end)
+                updated = int(classroom.schedule.data_updated.timestamp())
+
+                # Compare the courses within the windows of both refreshes.
+                if classroom.name in state:
+                    previous_start, previous_end, previous_courses = state[classroom.name]
+                    window_start, window_end = max(start, previous_start), min(end, previous_end)
+                    for kind, old_course, new_course in self.diff(
+                        self.__get_window(previous_courses, window_start, window_end),
+                        self.__get_window(courses, window_start, window_end)
+                    ):
+                        change = {"time": updated, "classroom": classroom.name, "kind": kind}
+                        if old_course is not None:
+                            change.update(old_start=old_course[0], old_end=old_course[1])
+                        course = new_course or old_course
+                        change.update(description=course[2], start=course[0], end=course[1])
+                        changes.append(change)
+
+                state[classroom.name] = (start, end, courses)
+
+            # Append the changes.
+            if changes:
+                with open(self.path, "a", encoding="utf-8") as file:
+                    file.write("".join(json.dumps(change, ensure_ascii=False) + "\n" for change in changes))
+            self.__write_state(state)
+
+        return changes
+
+    def get_cursor(self):
+        """
+        Returns the cursor after the last change of the log.
+
+        :return: The byte offset of the end of the log.
+        """
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def read(self, cursor: int = 0):
+        """
+        Reads the changes of the log from a cursor.
+
+        :param cursor: The byte offset of the first change to read.
+        :return: The list of changes, and the cursor of the next change.
+        """
+        if not os.path.exists(self.path):
+            return [], cursor
+        with open(self.path, "rb") as file:
+            file.seek(cursor)
+            data = file.read()
+
+        # Complete lines only (a change may be being written).
+        length = data.rfind(b"\n") + 1
+        changes = [json.loads(line) for line in data[:length].splitlines() if line.strip()]
+        return changes, cursor + length
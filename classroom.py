@@ -4,9 +4,10 @@ import pandas as pd
 # Schedules.
 from schedule import Schedule
 from location import Location
+from availability import Availability
 
 # Dates.
-from datetime import datetime
+from datetime import datetime, timedelta
 from helper import Helper
 
 # Colors.
@@ -67,7 +68,39 @@ class Classroom:
 
         :param info: The schedule information.
         """
-        self.schedule = Schedule(info["id"], info["folder"], info["url"], info["reload"])
+        self.schedule = Schedule(
+            info["id"],
+            info["folder"],
+            info["url"],
+            info["max_age"],
+            info["stream"],
+            info["cache"]
+        )
+
+    def get_availability(self, timestamp: int):
+        """
+        Returns the availability of the classroom at a given time.
+
+        :param timestamp: The UTC timestamp to check.
+        :return: The availability of the classroom.
+        """
+        # No schedule data.
+        if self.schedule is None or not self.schedule.is_loaded():
+            return Availability(self, timestamp, None, None, None, timedelta(0), timedelta(0))
+
+        # Get the courses.
+        current_course, next_course = self.schedule.get_courses(timestamp)
+
+        return Availability(
+            self,
+            timestamp,
+            current_course is None,
+            current_course,
+            next_course,
+            timedelta(seconds=next_course.start - timestamp) if next_course is not None else timedelta(365),
+            timedelta(seconds=current_course.end - timestamp) if current_course is not None else timedelta(0),
+            self.schedule.get_age() if self.schedule.is_outdated() else None
+        )
 
     def is_available(self, date: datetime = datetime.now()):
         """
@@ -116,31 +149,45 @@ class Classroom:
         """
         return self.schedule.get_unavailable_duration(date)
 
-    def get_minimum_information(self, date: datetime = datetime.now(), color: bool = False):
+    @staticmethod
+    def __get_color(availability: Availability):
+        """
+        Returns the color of an availability.
+
+        :param availability: The availability of the classroom.
+        :return: The color of the availability.
+        """
+        if availability.available is None:
+            return Fore.YELLOW
+        return Fore.GREEN if availability.available else Fore.RED
+
+    def get_minimum_information(self, availability: Availability, color: bool = False):
         """
         Returns the minimum information about the classroom.
 
-        :param date: The datetime to check for availability.
+        :param availability: The availability of the classroom.
         :param color: Whether to color the output.
         :return: The minimum information about the classroom.
         """
-        return "{color}{name}{reset}".format(
-            color=(Fore.GREEN if self.is_available(date) else Fore.RED) if color else "",
+        return "{color}{name}{reset}{status}".format(
+            color=self.__get_color(availability) if color else "",
             name=self.name,
-            reset=Style.RESET_ALL if color else ""
+            reset=Style.RESET_ALL if color else "",
+            status=" (unknown)" if availability.available is None else
+            " (outdated)" if availability.outdated is not None else ""
         )
 
-    def get_regular_information(self, date: datetime = datetime.now(), color: bool = False):
+    def get_regular_information(self, availability: Availability, color: bool = False):
         """
         Returns the regular information about the classroom.
 
-        :param date: The datetime to check for availability.
+        :param availability: The availability of the classroom.
         :param color: Whether to color the output.
         :return: The regular information about the classroom.
         """
         # Name.
         result = "{color}{name}{reset} | ".format(
-            color=(Fore.GREEN if self.is_available(date) else Fore.RED) if color else "",
+            color=self.__get_color(availability) if color else "",
             name=self.name,
             reset=Style.RESET_ALL if color else ""
         )
@@ -157,12 +204,19 @@ class Classroom:
                 location=self.location
             )
 
+        # Unknown.
+        if availability.available is None:
+            result += "{color}Unknown availability{reset}".format(
+                color=Fore.YELLOW if color else "",
+                reset=Style.RESET_ALL if color else ""
+            )
+
         # Available.
-        if self.is_available(date):
+        elif availability.available:
             result += "{color}Available{reset} for {duration}".format(
                 color=Fore.GREEN if color else "",
                 reset=Style.RESET_ALL if color else "",
-                duration=Helper.format_duration(self.get_available_duration(date))
+                duration=Helper.format_duration(availability.available_duration)
             )
 
         # Unavailable.
@@ -170,16 +224,24 @@ class Classroom:
             result += "{color}Unavailable{reset} for {duration}".format(
                 color=Fore.RED if color else "",
                 reset=Style.RESET_ALL if color else "",
-                duration=Helper.format_duration(self.get_unavailable_duration(date))
+                duration=Helper.format_duration(availability.unavailable_duration)
+            )
+
+        # Outdated.
+        if availability.outdated is not None:
+            result += " | {color}Outdated schedule{reset} ({age} old)".format(
+                color=Fore.YELLOW if color else "",
+                reset=Style.RESET_ALL if color else "",
+                age=Helper.format_duration(availability.outdated) or "less than a minute"
             )
 
         return result
 
-    def get_full_information(self, date: datetime = datetime.now(), color: bool = False):
+    def get_full_information(self, availability: Availability, color: bool = False):
         """
         Returns the full information about the classroom.
 
-        :param date: The datetime to check for availability.
+        :param availability: The availability of the classroom.
         :param color: Whether to color the output.
         :return: The full information about the classroom.
         """
@@ -190,7 +252,7 @@ class Classroom:
         # Name.
         result = "{color}Name{reset}: {color2}{name}{reset}\n".format(
             color=label_color,
-            color2=(Fore.GREEN if self.is_available(date) else Fore.RED) if color else "",
+            color2=self.__get_color(availability) if color else "",
             name=self.name,
             reset=reset_color
         )
@@ -272,8 +334,25 @@ class Classroom:
             reset=reset_color
         )
 
+        # Outdated.
+        if availability.outdated is not None:
+            result += "{color}Outdated schedule{reset}: {color2}{age} old{reset}\n".format(
+                color=label_color,
+                color2=Fore.YELLOW if color else "",
+                age=Helper.format_duration(availability.outdated) or "less than a minute",
+                reset=reset_color
+            )
+
+        # Unknown.
+        if availability.available is None:
+            result += "{color}Available{reset}: {color2}Unknown{reset}".format(
+                color=label_color,
+                color2=Fore.YELLOW if color else "",
+                reset=reset_color
+            )
+
         # Available.
-        if self.is_available(date):
+        elif availability.available:
             # Status.
             result += "{color}Available{reset}: {color2}Yes{reset}\n".format(
                 color=label_color,
@@ -284,12 +363,12 @@ class Classroom:
             # Duration.
             result += "{color}Available duration{reset}: {duration}\n".format(
                 color=label_color,
-                duration=Helper.format_duration(self.get_available_duration(date)),
+                duration=Helper.format_duration(availability.available_duration),
                 reset=reset_color
             )
 
             # Next course.
-            next_course = self.get_next_course(date)
+            next_course = availability.next_course
             if next_course is not None:
                 result += "{color}Next course{reset}: {next_course}".format(
                     color=label_color,
@@ -309,12 +388,12 @@ class Classroom:
             # Duration.
             result += "{color}Unavailable duration{reset}: {duration}".format(
                 color=label_color,
-                duration=Helper.format_duration(self.get_unavailable_duration(date)),
+                duration=Helper.format_duration(availability.unavailable_duration),
                 reset=reset_color
             )
 
             # Next course.
-            current_course = self.get_current_course(date)
+            current_course = availability.current_course
             if current_course is not None:
                 result += "{color}Current course{reset}: {current_course}".format(
                     color=label_color,
@@ -9,9 +9,10 @@ import argparse
 
 # Utility.
 from application import Application
+from memory import MemoryReport
 
 # Dates.
-from datetime import datetime
+from datetime import datetime, timedelta
 from helper import Helper
 
 
@@ -42,6 +43,8 @@ class CLI:
         # Date.
         parser.add_argument("-d", "--date", type=CLI.__parse_datetime, default=datetime.now(),
                             help="filter classrooms by availability at a specified date")
+        parser.add_argument("--as-of", type=CLI.__parse_datetime, default=None,
+                            help="check the availability on the archived schedules of a specified date")
 
         # Duration.
         parser.add_argument("-t", "--duration", type=CLI.__parse_duration, default=None,
@@ -49,6 +52,10 @@ class CLI:
 
         # Name.
         parser.add_argument("-n", "--name", default=None, help="filter classrooms by name")
+        parser.add_argument("--name-prefix", default=None,
+                            help="filter classrooms by name prefix or glob pattern")
+        parser.add_argument("--search", default=None,
+                            help="find classrooms by approximate name, description or location")
 
         # Location.
         parser.add_argument("-f", "--floor", type=int, default=None, help="filter classrooms by floor")
@@ -56,6 +63,12 @@ class CLI:
         parser.add_argument("-b", "--building", default=None, help="filter classrooms by building")
         parser.add_argument("-l", "--location", default=None, help="filter classrooms by location")
 
+        # Proximity.
+        parser.add_argument("--near", default=None,
+                            help="sort classrooms by distance from a specified classroom")
+        parser.add_argument("--limit", type=int, default=None,
+                            help="set the maximum number of classrooms to show")
+
         # Places.
         parser.add_argument("-p", "--places", type=int, default=None,
                             help="filter classrooms by minimum number of places")
@@ -89,12 +102,38 @@ class CLI:
                             help="disable the use of colors on the output")
         parser.set_defaults(color=True)
 
+        # Dataset.
+        parser.add_argument("--dataset", default=None,
+                            help="select a dataset (all the datasets by default)")
+
         # Reload.
-        parser.add_argument("--reload", dest="reload", action="store_true",
-                            help="force the reloading of schedules")
-        parser.add_argument("--no-reload", dest="reload", action="store_false",
+        parser.add_argument("--reload", dest="max_age", action="store_const", const=timedelta(0),
+                            help="force the reloading of schedules before the output")
+        parser.add_argument("--no-reload", dest="max_age", action="store_const", const=None,
                             help="disable the reloading of schedules")
-        parser.set_defaults(reload=True)
+        parser.add_argument("--max-age", dest="max_age", type=CLI.__parse_duration,
+                            help="reload the schedules older than a specified duration, using the cached ones meanwhile")
+        parser.set_defaults(max_age=timedelta(0))
+
+        # Deadline.
+        parser.add_argument("--deadline", type=CLI.__parse_duration, default=None,
+                            help="set the maximum duration to wait for the schedules")
+
+        # Changes.
+        parser.add_argument("--changes-within", type=CLI.__parse_duration, default=None,
+                            help="show the classrooms changing of availability within a specified duration")
+
+        # Courses.
+        parser.add_argument("--course", default=None,
+                            help="find the courses of the day matching a text (e.g. a course, group or teacher)")
+
+        # Assignment.
+        parser.add_argument("--assign", default=None,
+                            help="assign classrooms to the session requests of a CSV file")
+
+        # Watch.
+        parser.add_argument("-w", "--watch", action="store_true",
+                            help="keep showing the classrooms whose availability changes")
 
         # Verbose.
         parser.add_argument('-v', '--verbose', action='count', default=0,
@@ -104,6 +143,14 @@ class CLI:
         parser.add_argument("-j", "--threads", type=int, default=os.cpu_count(),
                             help="set the number of threads to use")
 
+        # Downloads.
+        parser.add_argument("--download-report", action="store_true",
+                            help="show the limits and the throughput of the schedule downloads")
+
+        # Memory.
+        parser.add_argument("--memory-report", action="store_true",
+                            help="show the memory used by each subsystem")
+
         # Parse the arguments.
         return vars(parser.parse_args(arguments))
 
@@ -142,12 +189,47 @@ class CLI:
         # Parse the arguments.
         options = CLI.__parse_arguments(sys.argv[1:])
 
-        # Get the classrooms.
-        result = Application.get_classrooms(options)
+        # Trace the memory allocations.
+        if options["memory_report"]:
+            MemoryReport.start()
+
+        # Watch the classrooms.
+        if options["watch"]:
+            try:
+                Application.watch_classrooms(options)
+            except ValueError as e:
+                sys.exit(e)
+            except KeyboardInterrupt:
+                pass
+            return
+
+        # Get the classrooms, their changes, their courses, or an assignment.
+        try:
+            if options["assign"] is not None:
+                result = Application.get_assignment(options)
+            elif options["course"] is not None:
+                result = Application.get_courses(options)
+            elif options["changes_within"] is not None:
+                result = Application.get_changes(options)
+            else:
+                result = Application.get_classrooms(options)
+        except ValueError as e:
+            sys.exit(e)
 
         # Print the classrooms.
         print(result)
 
+        # Finish the revalidation of the outdated schedules, for the next requests.
+        Application.wait_for_schedules()
+
+        # Print the download report.
+        if options["download_report"]:
+            print(Application.get_download_report(options), file=sys.stderr)
+
+        # Print the memory report.
+        if options["memory_report"]:
+            print(Application.get_memory_report(), file=sys.stderr)
+
 
 # Run the CLI.
 CLI.run()
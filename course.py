@@ -1,6 +1,5 @@
 # Dates.
-from datetime import datetime
-from dateutil.tz import tz
+from helper import Helper
 
 
 class Course:
@@ -8,13 +7,13 @@ class Course:
     Represents a course of the schedule.
     """
 
-    def __init__(self, description: str, start: datetime, end: datetime):
+    def __init__(self, description: str, start: int, end: int):
         """
         Initializes the course.
 
         :param description: The course description.
-        :param start: The course start datetime.
-        :param end: The course end datetime.
+        :param start: The course start time (as a UTC timestamp).
+        :param end: The course end time (as a UTC timestamp).
         """
         self.description = description
         self.start = start
@@ -28,6 +27,6 @@ class Course:
         """
         return "{description} | {start} - {end}".format(
             description=self.description,
-            start=self.start.replace(tzinfo=tz.tzlocal()).strftime("%d/%m/%Y %Hh%M"),
-            end=self.end.replace(tzinfo=tz.tzlocal()).strftime("%Hh%M")
+            start=Helper.format_timestamp(self.start, "%d/%m/%Y %Hh%M"),
+            end=Helper.format_timestamp(self.end, "%Hh%M")
         )
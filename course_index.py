@@ -0,0 +1,166 @@
+# Text.
+import re
+from name_index import NameIndex
+
+# Types.
+from typing import List
+
+# Classrooms.
+from classroom import Classroom
+from schedule import Schedule
+
+# Search.
+from bisect import bisect_left, insort
+
+# Threading.
+from threading import Lock
+
+
+class CourseIndex:
+    """
+    Represents an inverted index of the course descriptions of all the classrooms, for token and prefix lookups.
+    The postings map each token to the descriptions holding it in each classroom, the courses themselves
+    (including the occurrences of the recurring courses) being only browsed within the time window of a lookup.
+    The descriptions of a classroom are only indexed again when its schedule changes.
+    """
+
+    # The tokens of a normalized description.
+    TOKEN = re.compile(r"\w+")
+
+    def __init__(self, classrooms: List[Classroom]):
+        """
+        Initializes the course index.
+
+        :param classrooms: The list of classrooms.
+        """
+        self.classrooms = classrooms
+        self.positions = {classroom: position for position, classroom in enumerate(classrooms)}
+        self.versions = [None] * len(classrooms)
+        self.descriptions = [set() for _ in classrooms]
+        self.postings = {}
+        self.keys = []
+        self.__lock = Lock()
+
+    @staticmethod
+    def tokenize(text: str):
+        """
+        Returns the tokens of a text (case and accent insensitive).
+
+        :param text: The text to split.
+        :return: The list of tokens.
+        """
+        return CourseIndex.TOKEN.findall(NameIndex.normalize(text))
+
+    @staticmethod
+    def __get_descriptions(schedule: Schedule):
+        """
+        Returns the distinct descriptions of the courses of a schedule.
+
+        :param schedule: The classroom schedule.
+        :return: The set of descriptions.
+        """
+        descriptions = {course.description for course in schedule.courses}
+        descriptions.update(recurrence.description for recurrence in schedule.recurrences)
+        return descriptions
+
+    def update(self):
+        """
+        Updates the postings of the classrooms whose schedule has changed.
+
+        :return: Whether the postings have changed.
+        """
+        with self.__lock:
+            # Changed schedules.
+            changed = {
+                position: classroom.schedule.version
+                for position, classroom in enumerate(self.classrooms)
+                if classroom.schedule is not None and classroom.schedule.version != self.versions[position]
+            }
+            if not changed:
+                return False
+
+            for position, version in changed.items():
+                descriptions = self.__get_descriptions(self.classrooms[position].schedule)
+
+                # Remove the previous postings.
+                for description in self.descriptions[position] - descriptions:
+                    for token in set(self.tokenize(description)):
+                        postings = self.postings[token]
+                        postings[position].discard(description)
+                        if not postings[position]:
+                            del postings[position]
+                        if not postings:
+                            del self.postings[token]
+                            del self.keys[bisect_left(self.keys, token)]
+
+                # Add the new postings.
+                for description in descriptions - self.descriptions[position]:
+                    for token in set(self.tokenize(description)):
+                        if token not in self.postings:
+                            self.postings[token] = {}
+                            insort(self.keys, token)
+                        self.postings[token].setdefault(position, set()).add(description)
+
+                self.descriptions[position] = descriptions
+                self.versions[position] = version
+            return True
+
+    def __get_matches(self, token: str):
+        """
+        Returns the descriptions holding a token starting with a prefix.
+
+        :param token: The normalized prefix.
+        :return: The set of classroom positions and descriptions.
+        """
+        matches = set()
+        for index in range(bisect_left(self.keys, token), len(self.keys)):
+            if not self.keys[index].startswith(token):
+                break
+            matches.update(
+                (position, description)
+                for position, descriptions in self.postings[self.keys[index]].items()
+                for description in descriptions
+            )
+        return matches
+
+    def search(self, text: str, start: int, end: int, classrooms: List[Classroom] = None):
+        """
+        Returns the courses whose description holds all the tokens of a text (each token being a prefix),
+        within a time window.
+
+        :param text: The text to find (e.g. 'algo' or 'algorithmique TD').
+        :param start: The window start (as a UTC timestamp).
+        :param end: The window end (as a UTC timestamp).
+        :param classrooms: The list of classrooms to consider (None for all the classrooms).
+        :return: The list of matching courses (as classroom and course), by start time.
+        """
+        tokens = self.tokenize(text)
+        if not tokens:
+            return []
+
+        # Descriptions holding all the tokens.
+        self.update()
+        with self.__lock:
+            matches = self.__get_matches(tokens[0])
+            for token in tokens[1:]:
+                if not matches:
+                    break
+                matches &= self.__get_matches(token)
+
+        # Matching descriptions of each classroom.
+        descriptions = {}
+        for position, description in matches:
+            descriptions.setdefault(position, set()).add(description)
+        if classrooms is not None:
+            selected = {self.positions[classroom] for classroom in classrooms}
+            descriptions = {position: value for position, value in descriptions.items() if position in selected}
+
+        # Courses within the window.
+        results = [
+            (position, course)
+            for position in descriptions
+            for course in self.classrooms[position].schedule.get_courses_between(start, end)
+            if course.description in descriptions[position]
+        ]
+        results.sort(key=lambda x: (x[1].start, x[0]))
+        return [(self.classrooms[position], course) for position, course in results]
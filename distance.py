@@ -0,0 +1,138 @@
+# Data.
+import numpy as np
+import pandas as pd
+
+# Types.
+from typing import List
+
+# Classrooms.
+from classroom import Classroom
+from availability import Availability
+
+
+class DistanceModel:
+    """
+    Represents the walking distances between the classrooms, from their location hierarchy.
+    """
+
+    # The default cost of each level of the hierarchy (the floor cost is per floor).
+    COSTS = {
+        "location": 1000,
+        "building": 100,
+        "sub_building": 10,
+        "floor": 1
+    }
+
+    # The maximum number of classrooms for which the whole matrix of distances is computed at load.
+    MATRIX_LIMIT = 2048
+
+    def __init__(self, classrooms: List[Classroom], costs: dict = None):
+        """
+        Initializes the distance model.
+        For larger catalogs, the distances from a classroom are only computed when needed.
+
+        :param classrooms: The list of classrooms.
+        :param costs: The cost of each level of the hierarchy (the default costs otherwise).
+        """
+        self.classrooms = classrooms
+        self.costs = dict(self.COSTS, **(costs or {}))
+        self.positions = {classroom.name: position for position, classroom in enumerate(classrooms)}
+
+        # The codes of the locations, buildings and sub-buildings, and the floors.
+        self.codes = {
+            level: pd.factorize(pd.Series([
+                getattr(classroom, level).alias if getattr(classroom, level) is not None else ""
+                for classroom in classrooms
+            ], dtype=object))[0]
+            for level in ["location", "building", "sub_building"]
+        }
+        self.floors = np.array([classroom.floor for classroom in classrooms], dtype=np.float64)
+
+        # The matrix of distances.
+        self.distances = None
+        if len(classrooms) <= self.MATRIX_LIMIT:
+            self.distances = self.__get_distances(np.arange(len(classrooms)))
+
+    def __get_distances(self, positions: np.ndarray):
+        """
+        Returns the distances from some classrooms to all the classrooms.
+
+        :param positions: The positions of the classrooms.
+        :return: The matrix of distances (a row per classroom).
+        """
+        distances = np.zeros((len(positions), len(self.classrooms)), dtype=np.float64)
+
+        # Different locations, buildings and sub-buildings.
+        for level, codes in self.codes.items():
+            distances += self.costs[level] * (codes[positions, None] != codes[None, :])
+
+        # Floors.
+        distances += self.costs["floor"] * np.nan_to_num(np.abs(self.floors[positions, None] - self.floors[None, :]))
+
+        return distances
+
+    def __get_row(self, position: int):
+        """
+        Returns the distances from a classroom to all the classrooms.
+
+        :param position: The position of the classroom.
+        :return: The array of distances.
+        """
+        if self.distances is not None:
+            return self.distances[position]
+        return self.__get_distances(np.array([position]))[0]
+
+    def get_distance(self, first: str, second: str):
+        """
+        Returns the distance between two classrooms.
+
+        :param first: The name of the first classroom.
+        :param second: The name of the second classroom.
+        :return: The distance between the classrooms.
+        """
+        return self.__get_row(self.get_position(first))[self.get_position(second)]
+
+    def get_position(self, name: str):
+        """
+        Returns the position of a classroom in the matrix.
+
+        :param name: The classroom name.
+        :return: The position of the classroom.
+        """
+        if name not in self.positions:
+            raise ValueError(f"Unknown classroom '{name}'.")
+        return self.positions[name]
+
+    def sort(self, availabilities: List[Availability], near: str, limit: int = None):
+        """
+        Sorts classroom availabilities by distance to a reference classroom.
+        Only the closest classrooms are sorted when a limit is given.
+
+        :param availabilities: The list of classroom availabilities.
+        :param near: The name of the reference classroom.
+        :param limit: The maximum number of classrooms to return.
+        :return: The list of the closest classroom availabilities, from the closest to the farthest.
+        """
+        reference = self.get_position(near)
+        if len(availabilities) == 0:
+            return []
+
+        # Distances to the reference classroom.
+        positions = np.array([self.positions[availability.classroom.name] for availability in availabilities])
+        distances = self.__get_row(reference)[positions]
+
+        # Closest classrooms (partial sort).
+        indexes = np.arange(len(availabilities))
+        if limit is not None and limit < len(availabilities):
+            if limit <= 0:
+                return []
+            kth = np.partition(distances, limit - 1)[limit - 1]
+            closer = np.flatnonzero(distances < kth)
+            ties = np.flatnonzero(distances == kth)
+            ties = ties[np.argsort(positions[ties] != reference, kind="stable")][:limit - len(closer)]
+            indexes = np.concatenate((closer, ties))
+
+        # Sort the closest classrooms (by distance, the reference first, then by the order of the list).
+        indexes = indexes[np.lexsort((indexes, positions[indexes] != reference, distances[indexes]))]
+
+        return [availabilities[index] for index in indexes]
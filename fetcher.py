@@ -0,0 +1,160 @@
+# Threading.
+from threading import Condition, Lock
+from pool import WorkerPool
+
+# Dates.
+from time import monotonic, sleep
+
+
+class Fetcher(WorkerPool):
+    """
+    Represents a pool of download workers adapting its concurrency to the upstream server.
+
+    The number of concurrent requests grows by one per round of successful requests, and is halved
+    when a request fails or is slower than the target latency (AIMD), up to the number of workers.
+    A token bucket caps the number of requests per second.
+    """
+
+    # The default maximum number of concurrent requests.
+    WORKERS = 32
+
+    # The initial number of concurrent requests.
+    INITIAL = 4
+
+    # The target latency of the requests (in seconds).
+    TARGET_LATENCY = 5
+
+    # The decrease factor of the number of concurrent requests.
+    DECREASE = 0.5
+
+    def __init__(
+        self,
+        workers: int,
+        rate: float = None,
+        target_latency: float = TARGET_LATENCY,
+        name: str = "download"
+    ):
+        """
+        Initializes the fetcher.
+
+        :param workers: The maximum number of concurrent requests.
+        :param rate: The maximum number of requests per second (None for no limit).
+        :param target_latency: The latency above which the number of concurrent requests decreases (in seconds).
+        :param name: The name of the workers.
+        """
+        super().__init__(workers, name)
+        self.rate = rate
+        self.target_latency = target_latency
+
+        # Concurrency.
+        self.limit = float(max(min(self.INITIAL, workers), 1))
+        self.active = 0
+        self.last_decrease = None
+        self.__condition = Condition()
+
+        # Rate limit.
+        self.tokens = max(rate, 1) if rate is not None else None
+        self.last_refill = monotonic()
+        self.__bucket_lock = Lock()
+
+        # Statistics.
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.first_start = None
+        self.last_end = None
+
+    def __take_token(self):
+        """
+        Waits for a token of the bucket.
+        """
+        if self.rate is None:
+            return
+
+        while True:
+            with self.__bucket_lock:
+                # Refill the bucket.
+                now = monotonic()
+                self.tokens = min(self.tokens + (now - self.last_refill) * self.rate, max(self.rate, 1))
+                self.last_refill = now
+
+                # Take a token.
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            sleep(delay)
+
+    def __update(self, start: float, end: float, failed: bool):
+        """
+        Updates the number of concurrent requests and the statistics after a request.
+
+        :param start: The start of the request (monotonic time).
+        :param end: The end of the request (monotonic time).
+        :param failed: Whether the request has failed.
+        """
+        latency = end - start
+
+        # Statistics.
+        self.requests += 1
+        self.errors += failed
+        self.total_latency += latency
+        self.first_start = start if self.first_start is None else min(self.first_start, start)
+        self.last_end = end if self.last_end is None else max(self.last_end, end)
+
+        # Multiplicative decrease, at most once per latency (the requests in flight share the same congestion).
+        if failed or latency > self.target_latency:
+            if self.last_decrease is None or start >= self.last_decrease:
+                self.limit = max(self.limit * self.DECREASE, 1.0)
+                self.last_decrease = end
+            return
+
+        # Additive increase (by one per round of concurrent requests).
+        self.limit = min(self.limit + 1 / self.limit, float(self.workers))
+
+    def fetch(self, function, *arguments):
+        """
+        Runs a request within the concurrency and rate limits.
+        The request fails if it raises an exception or returns False.
+
+        :param function: The function of the request.
+        :param arguments: The arguments of the function.
+        :return: The result of the function.
+        """
+        # Wait for a slot.
+        with self.__condition:
+            while self.active >= int(self.limit):
+                self.__condition.wait()
+            self.active += 1
+
+        failed = True
+        start = monotonic()
+        try:
+            self.__take_token()
+            start = monotonic()
+            result = function(*arguments)
+            failed = result is False
+            return result
+        finally:
+            with self.__condition:
+                self.__update(start, monotonic(), failed)
+                self.active -= 1
+                self.__condition.notify_all()
+
+    def get_report(self):
+        """
+        Returns the limits and the observed throughput of the requests.
+
+        :return: The dictionary of the limits and statistics.
+        """
+        with self.__condition:
+            duration = self.last_end - self.first_start if self.requests > 0 else 0
+            return {
+                "workers": self.workers,
+                "concurrency": self.limit,
+                "rate": self.rate,
+                "requests": self.requests,
+                "errors": self.errors,
+                "latency": self.total_latency / self.requests if self.requests > 0 else None,
+                "throughput": self.requests / duration if duration > 0 else None
+            }
@@ -1,13 +1,20 @@
 # Regex.
 import re
 
+# Types.
+from typing import List
+
 # Dates.
 from datetime import datetime, timedelta
+from dateutil.tz import tz
+
+# Cache.
+from functools import lru_cache
 
 
 class Helper:
     """
-    Helper for parsing and formatting.
+    Helper for parsing, formatting and comparing.
     """
 
     @staticmethod
@@ -78,3 +85,50 @@ class Helper:
                 result.append("%s %s%s" % (period_value, period_name, has_s))
 
         return ", ".join(result)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_timezone(name: str = None):
+        """
+        Returns a timezone.
+
+        :param name: The timezone name (None for the local timezone).
+        :return: The timezone.
+        """
+        return tz.gettz(name) if name is not None else tz.tzlocal()
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def format_timestamp(timestamp: int, pattern: str, timezone: str = None):
+        """
+        Formats a UTC timestamp in a timezone.
+
+        :param timestamp: The UTC timestamp.
+        :param pattern: The format of the datetime.
+        :param timezone: The timezone name (None for the local timezone).
+        :return: The formatted datetime.
+        """
+        return datetime.fromtimestamp(timestamp, Helper.get_timezone(timezone)).strftime(pattern)
+
+    @staticmethod
+    def diff_sorted(old: List, new: List):
+        """
+        Returns the changes between two sorted lists, with a sorted merge (duplicate items being kept).
+
+        :param old: The previous sorted list.
+        :param new: The new sorted list.
+        :return: The indexes of the removed items in the previous list, and the list of added items.
+        """
+        removed, added = [], []
+        old_index, new_index = 0, 0
+        while old_index < len(old) or new_index < len(new):
+            if new_index == len(new) or (old_index < len(old) and old[old_index] < new[new_index]):
+                removed.append(old_index)
+                old_index += 1
+            elif old_index == len(old) or new[new_index] < old[old_index]:
+                added.append(new[new_index])
+                new_index += 1
+            else:
+                old_index += 1
+                new_index += 1
+        return removed, added
@@ -1,4 +1,5 @@
 # Data.
+import numpy as np
 import pandas as pd
 
 # Types.
@@ -7,13 +8,24 @@ from typing import List
 # Classrooms.
 from classroom import Classroom
 from location import Location
+from availability import Availability
+from name_index import NameIndex
+from distance import DistanceModel
+from transitions import TransitionIndex
+from slots import SlotIndex
+from course_index import CourseIndex
+from archive import Archive
+from schedule import Schedule
 
 # Dates.
 from datetime import datetime, timedelta
+from dateutil.tz import tz
 
 # Threading
-from threading import Thread
+from threading import Thread, Event
 from queue import Queue
+from pool import WorkerPool
+from fetcher import Fetcher
 
 
 class Hyperplanning:
@@ -21,13 +33,59 @@ class Hyperplanning:
     Represents the schedule system of the school.
     """
 
+    # The columns of the classrooms file, with their types.
+    CLASSROOM_COLUMNS = {
+        "name": str,
+        "description": str,
+        "floor": "float64",
+        "sub_building": str,
+        "building": str,
+        "location": str,
+        "places": "float64",
+        "outlets": "float64",
+        "computers": "float64",
+        "projector": str,
+        "audio": str,
+        "schedule_id": str
+    }
+
+    # The number of classrooms read at once.
+    CHUNK_SIZE = 1000
+
+    # The filters of a batch query, with their default values.
+    QUERY = {
+        "name": None,
+        "floor": None,
+        "sub_building": None,
+        "building": None,
+        "location": None,
+        "places": None,
+        "outlets": None,
+        "computers": None,
+        "projector": None,
+        "audio": None,
+        "available": True,
+        "duration": None,
+        "name_prefix": None,
+        "search": None,
+        "near": None,
+        "limit": None
+    }
+
     def __init__(
         self,
         data_folder: str,
         schedule_folder: str,
         schedule_url: str,
         schedule_workers: int = 1,
-        schedule_reload: bool = True
+        schedule_max_age: timedelta = timedelta(0),
+        schedule_deadline: timedelta = None,
+        distance_costs: dict = None,
+        schedule_pools: tuple = None,
+        availability_slot: timedelta = None,
+        schedule_stream: bool = False,
+        schedule_cache: bool = True,
+        schedule_archive: str = None
     ):
         """
         Initializes the hyperplanning.
@@ -35,26 +93,64 @@ class Hyperplanning:
         :param data_folder: The storage folder of the data files.
         :param schedule_folder: The storage folder of the schedules.
         :param schedule_url: The URL pattern to download the schedules.
-        :param schedule_workers: The number of workers to download the schedules.
-        :param schedule_reload: Whether to force the reloading of schedules.
+        :param schedule_workers: The number of workers to download the schedules (0 to skip the schedules).
+        :param schedule_max_age: The maximum age of the cached schedules (None to never reload them).
+        :param schedule_deadline: The maximum duration to wait for the schedules (None to wait for all of them).
+        :param distance_costs: The cost of each level of the location hierarchy (the default costs otherwise).
+        :param schedule_pools: The download and parse pools shared with other hyperplannings (own pools otherwise).
+        :param availability_slot: The duration of the slots of the availability index (None for no index).
+        :param schedule_stream: Whether the downloaded schedules are parsed as they arrive.
+        :param schedule_cache: Whether the streamed schedules are also written to the schedule folder.
+        :param schedule_archive: The storage folder of the archive of the schedule versions (None for no archive).
         """
+        # The schedule loading.
+        if schedule_pools is None and schedule_workers > 0:
+            schedule_pools = (Fetcher(schedule_workers), WorkerPool(schedule_workers, "parse"))
+        self.schedule_pools = schedule_pools
+        self.updated = Event()
+
         # Load the locations.
         self.sub_buildings = self.__load_locations(data_folder + "/sub_buildings.csv")
         self.buildings = self.__load_locations(data_folder + "/buildings.csv")
         self.locations = self.__load_locations(data_folder + "/locations.csv")
 
         # Load the classrooms.
-        self.classrooms = self.__load_classrooms(
+        self.classrooms, self.loader = self.__load_classrooms(
             data_folder + "/classrooms.csv",
             self.sub_buildings,
             self.buildings,
             self.locations,
             schedule_folder,
             schedule_url,
-            schedule_workers,
-            schedule_reload
+            schedule_pools,
+            schedule_max_age,
+            schedule_deadline,
+            self.updated,
+            schedule_stream,
+            schedule_cache
         )
 
+        # Index the classroom names.
+        self.name_index = NameIndex(self.classrooms)
+
+        # Compute the distances between the classrooms.
+        self.distance_model = DistanceModel(self.classrooms, distance_costs)
+
+        # Index the changes of availability (computed on first use).
+        self.transition_index = TransitionIndex(self.classrooms)
+
+        # Index the course descriptions (computed on first use).
+        self.course_index = CourseIndex(self.classrooms)
+
+        # Index the availabilities by slot (computed on first use).
+        self.slot_index = SlotIndex(self.classrooms, availability_slot) if availability_slot is not None else None
+
+        # The archive of the schedule versions.
+        self.archive = Archive(schedule_archive) if schedule_archive is not None else None
+
+        # The columns of the classroom attributes for the batch queries (computed on first use).
+        self.__columns = None
+
     @staticmethod
     def __load_locations(path: str):
         """
@@ -86,11 +182,20 @@ class Hyperplanning:
         locations: dict,
         schedule_folder: str,
         schedule_url: str,
-        schedule_workers: int = 1,
-        schedule_reload: bool = True
+        schedule_pools: tuple = None,
+        schedule_max_age: timedelta = timedelta(0),
+        schedule_deadline: timedelta = None,
+        schedule_updated: Event = None,
+        schedule_stream: bool = False,
+        schedule_cache: bool = True
     ):
         """
         Loads the classrooms from a file.
+        The cached schedules are used directly, and the ones older than the maximum age are revalidated
+        in the background (the schedules without cached data being waited for).
+        With a zero maximum age (the reloading of every schedule), the revalidated schedules are waited for instead.
+        Once the deadline is reached, the classrooms are returned with the best schedules available,
+        while the remaining schedules keep loading in the background.
 
         :param path: The storage path of the classrooms file.
         :param sub_buildings: The dictionary of sub-buildings.
@@ -98,122 +203,293 @@ class Hyperplanning:
         :param locations: The dictionary of locations.
         :param schedule_folder: The storage folder of the schedules.
         :param schedule_url: The URL pattern to download the schedules.
-        :param schedule_reload: Whether to force the reloading of schedules.
-        :return: The list of classrooms.
+        :param schedule_pools: The download and parse pools (None to skip the schedules).
+        :param schedule_max_age: The maximum age of the cached schedules (None to never reload them).
+        :param schedule_deadline: The maximum duration to wait for the schedules (None to wait for all of them).
+        :param schedule_updated: The event to set whenever a schedule is loaded.
+        :param schedule_stream: Whether the downloaded schedules are parsed as they arrive.
+        :param schedule_cache: Whether the streamed schedules are also written to the schedule folder.
+        :return: The list of classrooms, and the thread loading the schedules (if any).
         """
-        # Read the classrooms.
-        classrooms_data = pd.read_csv(path)
+        # Load the schedules as soon as the classrooms are read (the outdated cached schedules only being useful
+        # until their revalidation, or if it fails).
+        wait = schedule_max_age == timedelta(0)
+        queue = Queue()
+        ready = Event()
+        loader = None
+        if schedule_pools is not None:
+            loader = Thread(
+                target=Hyperplanning.__load_schedules,
+                args=(queue, schedule_pools, ready, wait, not wait or schedule_deadline is not None, schedule_updated),
+                daemon=True
+            )
+            loader.start()
 
-        # Save the classrooms.
+        # Read the classrooms by chunks.
         classrooms = []
+        try:
+            reader = pd.read_csv(
+                path,
+                usecols=list(Hyperplanning.CLASSROOM_COLUMNS),
+                dtype=Hyperplanning.CLASSROOM_COLUMNS,
+                chunksize=Hyperplanning.CHUNK_SIZE
+            )
+            for chunk in reader:
+                chunk_classrooms = []
+                for line, row in zip(chunk.index + 2, chunk.itertuples(index=False)):
+                    # Create the classroom.
+                    classroom = Classroom(
+                        row.name,
+                        row.description,
+                        row.floor,
+                        Hyperplanning.__get_location(sub_buildings, "sub-building", row.sub_building, path, line),
+                        Hyperplanning.__get_location(buildings, "building", row.building, path, line),
+                        Hyperplanning.__get_location(locations, "location", row.location, path, line),
+                        row.places,
+                        row.outlets,
+                        row.computers,
+                        row.projector == "Yes",
+                        row.audio == "Yes"
+                    )
+
+                    # Create the schedule.
+                    if schedule_pools is not None:
+                        classroom.set_schedule({
+                            "id": row.schedule_id,
+                            "folder": schedule_folder,
+                            "url": schedule_url,
+                            "max_age": schedule_max_age,
+                            "stream": schedule_stream,
+                            "cache": schedule_cache
+                        })
+
+                    # Add the classroom.
+                    chunk_classrooms.append(classroom)
+
+                # Load the schedules of the chunk.
+                classrooms.extend(chunk_classrooms)
+                queue.put(chunk_classrooms)
+        finally:
+            queue.put(None)
 
-        # Create a queue for thread workers.
-        queue = Queue()
+        # No schedules.
+        if schedule_pools is None:
+            return classrooms, loader
 
-        for index, row in classrooms_data.iterrows():
-            # Create the classroom.
-            classroom = Classroom(
-                row["name"],
-                row["description"],
-                row["floor"],
-                sub_buildings[row["sub_building"]],
-                buildings[row["building"]],
-                locations[row["location"]],
-                row["places"],
-                row["outlets"],
-                row["computers"],
-                row["projector"] == "Yes",
-                row["audio"] == "Yes"
-            )
+        # Wait for the schedules with data, or for the deadline.
+        ready.wait(schedule_deadline.total_seconds() if schedule_deadline is not None else None)
 
-            # Add the classroom.
-            classrooms.append(classroom)
-
-            # Package information for the workers.
-            queue.put({
-                "classroom": classroom,
-                "info": {
-                    "id": row["schedule_id"],
-                    "folder": schedule_folder,
-                    "url": schedule_url,
-                    "reload": schedule_reload
-                }
-            })
-
-        # Package false information to make workers stop.
-        for _ in range(schedule_workers):
-            queue.put(None)
+        return classrooms, loader
+
+    @staticmethod
+    def __get_location(locations: dict, location_type: str, alias: str, path: str, line: int):
+        """
+        Returns the location of a classroom from its alias.
 
-        # Create the workers.
-        workers = [
-            Thread(target=Hyperplanning.__load_schedule_from_queue, args=(queue,))
-            for _ in range(schedule_workers)
+        :param locations: The dictionary of locations.
+        :param location_type: The location type.
+        :param alias: The location alias.
+        :param path: The storage path of the classrooms file.
+        :param line: The line of the classroom in the file.
+        :return: The location, if any.
+        """
+        if pd.isna(alias):
+            return None
+        if alias not in locations:
+            raise ValueError(f"Unknown {location_type} '{alias}' in '{path}' (line {line}).")
+        return locations[alias]
+
+    @staticmethod
+    def __load_schedules(
+        queue: Queue,
+        schedule_pools: tuple,
+        ready: Event,
+        wait: bool,
+        load_stale: bool,
+        updated: Event = None
+    ):
+        """
+        Loads the classroom schedules, by chunks of classrooms from a queue.
+        The cached schedules are loaded with the parse pool while the outdated schedules are downloaded.
+
+        :param queue: The queue of the chunks of classrooms (None at the end).
+        :param schedule_pools: The download and parse pools.
+        :param ready: The event to set once every schedule has data, or could not get any.
+        :param wait: Whether the revalidated schedules are waited for before setting the ready event.
+        :param load_stale: Whether to load the outdated cached schedules until they are revalidated.
+        :param updated: The event to set whenever a schedule is loaded.
+        """
+        download_pool, parse_pool = schedule_pools
+
+        loads = []
+        downloads = []
+        try:
+            while True:
+                # Get a chunk.
+                classrooms = queue.get()
+                if classrooms is None:
+                    break
+
+                for classroom in classrooms:
+                    # Load the cached schedule.
+                    stale = classroom.schedule.is_stale()
+                    if not stale or load_stale:
+                        loads.append(parse_pool.submit(
+                            Hyperplanning.__load_schedule, classroom.schedule, True, updated
+                        ))
+
+                    # Revalidate the schedule.
+                    if stale:
+                        downloads.append((classroom.schedule, download_pool.submit(
+                            Hyperplanning.__download_schedule, classroom.schedule, schedule_pools, updated
+                        )))
+
+            # Wait for the cached schedules, and for the schedules without cached data (or for all of them).
+            for future in loads:
+                future.result()
+            for schedule, future in downloads:
+                if wait or not schedule.is_loaded():
+                    future.result().result()
+        finally:
+            ready.set()
+
+        # Wait for the revalidated schedules.
+        for schedule, future in downloads:
+            future.result().result()
+
+    @staticmethod
+    def __revalidate_schedules(classrooms: List[Classroom], schedule_pools: tuple, updated: Event = None):
+        """
+        Revalidates classroom schedules.
+
+        :param classrooms: The list of classrooms.
+        :param schedule_pools: The download and parse pools.
+        :param updated: The event to set whenever a schedule is loaded.
+        """
+        download_pool = schedule_pools[0]
+        futures = [
+            download_pool.submit(Hyperplanning.__download_schedule, classroom.schedule, schedule_pools, updated)
+            for classroom in classrooms
         ]
+        for future in futures:
+            future.result().result()
 
-        # Start the workers.
-        for worker in workers:
-            worker.start()
+    @staticmethod
+    def __download_schedule(schedule: Schedule, schedule_pools: tuple, updated: Event = None):
+        """
+        Downloads a schedule within the limits of the fetcher, then loads it with the parse pool
+        (or parses it as it arrives, for the streamed schedules).
+        The cached schedule is used if the schedule cannot be downloaded.
+
+        :param schedule: The schedule.
+        :param schedule_pools: The fetcher and the parse pool.
+        :param updated: The event to set whenever a schedule is loaded.
+        :return: The future result of the loading.
+        """
+        fetcher, parse_pool = schedule_pools
 
-        # Wait for the workers to finish.
-        for worker in workers:
-            worker.join()
+        # Parse the schedule as it arrives.
+        if schedule.streaming:
+            streamed = fetcher.fetch(schedule.stream)
+            return parse_pool.submit(
+                Hyperplanning.__load_schedule, schedule, not streamed and not schedule.is_loaded(), updated
+            )
 
-        return classrooms
+        downloaded = fetcher.fetch(schedule.download)
+        return parse_pool.submit(Hyperplanning.__load_schedule, schedule, downloaded or not schedule.is_loaded(), updated)
 
     @staticmethod
-    def __load_schedule_from_queue(queue: Queue):
+    def __load_schedule(schedule: Schedule, load: bool = True, updated: Event = None):
         """
-        Loads a classroom schedule from a worker queue.
+        Loads a cached schedule.
 
-        :param queue: The worker queue.
+        :param schedule: The schedule.
+        :param load: Whether to load the schedule.
+        :param updated: The event to set whenever a schedule is loaded.
         """
-        while True:
-            # Get a package.
-            package = queue.get()
-            if package is None:
-                return
+        if load:
+            schedule.load()
+        if updated is not None:
+            updated.set()
 
-            # Load the schedule.
-            package["classroom"].set_schedule(package["info"])
+    def refresh(self):
+        """
+        Revalidates the outdated schedules in the background.
+        The updated event is set whenever a schedule is loaded.
+
+        :return: The background thread, if any.
+        """
+        # No schedules.
+        if self.schedule_pools is None:
+            return None
+
+        # Get the outdated schedules, requested again from now.
+        date = datetime.now(tz.tzutc())
+        classrooms = [
+            classroom for classroom in self.classrooms
+            if classroom.schedule is not None and classroom.schedule.is_stale(date)
+        ]
+        for classroom in classrooms:
+            classroom.schedule.requested = date
+
+        # Revalidate the schedules.
+        self.loader = Thread(
+            target=Hyperplanning.__revalidate_schedules,
+            args=(classrooms, self.schedule_pools, self.updated),
+            daemon=True
+        )
+        self.loader.start()
+        return self.loader
+
+    def join(self):
+        """
+        Waits for the schedules loading in the background (e.g. the revalidated schedules).
+        """
+        if self.loader is not None:
+            self.loader.join()
 
     @staticmethod
-    def __filter_by_availability(classrooms: List[Classroom], available: bool = True, date: datetime = datetime.now()):
+    def __filter_by_availability(availabilities: List[Availability], available: bool = True):
         """
-        Filters a list of classrooms by availability.
+        Filters a list of classroom availabilities by availability.
 
-        :param classrooms: The list of classrooms to filter.
+        :param availabilities: The list of classroom availabilities to filter.
         :param available: Whether the classrooms need to be available.
-        :param date: The datetime to check for availability.
-        :return: The list of classrooms with the specified availability.
+        :return: The list of classroom availabilities with the specified availability.
         """
         results = []
-        for classroom in classrooms:
-            if classroom.is_available(date) == available:
-                results.append(classroom)
+        for availability in availabilities:
+            if availability.available == available:
+                results.append(availability)
         return results
 
     @staticmethod
-    def __filter_by_min_availability_duration(
-        classrooms: List[Classroom],
-        min_duration: timedelta,
-        date: datetime = datetime.now()
-    ):
+    def __filter_by_min_availability_duration(availabilities: List[Availability], min_duration: timedelta):
         """
-        Filters a list of classrooms by minimal availability duration.
+        Filters a list of classroom availabilities by minimal availability duration.
 
-        :param classrooms: The list of classrooms to filter.
+        :param availabilities: The list of classroom availabilities to filter.
         :param min_duration: The minimum availability duration.
-        :param date: The datetime to check for availability.
-        :return: The list of classrooms with the specified minimum availability duration.
+        :return: The list of classroom availabilities with the specified minimum availability duration.
         """
         results = []
-        for classroom in classrooms:
-            if classroom.is_available(date):
-                duration = classroom.get_available_duration(date)
-                if duration >= min_duration:
-                    results.append(classroom)
+        for availability in availabilities:
+            if availability.available and availability.available_duration >= min_duration:
+                results.append(availability)
         return results
 
+    @staticmethod
+    def __filter_by_matches(classrooms: List[Classroom], matches: List[Classroom]):
+        """
+        Filters a list of classrooms by the matches of a lookup.
+
+        :param classrooms: The list of classrooms to filter.
+        :param matches: The list of matching classrooms, in the order of the lookup.
+        :return: The list of matching classrooms, in the order of the lookup.
+        """
+        classrooms = set(classrooms)
+        return [classroom for classroom in matches if classroom in classrooms]
+
     @staticmethod
     def __filter_by_location(classrooms: List[Classroom], location_type, location_value):
         """
@@ -280,9 +556,14 @@ class Hyperplanning:
         available: bool = True,
         duration: timedelta = None,
         date: datetime = datetime.now(),
+        name_prefix: str = None,
+        search: str = None,
+        near: str = None,
+        limit: int = None,
+        as_of: datetime = None
     ):
         """
-        Returns a filtered list of classrooms.
+        Returns the availabilities of a filtered list of classrooms.
 
         :param name: The name to find.
         :param floor: The floor to find.
@@ -297,8 +578,26 @@ class Hyperplanning:
         :param available: Whether the classroom must be available.
         :param duration: The minimum availability duration.
         :param date: The datetime to check for availability.
-        :return: The filtered list of classrooms.
+        :param name_prefix: The name prefix (or glob pattern) to find.
+        :param search: The approximate name, description or location to find.
+        :param near: The name of the classroom to sort the classrooms by distance from.
+        :param limit: The maximum number of classrooms.
+        :param as_of: The datetime of the archived schedules to check (None for the current schedules).
+        :return: The list of availabilities of the filtered classrooms.
         """
+        # Archived schedules.
+        if as_of is not None and self.archive is None:
+            raise ValueError("No archive of the schedules.")
+
+        # Check the availability filters on the slot index, at a slot boundary.
+        if self.slot_index is not None and as_of is None:
+            return self.get_classrooms_batch([{
+                "name": name, "floor": floor, "sub_building": sub_building, "building": building,
+                "location": location, "places": places, "outlets": outlets, "computers": computers,
+                "projector": projector, "audio": audio, "available": available, "duration": duration,
+                "name_prefix": name_prefix, "search": search, "near": near, "limit": limit
+            }], date)[0]
+
         # Get the classrooms.
         results = self.classrooms
 
@@ -306,13 +605,13 @@ class Hyperplanning:
         if name is not None:
             results = self.__filter_by_value(results, "name", name)
 
-        # Filter by availability.
-        if available is not None:
-            results = self.__filter_by_availability(results, available, date)
+        # Filter by name prefix.
+        if name_prefix is not None:
+            results = self.__filter_by_matches(results, self.name_index.get_prefix(name_prefix))
 
-        # Filter by duration.
-        if duration is not None:
-            results = self.__filter_by_min_availability_duration(results, duration, date)
+        # Filter by search (ordered by relevance).
+        if search is not None:
+            results = self.__filter_by_matches(results, self.name_index.search(search))
 
         # Filter by floor.
         if floor is not None:
@@ -350,4 +649,183 @@ class Hyperplanning:
         if audio is not None:
             results = self.__filter_by_value(results, "audio", audio)
 
+        # Get the availabilities (from the schedules current at the archived datetime, if any).
+        timestamp = int(date.timestamp())
+        if as_of is not None:
+            as_of = int(as_of.timestamp())
+            results = [self.archive.get_availability(classroom, timestamp, as_of) for classroom in results]
+        else:
+            results = [classroom.get_availability(timestamp) for classroom in results]
+
+        # Filter by availability.
+        if available is not None:
+            results = self.__filter_by_availability(results, available)
+
+        # Filter by duration.
+        if duration is not None:
+            results = self.__filter_by_min_availability_duration(results, duration)
+
+        # Sort by distance.
+        if near is not None:
+            results = self.distance_model.sort(results, near, limit)
+
+        # Limit.
+        elif limit is not None:
+            results = results[:max(limit, 0)]
+
+        return results
+
+    def __get_columns(self):
+        """
+        Returns the columns of the classroom attributes used by the batch queries.
+
+        :return: The dictionary of columns (arrays with a value per classroom).
+        """
+        if self.__columns is None:
+            columns = {
+                value_name: np.array([getattr(classroom, value_name) for classroom in self.classrooms], dtype=object)
+                for value_name in ["name", "projector", "audio"]
+            }
+            for value_name in ["floor", "places", "outlets", "computers"]:
+                columns[value_name] = np.array(
+                    [getattr(classroom, value_name) for classroom in self.classrooms], dtype=np.float64
+                )
+            for location_type in ["sub_building", "building", "location"]:
+                for attribute in ["name", "alias"]:
+                    columns[(location_type, attribute)] = np.array([
+                        getattr(getattr(classroom, location_type), attribute)
+                        if getattr(classroom, location_type) is not None else None
+                        for classroom in self.classrooms
+                    ], dtype=object)
+            columns["position"] = {classroom: position for position, classroom in enumerate(self.classrooms)}
+            self.__columns = columns
+        return self.__columns
+
+    def __get_filter(self, filter_name: str, value):
+        """
+        Returns the classrooms matching a filter of a batch query, except the availability filters.
+
+        :param filter_name: The filter name.
+        :param value: The filter value.
+        :return: The boolean array of the matching classrooms, and the rank of each classroom for the lookups.
+        """
+        columns = self.__get_columns()
+
+        # Name prefix and search (ordered by the lookup).
+        if filter_name in ["name_prefix", "search"]:
+            if filter_name == "name_prefix":
+                matches = self.name_index.get_prefix(value)
+            else:
+                matches = self.name_index.search(value)
+            positions = [columns["position"][classroom] for classroom in matches]
+            mask = np.zeros(len(self.classrooms), dtype=bool)
+            mask[positions] = True
+            ranks = np.zeros(len(self.classrooms), dtype=np.int64)
+            ranks[positions] = np.arange(len(positions))
+            return mask, ranks
+
+        # Locations.
+        if filter_name in ["sub_building", "building", "location"]:
+            return (columns[(filter_name, "name")] == value) | (columns[(filter_name, "alias")] == value), None
+
+        # Places, outlets and computers (the missing values never match).
+        if filter_name in ["places", "outlets", "computers"]:
+            return columns[filter_name] >= value, None
+
+        # Name, floor, projector and audio.
+        return np.asarray(columns[filter_name] == value, dtype=bool), None
+
+    def __get_slot_mask(self, timestamp: int, available: bool, duration: timedelta):
+        """
+        Returns the classrooms matching the availability filters from the slot index.
+
+        :param timestamp: The UTC timestamp to check.
+        :param available: Whether the classrooms must be available.
+        :param duration: The minimum availability duration.
+        :return: The boolean array of the matching classrooms, or None if the filters must be checked on the schedules.
+        """
+        if self.slot_index is None or (available is None and duration is None):
+            return None
+        return self.slot_index.get_mask(timestamp, available, duration)
+
+    def get_classrooms_batch(self, queries: List[dict], date: datetime = None):
+        """
+        Returns the availabilities of several filtered lists of classrooms at once.
+        The filters of all the queries are checked in a single pass over the classrooms,
+        and the availability of each classroom is computed at most once.
+        At a slot boundary, the availability filters are also checked on the slot index.
+
+        :param queries: The list of queries (the filters of get_classrooms, except the date).
+        :param date: The datetime to check for availability (now by default).
+        :return: The list of availabilities of the filtered classrooms, for each query.
+        """
+        date = date if date is not None else datetime.now()
+        timestamp = int(date.timestamp())
+
+        # Check the filters of the queries, each distinct filter once for all the classrooms.
+        filters = {}
+        prepared = []
+        for query in queries:
+            for filter_name in query:
+                if filter_name not in self.QUERY:
+                    raise ValueError(f"Unknown filter '{filter_name}'.")
+            query = dict(self.QUERY, **query)
+
+            # Combine the filters (the results are ordered by the last lookup).
+            mask = np.ones(len(self.classrooms), dtype=bool)
+            ranks = None
+            for filter_name, value in query.items():
+                if value is None or filter_name in ["available", "duration", "near", "limit"]:
+                    continue
+                if (filter_name, value) not in filters:
+                    filters[(filter_name, value)] = self.__get_filter(filter_name, value)
+                filter_mask, filter_ranks = filters[(filter_name, value)]
+                mask &= filter_mask
+                if filter_ranks is not None:
+                    ranks = filter_ranks
+
+            # Availability filters from the slot index.
+            slots = self.__get_slot_mask(timestamp, query["available"], query["duration"])
+            if slots is not None:
+                mask &= slots
+                query = dict(query, available=None, duration=None)
+
+            # Matching classrooms (only the first ones without any filter or sort left).
+            positions = np.flatnonzero(mask)
+            if ranks is not None:
+                positions = positions[np.argsort(ranks[positions], kind="stable")]
+            if query["limit"] is not None and all(query[name] is None for name in ["available", "duration", "near"]):
+                positions = positions[:max(query["limit"], 0)]
+            prepared.append((query, positions))
+
+        # Get the availability of each matching classroom once.
+        availabilities = {}
+        for _, positions in prepared:
+            for position in positions:
+                if position not in availabilities:
+                    availabilities[position] = self.classrooms[position].get_availability(timestamp)
+
+        results = []
+        for query, positions in prepared:
+            # Get the availabilities.
+            result = [availabilities[position] for position in positions]
+
+            # Filter by availability.
+            if query["available"] is not None:
+                result = self.__filter_by_availability(result, query["available"])
+
+            # Filter by duration.
+            if query["duration"] is not None:
+                result = self.__filter_by_min_availability_duration(result, query["duration"])
+
+            # Sort by distance.
+            if query["near"] is not None:
+                result = self.distance_model.sort(result, query["near"], query["limit"])
+
+            # Limit.
+            elif query["limit"] is not None:
+                result = result[:max(query["limit"], 0)]
+
+            results.append(result)
+
         return results
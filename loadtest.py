@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+
+# System.
+import os
+import asyncio
+from dotenv import load_dotenv
+
+# Arguments.
+import sys
+import argparse
+
+# Data.
+import numpy as np
+
+# Server.
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from threading import Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
+
+# Dates.
+from time import perf_counter, sleep
+
+
+class FakeAuthor:
+    """
+    Represents the author of a fake Discord command.
+    """
+
+    def __init__(self, identifier: int):
+        """
+        Initializes the author.
+
+        :param identifier: The author identifier.
+        """
+        self.id = identifier
+        self.mention = f"<@{identifier}>"
+
+
+class FakeContext:
+    """
+    Represents the context of a fake Discord command, recording the time of its reply.
+    """
+
+    def __init__(self, identifier: int):
+        """
+        Initializes the context.
+
+        :param identifier: The command identifier.
+        """
+        self.author = FakeAuthor(identifier)
+        self.messages = []
+        self.replied = None
+
+    async def send(self, content):
+        """
+        Records a message sent to the channel of the command.
+
+        :param content: The message content.
+        """
+        self.messages.append(str(content))
+        if self.replied is None:
+            self.replied = perf_counter()
+
+
+class UpstreamServer:
+    """
+    Represents a local stand-in for the schedule server, counting the requests.
+    The schedules are served from a folder of calendar files (an empty calendar for the missing ones).
+    """
+
+    # The calendar of the missing schedules.
+    EMPTY = b"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nEND:VCALENDAR\r\n"
+
+    def __init__(self, folder: str, latency: float = 0):
+        """
+        Initializes and starts the server on a free local port.
+
+        :param folder: The folder of the calendar files.
+        :param latency: The duration of each request (in seconds).
+        """
+        self.folder = folder
+        self.latency = latency
+        self.requests = 0
+        self.bytes = 0
+        self.__lock = Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """
+            Handles the requests of the schedules.
+            """
+
+            def do_GET(self):
+                """
+                Sends a schedule.
+                """
+                sleep(server.latency)
+                content = server.get_schedule(self.path.strip("/").split("?")[0])
+                self.send_response(200)
+                self.send_header("Content-Type", "text/calendar")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *arguments):
+                """
+                Disables the request logs.
+                """
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = "http://127.0.0.1:{port}/{{identifier}}".format(port=self.server.server_address[1])
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def get_schedule(self, identifier: str):
+        """
+        Returns the content of a schedule, and counts the request.
+
+        :param identifier: The schedule identifier.
+        :return: The calendar file content.
+        """
+        path = "{folder}/{identifier}.ics".format(folder=self.folder, identifier=os.path.basename(identifier))
+        content = self.EMPTY
+        if self.folder is not None and os.path.exists(path):
+            with open(path, "rb") as file:
+                content = file.read()
+        with self.__lock:
+            self.requests += 1
+            self.bytes += len(content)
+        return content
+
+    def close(self):
+        """
+        Stops the server.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class LoadTest:
+    """
+    Load test of the bot command path, with a synthetic stream of concurrent commands.
+    """
+
+    # The interval between two measures of the event loop lag (in seconds).
+    LAG_INTERVAL = 0.01
+
+    @staticmethod
+    def __parse_arguments(arguments):
+        """
+        Parses the arguments.
+
+        :param arguments: The list of arguments.
+        :return: The dictionary of options.
+        """
+        parser = argparse.ArgumentParser(description="Load test the bot command path.")
+
+        # Commands.
+        parser.add_argument("-n", "--commands", type=int, default=200, help="set the number of commands")
+        parser.add_argument("-r", "--rate", type=float, default=None,
+                            help="set the number of commands per second (all at once by default)")
+        parser.add_argument("--arguments", default="",
+                            help="set the arguments of the commands (e.g. 'location=Templiers duration=1h')")
+        parser.add_argument("--mode", choices=["command", "application"], default="command",
+                            help="drive the bot command handler or the application directly")
+        parser.add_argument("-c", "--concurrency", type=int, default=os.cpu_count(),
+                            help="set the number of concurrent requests of the application mode")
+
+        # Upstream.
+        parser.add_argument("--source", default=None,
+                            help="set the folder of the served schedules (the schedule folder by default)")
+        parser.add_argument("--cache", default=None,
+                            help="set the schedule folder of the test (a subfolder of the schedule folder by default)")
+        parser.add_argument("--latency", type=float, default=0,
+                            help="set the latency of the upstream requests (in seconds)")
+
+        # Threads.
+        parser.add_argument("-j", "--threads", type=int, default=os.cpu_count(),
+                            help="set the number of threads to use")
+
+        # Parse the arguments.
+        return vars(parser.parse_args(arguments))
+
+    @staticmethod
+    def __configure(url: str, folder: str):
+        """
+        Points the schedules of all the datasets to the local server and to the test folder.
+
+        :param url: The URL pattern of the local server.
+        :param folder: The schedule folder of the test.
+        """
+        prefixes = [""]
+        if os.getenv("DATASETS"):
+            prefixes = [dataset.strip().upper() + "_" for dataset in os.environ["DATASETS"].split(",")]
+        for prefix in prefixes:
+            os.environ[prefix + "SCHEDULE_URL"] = url
+            os.environ[prefix + "SCHEDULE_FOLDER"] = folder
+
+    @staticmethod
+    async def __measure_lag(lags: list):
+        """
+        Measures the event loop lag until it is cancelled.
+
+        :param lags: The list of measured lags (in seconds).
+        """
+        while True:
+            start = perf_counter()
+            await asyncio.sleep(LoadTest.LAG_INTERVAL)
+            lags.append(max(perf_counter() - start - LoadTest.LAG_INTERVAL, 0))
+
+    @staticmethod
+    async def __run_command(identifier: int, arguments: str, start: float, latencies: list, errors: list):
+        """
+        Runs a hyperplanning command with a fake context.
+
+        :param identifier: The command identifier.
+        :param arguments: The arguments of the command.
+        :param start: The arrival time of the command.
+        :param latencies: The list of command latencies, from their arrival to their reply (in seconds).
+        :param errors: The list of command errors.
+        """
+        from bot import hyperplanning, hyperplanning_parser
+
+        ctx = FakeContext(identifier)
+        try:
+            options = await hyperplanning_parser.convert(ctx, arguments)
+            await hyperplanning.callback(ctx, options=options)
+        except Exception as e:
+            errors.append(e)
+            return
+        latencies.append((ctx.replied if ctx.replied is not None else perf_counter()) - start)
+
+    @staticmethod
+    async def __run_application(
+        options: dict,
+        executor: ThreadPoolExecutor,
+        start: float,
+        latencies: list,
+        errors: list
+    ):
+        """
+        Runs a request of the application in a thread.
+
+        :param options: The request options.
+        :param executor: The executor of the requests.
+        :param start: The arrival time of the request.
+        :param latencies: The list of request latencies, from their arrival to their result (in seconds).
+        :param errors: The list of request errors.
+        """
+        from application import Application
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(executor, Application.get_classrooms, dict(options))
+        except Exception as e:
+            errors.append(e)
+            return
+        latencies.append(perf_counter() - start)
+
+    @staticmethod
+    async def __run_load(options: dict):
+        """
+        Sends the commands at the requested rate, and measures them.
+
+        :param options: The load test options.
+        :return: The latencies, the errors, the event loop lags and the duration of the load.
+        """
+        from bot import hyperplanning_parser, parse_options
+
+        latencies, errors, lags = [], [], []
+        lag_task = asyncio.get_running_loop().create_task(LoadTest.__measure_lag(lags))
+        executor = None
+        if options["mode"] == "application":
+            executor = ThreadPoolExecutor(options["concurrency"])
+            request = parse_options(await hyperplanning_parser.convert(FakeContext(0), options["arguments"]))
+            request["threads"] = options["threads"]
+
+        # Send the commands.
+        start = perf_counter()
+        tasks = []
+        for identifier in range(options["commands"]):
+            if options["rate"] is not None:
+                await asyncio.sleep(max(start + identifier / options["rate"] - perf_counter(), 0))
+            if executor is None:
+                coroutine = LoadTest.__run_command(identifier, options["arguments"], perf_counter(), latencies, errors)
+            else:
+                coroutine = LoadTest.__run_application(request, executor, perf_counter(), latencies, errors)
+            tasks.append(asyncio.get_running_loop().create_task(coroutine))
+        await asyncio.gather(*tasks)
+        duration = perf_counter() - start
+
+        # Let the last lag measure end (the event loop may have been blocked until now).
+        await asyncio.sleep(LoadTest.LAG_INTERVAL)
+        lag_task.cancel()
+        if executor is not None:
+            executor.shutdown()
+        return latencies, errors, lags, duration
+
+    @staticmethod
+    def __format_percentiles(values: list):
+        """
+        Formats the percentiles of durations.
+
+        :param values: The list of durations (in seconds).
+        :return: The formatted percentiles.
+        """
+        if not values:
+            return "none"
+        p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+        return "p50 {0:.1f} ms, p95 {1:.1f} ms, p99 {2:.1f} ms, max {3:.1f} ms".format(
+            p50, p95, p99, max(values) * 1000
+        )
+
+    @staticmethod
+    def run():
+        """
+        Runs the load test.
+        """
+        # Parse the arguments.
+        options = LoadTest.__parse_arguments(sys.argv[1:])
+
+        # Start the local schedule server.
+        load_dotenv()
+        server = UpstreamServer(options["source"] or os.getenv("SCHEDULE_FOLDER"), options["latency"])
+        cache = options["cache"] or "{folder}/loadtest".format(folder=os.getenv("SCHEDULE_FOLDER") or "cache")
+        LoadTest.__configure(server.url, cache)
+
+        # Run the load.
+        latencies, errors, lags, duration = asyncio.run(LoadTest.__run_load(options))
+        server.close()
+
+        # Report the measures.
+        print("Commands : {0} ({1} errors) in {2:.2f} s, {3:.1f} commands/s".format(
+            options["commands"], len(errors), duration, len(latencies) / duration if duration > 0 else 0
+        ))
+        print("Latency : " + LoadTest.__format_percentiles(latencies))
+        print("Event loop lag : " + LoadTest.__format_percentiles(lags))
+        print("Upstream : {0} requests, {1:.1f} KiB".format(server.requests, server.bytes / 1024))
+        for error in errors[:5]:
+            print(f"Error : {error!r}")
+
+
+# Run the load test.
+if __name__ == "__main__":
+    LoadTest.run()
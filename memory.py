@@ -0,0 +1,387 @@
+#!/usr/bin/env python
+
+# System.
+import os
+import sys
+import inspect
+import importlib
+import tracemalloc
+from tempfile import TemporaryDirectory
+
+# Arguments.
+import argparse
+
+# Types.
+from typing import List
+
+# Schedules.
+from schedule import Schedule
+
+# Dates.
+from datetime import datetime, timezone
+
+
+class MemoryReport:
+    """
+    Represents the memory used by the subsystems of the application, from the allocations traced by tracemalloc.
+    An allocation is attributed to the first subsystem whose code is in its traceback.
+    """
+
+    # The number of frames stored for each allocation (each frame slows down the traced code).
+    FRAMES = 2
+
+    # The subsystems allocating their memory on specific lines of some code (the innermost frame of the allocation).
+    LINES = [
+        ("Raw calendar files", "schedule.Schedule.__load_schedule", "file.read()"),
+        ("Course objects", "schedule.Schedule.__read_events", "Course("),
+        ("Course timestamps", "schedule.Schedule.__read_events", "_timestamp = ")
+    ]
+
+    # The subsystems, with the code allocating their memory (by order of priority).
+    SUBSYSTEMS = [
+        ("Caches", [
+            "schedule.Schedule.__get_window",
+            "hyperplanning.Hyperplanning.__get_columns",
+            "name_index",
+            "distance",
+            "transitions"
+        ]),
+        ("Pandas frames", ["pandas", "numpy"]),
+        ("Calendar strings", ["icalendar"]),
+        ("Course objects", ["course"]),
+        ("Recurrences", ["recurrence", "dateutil"]),
+        ("Schedule courses", ["schedule"]),
+        ("Locations", ["location", "hyperplanning.Hyperplanning.__load_locations"]),
+        ("Classrooms", ["classroom", "hyperplanning.Hyperplanning.__load_classrooms"]),
+        ("Storage", ["store", "snapshot"])
+    ]
+
+    # The subsystems holding the courses (all of them holding memory once a schedule is loaded).
+    COURSE_SUBSYSTEMS = ["Calendar strings", "Course objects", "Course timestamps", "Recurrences", "Schedule courses"]
+
+    # The default budget of the courses (in bytes per course).
+    BUDGET = 1024
+
+    # The interval between two recurring courses of the synthetic calendars (in courses).
+    RECURRENCE_INTERVAL = 50
+
+    def __init__(self):
+        """
+        Initializes the memory report, resolving the location of the code of each subsystem.
+        """
+        self.codes = [
+            (subsystem, [self.__get_location(code) for code in codes])
+            for subsystem, codes in self.SUBSYSTEMS
+        ]
+
+        # The subsystems of the frames (computed on first use).
+        self.frames = {}
+
+        # Lines of the subsystems.
+        self.lines = {}
+        for subsystem, code, text in self.LINES:
+            filename = self.__get_location(code)[0]
+            lines, start = inspect.getsourcelines(self.__get_object(code))
+            for offset, line in enumerate(lines):
+                if text in line:
+                    self.lines[(filename, start + offset)] = subsystem
+
+    @staticmethod
+    def start():
+        """
+        Starts tracing the allocations, if they are not already traced.
+        Only the allocations made afterwards are attributed.
+
+        :return: Whether the allocations were already traced.
+        """
+        if tracemalloc.is_tracing():
+            return True
+        tracemalloc.start(MemoryReport.FRAMES)
+        return False
+
+    @staticmethod
+    def __get_object(code: str):
+        """
+        Returns a module, class or function from its dotted name (with the private names unmangled).
+
+        :param code: The dotted name (e.g. 'schedule.Schedule.__read_events').
+        :return: The module, class or function.
+        """
+        names = code.split(".")
+        current = importlib.import_module(names[0])
+        owner = None
+        for name in names[1:]:
+            if name.startswith("__") and not name.endswith("__") and owner is not None:
+                name = f"_{owner.__name__}{name}"
+            current = getattr(current, name)
+            owner = current if inspect.isclass(current) else owner
+            if isinstance(current, (staticmethod, classmethod)):
+                current = current.__func__
+        return current
+
+    @staticmethod
+    def __get_location(code: str):
+        """
+        Returns the location of some code.
+
+        :param code: The dotted name of a package, module or function.
+        :return: The path of the file or folder, and the range of lines (None for the whole file or folder).
+        """
+        code_object = MemoryReport.__get_object(code)
+
+        # Function.
+        if inspect.isfunction(code_object):
+            lines, start = inspect.getsourcelines(code_object)
+            return os.path.abspath(inspect.getsourcefile(code_object)), start, start + len(lines) - 1
+
+        # Package.
+        if hasattr(code_object, "__path__"):
+            return os.path.abspath(list(code_object.__path__)[0]) + os.sep, None, None
+
+        # Module.
+        return os.path.abspath(code_object.__file__), None, None
+
+    def __get_frame_subsystem(self, filename: str, lineno: int):
+        """
+        Returns the subsystem of the code of a frame.
+
+        :param filename: The file of the frame.
+        :param lineno: The line of the frame.
+        :return: The priority and the name of the subsystem, if any.
+        """
+        filename = os.path.abspath(filename)
+        for priority, (subsystem, locations) in enumerate(self.codes):
+            for path, first, last in locations:
+                if path.endswith(os.sep):
+                    if filename.startswith(path):
+                        return priority, subsystem
+                elif filename == path and (first is None or first <= lineno <= last):
+                    return priority, subsystem
+        return None
+
+    def get_subsystem(self, traceback: tracemalloc.Traceback):
+        """
+        Returns the subsystem of an allocation.
+
+        :param traceback: The traceback of the allocation.
+        :return: The subsystem name.
+        """
+        # Specific lines.
+        innermost = traceback[-1]
+        subsystem = self.lines.get((os.path.abspath(innermost.filename), innermost.lineno))
+        if subsystem is not None:
+            return subsystem
+
+        # Subsystem of the highest priority in the traceback.
+        subsystems = []
+        for frame in traceback:
+            key = (frame.filename, frame.lineno)
+            if key not in self.frames:
+                self.frames[key] = self.__get_frame_subsystem(frame.filename, frame.lineno)
+            if self.frames[key] is not None:
+                subsystems.append(self.frames[key])
+        return min(subsystems)[1] if subsystems else "Other"
+
+    def get_sizes(self, snapshot: tracemalloc.Snapshot = None):
+        """
+        Returns the memory used by each subsystem.
+
+        :param snapshot: The snapshot of the allocations (the current allocations by default).
+        :return: The dictionary of the size (in bytes) and number of blocks of each subsystem.
+        """
+        snapshot = snapshot if snapshot is not None else tracemalloc.take_snapshot()
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+        sizes = {subsystem: [0, 0] for subsystem, _, _ in self.LINES}
+        sizes.update({subsystem: [0, 0] for subsystem, _ in self.SUBSYSTEMS})
+        sizes["Other"] = [0, 0]
+        for statistic in snapshot.statistics("traceback"):
+            size = sizes[self.get_subsystem(statistic.traceback)]
+            size[0] += statistic.size
+            size[1] += statistic.count
+        return {subsystem: tuple(size) for subsystem, size in sizes.items()}
+
+    @staticmethod
+    def get_resident_size():
+        """
+        Returns the resident size of the process.
+
+        :return: The resident size (in bytes), if available.
+        """
+        if not os.path.exists("/proc/self/statm"):
+            return None
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    @staticmethod
+    def get_course_count(hyperplannings: list):
+        """
+        Returns the number of courses and recurring courses of some hyperplannings.
+
+        :param hyperplannings: The list of hyperplannings.
+        :return: The number of courses.
+        """
+        return sum(
+            len(classroom.schedule.courses) + len(classroom.schedule.recurrences)
+            for hyperplanning in hyperplannings
+            for classroom in hyperplanning.classrooms
+            if classroom.schedule is not None
+        )
+
+    @staticmethod
+    def __format_size(size: float):
+        """
+        Formats a size.
+
+        :param size: The size (in bytes).
+        :return: The formatted size.
+        """
+        for unit in ["B", "KiB", "MiB"]:
+            if abs(size) < 1024:
+                return f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GiB"
+
+    def format(self, hyperplannings: list = None):
+        """
+        Returns the formatted memory report.
+
+        :param hyperplannings: The list of loaded hyperplannings (to compute the memory per course).
+        :return: The formatted report.
+        """
+        if not tracemalloc.is_tracing():
+            return "The memory allocations are not traced."
+
+        # Subsystems.
+        sizes = self.get_sizes()
+        total = sum(size for size, _ in sizes.values())
+        width = max(len(subsystem) for subsystem in sizes)
+        result = "Memory by subsystem :\n"
+        for subsystem, (size, count) in sorted(sizes.items(), key=lambda item: -item[1][0]):
+            result += "{0:<{width}}  {1:>10}  {2:>5.1f} %  {3} blocks\n".format(
+                subsystem,
+                self.__format_size(size),
+                100 * size / total if total > 0 else 0,
+                count,
+                width=width
+            )
+
+        # Totals.
+        current, peak = tracemalloc.get_traced_memory()
+        result += "Traced : {0} (peak {1})".format(self.__format_size(current), self.__format_size(peak))
+        resident_size = self.get_resident_size()
+        if resident_size is not None:
+            result += "\nResident size : " + self.__format_size(resident_size)
+
+        # Courses.
+        if hyperplannings:
+            courses = self.get_course_count(hyperplannings)
+            if courses > 0:
+                course_size = sum(sizes[subsystem][0] for subsystem in self.COURSE_SUBSYSTEMS)
+                result += "\nCourses : {0} ({1:.1f} bytes per course)".format(courses, course_size / courses)
+
+        return result
+
+    @staticmethod
+    def write_calendar(path: str, courses: int):
+        """
+        Writes a synthetic calendar file (with a few weekly courses).
+
+        :param path: The path of the calendar file.
+        :param courses: The number of courses.
+        """
+        with open(path, "w") as file:
+            file.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Hyperplanning//Memory//EN\r\n")
+            for index in range(courses):
+                day, slot = divmod(index, 4)
+                start = 1577865600 + day * 86400 + slot * 7200
+                file.write(
+                    "BEGIN:VEVENT\r\n"
+                    f"UID:course-{index}\r\n"
+                    f"DTSTAMP:20200101T000000Z\r\n"
+                    f"DTSTART:{MemoryReport.__format_timestamp(start)}\r\n"
+                    f"DTEND:{MemoryReport.__format_timestamp(start + 5400)}\r\n"
+                    f"SUMMARY:Course {index % 50} - Group {index % 7}\r\n"
+                    + ("RRULE:FREQ=WEEKLY;COUNT=4\r\n" if index % MemoryReport.RECURRENCE_INTERVAL == 0 else "")
+                    + "END:VEVENT\r\n"
+                )
+            file.write("END:VCALENDAR\r\n")
+
+    @staticmethod
+    def __format_timestamp(timestamp: int):
+        """
+        Formats a UTC timestamp as a calendar datetime.
+
+        :param timestamp: The UTC timestamp.
+        :return: The calendar datetime.
+        """
+        return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    def get_course_size(self, courses: int):
+        """
+        Returns the memory kept by a loaded schedule of synthetic courses.
+
+        :param courses: The number of courses.
+        :return: The memory of the courses (in bytes per course), and the memory of each subsystem (in bytes).
+        """
+        self.start()
+
+        with TemporaryDirectory() as folder:
+            self.write_calendar(f"{folder}/memory.ics", courses)
+            schedule = Schedule("memory", folder, "http://127.0.0.1/{identifier}", None)
+            before = tracemalloc.take_snapshot()
+            schedule.load()
+            after = tracemalloc.take_snapshot()
+
+        # Memory kept by the schedule.
+        ignored = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        statistics = after.filter_traces(ignored).compare_to(before.filter_traces(ignored), "filename")
+
+        # Memory kept by each subsystem.
+        before_sizes = self.get_sizes(before)
+        sizes = {subsystem: size - before_sizes[subsystem][0] for subsystem, (size, _) in self.get_sizes(after).items()}
+
+        return sum(statistic.size_diff for statistic in statistics) / courses, sizes
+
+    @staticmethod
+    def __parse_arguments(arguments: List[str]):
+        """
+        Parses the arguments.
+
+        :param arguments: The list of arguments.
+        :return: The dictionary of options.
+        """
+        parser = argparse.ArgumentParser(description="Check the memory of the loaded courses against a budget.")
+        parser.add_argument("-n", "--courses", type=int, default=5000, help="set the number of synthetic courses")
+        parser.add_argument("-b", "--budget", type=float, default=MemoryReport.BUDGET,
+                            help="set the maximum memory of a course (in bytes)")
+        return vars(parser.parse_args(arguments))
+
+    @staticmethod
+    def run():
+        """
+        Checks the memory of the loaded courses against the budget.
+        The process exits with an error if the budget is exceeded,
+        or if the memory of a course subsystem is not attributed (e.g. after the loading code has moved).
+        """
+        options = MemoryReport.__parse_arguments(sys.argv[1:])
+        course_size, sizes = MemoryReport().get_course_size(options["courses"])
+        print("{0} courses : {1:.1f} bytes per course (budget {2:g} bytes)".format(
+            options["courses"], course_size, options["budget"]
+        ))
+        for subsystem in MemoryReport.COURSE_SUBSYSTEMS:
+            print("{0} : {1:.1f} bytes per course".format(subsystem, sizes[subsystem] / options["courses"]))
+
+        # Check the subsystems.
+        missing = [subsystem for subsystem in MemoryReport.COURSE_SUBSYSTEMS if sizes[subsystem] <= 0]
+        if missing:
+            sys.exit("No memory attributed to the subsystems: {}.".format(", ".join(missing)))
+
+        # Check the budget.
+        if course_size > options["budget"]:
+            sys.exit("The memory budget of the courses is exceeded.")
+
+
+# Check the memory budget.
+if __name__ == "__main__":
+    MemoryReport.run()
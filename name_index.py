@@ -0,0 +1,227 @@
+# Text.
+import unicodedata
+from fnmatch import fnmatchcase
+
+# Types.
+from typing import List
+
+# Classrooms.
+from classroom import Classroom
+
+# Data.
+import pandas as pd
+
+# Search.
+from bisect import bisect_left
+
+
+class NameIndex:
+    """
+    Represents an index of the classroom names for prefix, glob and approximate lookups.
+    """
+
+    # The indexed fields.
+    FIELDS = ["name", "description", "location"]
+
+    def __init__(self, classrooms: List[Classroom]):
+        """
+        Initializes the index.
+
+        :param classrooms: The list of classrooms to index.
+        """
+        # The entries of each key (field, classroom position).
+        self.classrooms = classrooms
+        self.entries = {}
+        for position, classroom in enumerate(classrooms):
+            for field, text in self.__get_texts(classroom):
+                key = self.normalize(text)
+                if key:
+                    self.entries.setdefault(key, set()).add((field, position))
+
+        # The sorted keys.
+        self.keys = sorted(self.entries)
+
+        # The trigrams of the keys.
+        self.trigrams = {}
+        for key in self.keys:
+            for trigram in self.__get_trigrams(key):
+                self.trigrams.setdefault(trigram, set()).add(key)
+
+    @staticmethod
+    def normalize(text: str):
+        """
+        Normalizes a text for the lookups (case and accent insensitive).
+
+        :param text: The text to normalize.
+        :return: The normalized text.
+        """
+        text = unicodedata.normalize("NFKD", str(text))
+        return "".join(character for character in text if not unicodedata.combining(character)).casefold().strip()
+
+    @staticmethod
+    def __get_texts(classroom: Classroom):
+        """
+        Returns the texts of a classroom to index.
+
+        :param classroom: The classroom.
+        :return: The list of indexed fields and texts.
+        """
+        texts = [("name", classroom.name)]
+
+        # Description and its words.
+        if pd.notna(classroom.description):
+            texts.append(("description", classroom.description))
+            texts.extend(("description", word) for word in str(classroom.description).split())
+
+        # Location aliases and names.
+        for location in [classroom.sub_building, classroom.building, classroom.location]:
+            if location is not None:
+                texts.append(("location", location.alias))
+                texts.append(("location", location.name))
+
+        return texts
+
+    @staticmethod
+    def __get_trigrams(key: str):
+        """
+        Returns the trigrams of a key.
+
+        :param key: The normalized key.
+        :return: The set of trigrams of the key.
+        """
+        padded = "$" + key + "$"
+        return {padded[index:index + 3] for index in range(max(len(padded) - 2, 1))}
+
+    @staticmethod
+    def __get_distance(first: str, second: str, limit: int):
+        """
+        Returns the edit distance between two keys, bounded by a limit.
+
+        :param first: The first key.
+        :param second: The second key.
+        :param limit: The maximum distance of interest.
+        :return: The edit distance, or a value above the limit.
+        """
+        if abs(len(first) - len(second)) > limit:
+            return limit + 1
+
+        previous = list(range(len(second) + 1))
+        for row, first_character in enumerate(first, 1):
+            current = [row]
+            for column, second_character in enumerate(second, 1):
+                current.append(min(
+                    previous[column] + 1,
+                    current[column - 1] + 1,
+                    previous[column - 1] + (first_character != second_character)
+                ))
+            if min(current) > limit:
+                return limit + 1
+            previous = current
+        return previous[-1]
+
+    def __get_classrooms(self, keys, fields: List[str]):
+        """
+        Returns the classrooms of some keys.
+
+        :param keys: The keys.
+        :param fields: The fields to consider.
+        :return: The set of classroom positions.
+        """
+        return {
+            position
+            for key in keys
+            for field, position in self.entries[key]
+            if field in fields
+        }
+
+    def __get_prefix_keys(self, prefix: str):
+        """
+        Returns the keys starting with a prefix.
+
+        :param prefix: The normalized prefix.
+        :return: The generator of keys.
+        """
+        for index in range(bisect_left(self.keys, prefix), len(self.keys)):
+            if not self.keys[index].startswith(prefix):
+                return
+            yield self.keys[index]
+
+    def __sort(self, positions):
+        """
+        Returns the classrooms at some positions, in the catalog order.
+
+        :param positions: The classroom positions.
+        :return: The list of classrooms.
+        """
+        return [self.classrooms[position] for position in sorted(positions)]
+
+    def get_prefix(self, prefix: str, fields: List[str] = None):
+        """
+        Returns the classrooms with a text starting with a prefix.
+        The prefix can also be a glob pattern (with '*', '?' or '[').
+
+        :param prefix: The prefix or glob pattern.
+        :param fields: The fields to consider (the names by default).
+        :return: The list of matching classrooms.
+        """
+        fields = fields or ["name"]
+        prefix = self.normalize(prefix)
+
+        # Glob pattern.
+        wildcards = [prefix.find(character) for character in "*?[" if character in prefix]
+        if wildcards:
+            literal = prefix[:min(wildcards)]
+            keys = [key for key in self.__get_prefix_keys(literal) if fnmatchcase(key, prefix)]
+
+        # Prefix.
+        else:
+            keys = self.__get_prefix_keys(prefix)
+
+        return self.__sort(self.__get_classrooms(keys, fields))
+
+    def search(self, text: str, fields: List[str] = None):
+        """
+        Returns the classrooms matching a text, tolerating typos.
+        Exact and prefix matches are returned first, then approximate matches if there are none.
+
+        :param text: The text to find.
+        :param fields: The fields to consider (all the fields by default).
+        :return: The list of matching classrooms, from the best match to the worst.
+        """
+        fields = fields or self.FIELDS
+        text = self.normalize(text)
+        if not text:
+            return []
+
+        # Exact matches.
+        scores = {}
+        if text in self.entries:
+            for position in self.__get_classrooms([text], fields):
+                scores[position] = 0
+
+        # Prefix matches.
+        for position in self.__get_classrooms(self.__get_prefix_keys(text), fields):
+            scores.setdefault(position, 1)
+
+        # Approximate matches.
+        if not scores:
+            limit = 1 if len(text) <= 4 else 2
+            candidates = {key for trigram in self.__get_trigrams(text) for key in self.trigrams.get(trigram, ())}
+            for key in candidates:
+                distance = self.__get_distance(text, key, limit)
+                if distance <= limit:
+                    for position in self.__get_classrooms([key], fields):
+                        scores[position] = min(scores.get(position, distance + 1), distance + 1)
+
+        return [self.classrooms[position] for position in sorted(scores, key=lambda x: (scores[x], x))]
+
+    def get_suggestions(self, text: str, limit: int = 10):
+        """
+        Returns the names of the classrooms matching a text, for autocompletion.
+
+        :param text: The beginning of the name, or an approximate name.
+        :param limit: The maximum number of suggestions.
+        :return: The list of classroom names.
+        """
+        classrooms = self.get_prefix(text) or self.search(text)
+        return [classroom.name for classroom in classrooms[:limit]]
@@ -0,0 +1,220 @@
+# Asynchronous.
+import asyncio
+
+# Types.
+from typing import List, NamedTuple, Optional
+
+# Hyperplanning.
+from hyperplanning import Hyperplanning
+from classroom import Classroom
+from availability import Availability
+from transitions import TransitionIndex
+
+# Dates.
+from datetime import timedelta
+from time import time
+
+# Events.
+from heapq import heappush, heappop, heapify
+from itertools import count
+
+
+class Subscription(NamedTuple):
+    """
+    Represents a request to be notified when a classroom becomes available.
+    """
+
+    # The subscription identifier.
+    identifier: int
+
+    # The names of the matching classrooms.
+    classrooms: frozenset
+
+    # The minimum availability duration, if any.
+    duration: Optional[timedelta]
+
+    # The context of the request (e.g. the Discord context).
+    context: object
+
+
+class Notifier:
+    """
+    Represents the notifications of the classrooms becoming available.
+
+    The subscriptions are indexed by classroom, and a single min-heap holds the next time
+    each classroom with subscriptions becomes available, so the cost of waiting does not depend on the number of subscriptions.
+    """
+
+    # The maximum duration between two checks of the schedules (in seconds).
+    CHECK = 60
+
+    def __init__(self, hyperplanning: Hyperplanning, callback, refresh: timedelta = None):
+        """
+        Initializes the notifier.
+
+        :param hyperplanning: The hyperplanning object.
+        :param callback: The coroutine function called with the subscription and the availability of the classroom.
+        :param refresh: The interval between two reloadings of the outdated schedules (None to never reload them).
+        """
+        self.hyperplanning = hyperplanning
+        self.callback = callback
+        self.refresh = refresh
+        self.classrooms = {classroom.name: classroom for classroom in hyperplanning.classrooms}
+        self.subscriptions = {}
+        self.classroom_subscriptions = {}
+        self.events = []
+        self.next_events = {}
+        self.identifiers = count()
+        self.wakeup = None
+
+    @staticmethod
+    def __is_matching(subscription: Subscription, availability: Availability):
+        """
+        Checks if an availability matches a subscription.
+
+        :param subscription: The subscription.
+        :param availability: The availability of a classroom.
+        :return: Whether the availability matches the subscription.
+        """
+        return availability.available and (
+            subscription.duration is None or availability.available_duration >= subscription.duration
+        )
+
+    def __schedule(self, name: str, timestamp: int):
+        """
+        Schedules the next check of a classroom, when it next becomes available.
+
+        :param name: The classroom name.
+        :param timestamp: The current UTC timestamp.
+        """
+        end = self.hyperplanning.transition_index.get_next_transition(
+            timestamp,
+            [self.classrooms[name]],
+            TransitionIndex.AVAILABLE
+        )
+        if end is None:
+            self.next_events.pop(name, None)
+            return
+
+        self.next_events[name] = end
+        heappush(self.events, (end, name))
+
+    def __unsubscribe(self, subscription: Subscription):
+        """
+        Removes a subscription.
+
+        :param subscription: The subscription.
+        """
+        self.subscriptions.pop(subscription.identifier, None)
+        for name in subscription.classrooms:
+            subscriptions = self.classroom_subscriptions.get(name)
+            if subscriptions is not None:
+                subscriptions.discard(subscription.identifier)
+                if not subscriptions:
+                    del self.classroom_subscriptions[name]
+                    self.next_events.pop(name, None)
+
+    async def subscribe(self, classrooms: List[Classroom], duration: timedelta = None, context: object = None):
+        """
+        Adds a subscription.
+        The callback is called right away if a classroom is already available.
+
+        :param classrooms: The list of matching classrooms.
+        :param duration: The minimum availability duration, if any.
+        :param context: The context of the request.
+        :return: The subscription, or None if a classroom is already available.
+        """
+        timestamp = int(time())
+        subscription = Subscription(
+            next(self.identifiers),
+            frozenset(classroom.name for classroom in classrooms),
+            duration,
+            context
+        )
+
+        # Available classroom.
+        for classroom in classrooms:
+            availability = classroom.get_availability(timestamp)
+            if self.__is_matching(subscription, availability):
+                await self.callback(subscription, availability)
+                return None
+
+        # Index the subscription.
+        self.subscriptions[subscription.identifier] = subscription
+        for name in subscription.classrooms:
+            self.classroom_subscriptions.setdefault(name, set()).add(subscription.identifier)
+            if name not in self.next_events:
+                self.__schedule(name, timestamp)
+
+        # Wake up the notifier for the new events.
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+        return subscription
+
+    async def __process(self, timestamp: int):
+        """
+        Processes the events due at a given time.
+
+        :param timestamp: The current UTC timestamp.
+        """
+        while self.events and self.events[0][0] <= timestamp:
+            end, name = heappop(self.events)
+
+            # Outdated event.
+            if self.next_events.get(name) != end:
+                continue
+
+            # Notify the matching subscriptions.
+            availability = self.classrooms[name].get_availability(timestamp)
+            for identifier in list(self.classroom_subscriptions.get(name, ())):
+                subscription = self.subscriptions[identifier]
+                if self.__is_matching(subscription, availability):
+                    self.__unsubscribe(subscription)
+                    await self.callback(subscription, availability)
+
+            # Schedule the next event.
+            if name in self.classroom_subscriptions:
+                self.__schedule(name, timestamp)
+
+    def __reschedule(self, timestamp: int):
+        """
+        Checks again all the classrooms with subscriptions, after a reloading of the schedules.
+
+        :param timestamp: The current UTC timestamp.
+        """
+        self.events = [(timestamp, name) for name in self.classroom_subscriptions]
+        self.next_events = {name: timestamp for name in self.classroom_subscriptions}
+        heapify(self.events)
+
+    async def run(self):
+        """
+        Runs the notifier until it is cancelled.
+        """
+        self.wakeup = asyncio.Event()
+        next_refresh = time() + self.refresh.total_seconds() if self.refresh is not None else None
+
+        while True:
+            # Wait for the next event, a new subscription, or the next check.
+            self.wakeup.clear()
+            timeout = self.CHECK
+            if self.events:
+                timeout = min(max(self.events[0][0] - time(), 0), timeout)
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            timestamp = int(time())
+
+            # Reload the outdated schedules.
+            if next_refresh is not None and time() >= next_refresh:
+                self.hyperplanning.refresh()
+                next_refresh = time() + self.refresh.total_seconds()
+
+            # Reloaded schedules.
+            if self.hyperplanning.updated.is_set():
+                self.hyperplanning.updated.clear()
+                self.__reschedule(timestamp)
+
+            # Process the events.
+            await self.__process(timestamp)
@@ -0,0 +1,105 @@
+# Types.
+from typing import List
+
+
+class Pager:
+    """
+    Represents a text split into pages of a maximum length, rendered lazily.
+
+    The text is a list of pieces, each with the separator preceding it, and either a string
+    or a function rendering the string (e.g. the information about a classroom).
+    The pieces are only rendered once a page holding them is requested, and the rendered pages are kept,
+    so that a page is never rendered twice.
+    """
+
+    # The default maximum length of a page (the length of a Discord message).
+    SIZE = 2000
+
+    def __init__(self, pieces: List[tuple], size: int = SIZE):
+        """
+        Initializes the pager.
+
+        :param pieces: The pieces of the text (as separator, and string or function rendering the string).
+        :param size: The maximum length of a page.
+        """
+        self.pieces = pieces
+        self.size = size
+        self.pages = []
+        self.starts = [0]
+        self.__pending = None
+
+    @staticmethod
+    def from_text(text: str, size: int = SIZE):
+        """
+        Returns the pager of a rendered text, split by lines.
+
+        :param text: The text.
+        :param size: The maximum length of a page.
+        :return: The pager.
+        """
+        return Pager([("\n" if index > 0 else "", line) for index, line in enumerate(text.split("\n"))], size)
+
+    @staticmethod
+    def join(pieces: List[tuple]):
+        """
+        Renders all the pieces of a text at once.
+
+        :param pieces: The pieces of the text (as separator, and string or function rendering the string).
+        :return: The text.
+        """
+        return "".join(separator + (piece() if callable(piece) else piece) for separator, piece in pieces)
+
+    def __get_text(self, index: int):
+        """
+        Renders a piece of the text.
+
+        :param index: The index of the piece.
+        :return: The string of the piece.
+        """
+        # Piece rendered while filling the previous page.
+        if self.__pending is not None and self.__pending[0] == index:
+            return self.__pending[1]
+
+        piece = self.pieces[index][1]
+        text = piece() if callable(piece) else piece
+        self.__pending = (index, text)
+        return text
+
+    def __render_page(self):
+        """
+        Renders the page following the last rendered page.
+        The separators at the start of a page are dropped, and a piece longer than a page is truncated.
+        """
+        index = self.starts[-1]
+        page = ""
+        while index < len(self.pieces):
+            text = self.__get_text(index)
+            separator = self.pieces[index][0] if page else ""
+            if page and len(page) + len(separator) + len(text) > self.size:
+                break
+            page += separator + text
+            index += 1
+
+        self.pages.append(page[:self.size])
+        self.starts.append(index)
+
+    def get_page(self, number: int):
+        """
+        Returns a page of the text.
+
+        :param number: The page number (from 0).
+        :return: The page, if any.
+        """
+        while len(self.pages) <= number and (not self.pages or self.starts[-1] < len(self.pieces)):
+            self.__render_page()
+        return self.pages[number] if 0 <= number < len(self.pages) else None
+
+    def get_count(self):
+        """
+        Returns the number of pages, once the last page has been rendered.
+
+        :return: The number of pages, if known.
+        """
+        if self.pages and self.starts[-1] == len(self.pieces):
+            return len(self.pages)
+        return None
@@ -0,0 +1,48 @@
+# Threading.
+from threading import Thread
+from queue import Queue
+from concurrent.futures import Future
+
+
+class WorkerPool:
+    """
+    Represents a bounded pool of worker threads.
+    The workers are daemon threads, so that pending tasks never delay the exit of the process.
+    """
+
+    def __init__(self, workers: int, name: str = "worker"):
+        """
+        Initializes the pool.
+
+        :param workers: The number of workers.
+        :param name: The name of the workers.
+        """
+        self.workers = workers
+        self.queue = Queue()
+        for index in range(workers):
+            Thread(target=self.__work, name=f"{name}-{index}", daemon=True).start()
+
+    def __work(self):
+        """
+        Runs the tasks of the queue.
+        """
+        while True:
+            future, function, arguments = self.queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function(*arguments))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, function, *arguments):
+        """
+        Adds a task to the pool.
+
+        :param function: The function of the task.
+        :param arguments: The arguments of the function.
+        :return: The future result of the task.
+        """
+        future = Future()
+        self.queue.put((future, function, arguments))
+        return future
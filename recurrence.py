@@ -0,0 +1,126 @@
+# Courses.
+from course import Course
+
+# Dates.
+from datetime import datetime, timedelta
+from dateutil.rrule import rruleset, rrulestr
+from dateutil.tz import tz
+
+# Search.
+from itertools import takewhile
+
+
+class Recurrence:
+    """
+    Represents a recurring course of the schedule.
+    The occurrences are only expanded on demand.
+    """
+
+    def __init__(self, identifier: str, description: str, start: datetime, duration: int, rule: str = None):
+        """
+        Initializes the recurrence.
+
+        :param identifier: The identifier of the event.
+        :param description: The course description.
+        :param start: The start datetime of the first occurrence (timezone-aware).
+        :param duration: The duration of each occurrence (in seconds).
+        :param rule: The recurrence rule (RRULE, with its end in UTC), if any.
+        """
+        self.identifier = identifier
+        self.description = description
+        self.start = start
+        self.duration = duration
+        self.rule = rule
+        self.dates = []
+        self.exceptions = []
+        self.__rules = None
+
+        # Check the rule once, rather than on each expansion.
+        self.__rule = rrulestr(rule, dtstart=start) if rule is not None else None
+
+    def add_date(self, date: datetime):
+        """
+        Adds an occurrence (RDATE) to the recurrence.
+
+        :param date: The start datetime of the occurrence (timezone-aware).
+        """
+        self.dates.append(date)
+        self.__rules = None
+
+    def add_exception(self, date: datetime):
+        """
+        Removes an occurrence (EXDATE or overridden RECURRENCE-ID) from the recurrence.
+
+        :param date: The start datetime of the occurrence (timezone-aware).
+        """
+        self.exceptions.append(date)
+        self.__rules = None
+
+    def __get_rules(self):
+        """
+        Returns the set of rules of the recurrence.
+
+        :return: The set of rules of the recurrence.
+        """
+        if self.__rules is None:
+            rules = rruleset()
+            if self.__rule is not None:
+                rules.rrule(self.__rule)
+            else:
+                rules.rdate(self.start)
+            for date in self.dates:
+                rules.rdate(date)
+            for date in self.exceptions:
+                rules.exdate(date)
+            self.__rules = rules
+        return self.__rules
+
+    def get_courses(self, start: int, end: int):
+        """
+        Returns the occurrences that start within a time window.
+
+        :param start: The window start (as a UTC timestamp, inclusive).
+        :param end: The window end (as a UTC timestamp, exclusive).
+        :return: The list of courses of the occurrences.
+        """
+        courses = []
+        for date in self.__get_rules().between(
+            datetime.fromtimestamp(start, tz.tzutc()),
+            datetime.fromtimestamp(end, tz.tzutc()),
+            inc=True
+        ):
+            timestamp = int(date.timestamp())
+            if timestamp < end:
+                courses.append(Course(self.description, timestamp, timestamp + self.duration))
+        return courses
+
+    def get_next_course(self, timestamp: int):
+        """
+        Returns the first occurrence that starts after a given time, if any.
+
+        :param timestamp: The UTC timestamp.
+        :return: The course of the occurrence, if any.
+        """
+        date = self.__get_rules().after(datetime.fromtimestamp(timestamp, tz.tzutc()))
+        if date is None:
+            return None
+        return Course(self.description, int(date.timestamp()), int(date.timestamp()) + self.duration)
+
+    def get_all_courses(self, horizon: timedelta, anchor: datetime = None):
+        """
+        Returns all the occurrences, the recurrences without end (UNTIL or COUNT) being expanded
+        until a horizon after an anchor.
+        By default, the anchor is the first occurrence, so that the occurrences do not depend on the current time.
+
+        :param horizon: The duration after the anchor until which a recurrence without end is expanded.
+        :param anchor: The datetime from which the horizon starts, the first occurrence by default.
+        :return: The list of courses of the occurrences.
+        """
+        dates = self.__get_rules()
+        if self.rule is not None and "UNTIL=" not in self.rule and "COUNT=" not in self.rule:
+            end = (self.start if anchor is None else anchor) + horizon
+            dates = takewhile(lambda date: date <= end, dates)
+        return [
+            Course(self.description, int(date.timestamp()), int(date.timestamp()) + self.duration)
+            for date in dates
+        ]
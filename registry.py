@@ -0,0 +1,203 @@
+# System.
+import os
+
+# Types.
+from typing import List
+
+# Hyperplanning.
+from hyperplanning import Hyperplanning
+
+# Dates.
+from datetime import timedelta
+
+# Threading.
+from threading import Thread
+from pool import WorkerPool
+from fetcher import Fetcher
+
+
+class Registry:
+    """
+    Represents the datasets of several schools, each with its own classrooms and schedule cache.
+    The datasets share the same download and parse pools.
+    """
+
+    # The variables of each dataset.
+    VARIABLES = [
+        "DATA_FOLDER",
+        "SCHEDULE_FOLDER",
+        "SCHEDULE_URL",
+        "SCHEDULE_DATABASE",
+        "SCHEDULE_SNAPSHOT",
+        "SCHEDULE_STREAM",
+        "SCHEDULE_ARCHIVE",
+        "CHANGE_FEED",
+        "DISTANCE_COSTS",
+        "AVAILABILITY_SLOT"
+    ]
+
+    # The name of the dataset without the DATASETS variable.
+    DEFAULT = "default"
+
+    # The modes of the streamed schedules (whether they are also written to the schedule folder).
+    STREAM_MODES = {"cache": True, "memory": False}
+
+    def __init__(self, datasets: dict, download_workers: int = 1, parse_workers: int = 1, download_rate: float = None):
+        """
+        Initializes the registry.
+
+        :param datasets: The variables of each dataset, by dataset name.
+        :param download_workers: The maximum number of concurrent schedule downloads.
+        :param parse_workers: The number of workers to parse the schedules.
+        :param download_rate: The maximum number of schedule downloads per second (None for no limit).
+        """
+        self.datasets = datasets
+        self.schedule_pools = (Fetcher(download_workers, download_rate), WorkerPool(parse_workers, "parse"))
+        self.hyperplannings = {}
+
+    @staticmethod
+    def get_datasets(environment: dict = os.environ):
+        """
+        Returns the variables of each dataset from the environment.
+        The DATASETS variable lists the dataset names (separated by commas), and the variables of each dataset
+        are prefixed by its name in uppercase (e.g. POLYTECH_DATA_FOLDER).
+        Without the DATASETS variable, a single dataset uses the variables without prefix.
+
+        :param environment: The environment variables.
+        :return: The variables of each dataset, by dataset name.
+        """
+        # Single dataset.
+        if not environment.get("DATASETS"):
+            return {Registry.DEFAULT: {name: environment.get(name) for name in Registry.VARIABLES}}
+
+        # Several datasets.
+        datasets = {}
+        for dataset in environment["DATASETS"].split(","):
+            dataset = dataset.strip()
+            datasets[dataset] = {
+                name: environment.get("{dataset}_{name}".format(dataset=dataset.upper(), name=name))
+                for name in Registry.VARIABLES
+            }
+        return datasets
+
+    @staticmethod
+    def __parse_costs(text: str):
+        """
+        Parses the costs of the location hierarchy.
+
+        :param text: The input text (e.g. 'location=1000,building=100,sub_building=10,floor=1').
+        :return: The dictionary of costs.
+        """
+        costs = {}
+        for item in text.split(","):
+            level, _, cost = item.partition("=")
+            costs[level.strip()] = float(cost)
+        return costs
+
+    @staticmethod
+    def __parse_stream(text: str):
+        """
+        Parses the stream mode of the schedules.
+
+        :param text: The input text ('cache' or 'memory', empty for no streaming).
+        :return: Whether the schedules are streamed, and whether they are written to the schedule folder.
+        """
+        if not text:
+            return False, True
+        if text not in Registry.STREAM_MODES:
+            raise ValueError(f"Unknown schedule stream mode '{text}'.")
+        return True, Registry.STREAM_MODES[text]
+
+    def get_names(self, dataset: str = None):
+        """
+        Returns the names of the selected datasets.
+
+        :param dataset: The dataset name (None for all the datasets).
+        :return: The list of dataset names.
+        """
+        if dataset is None:
+            return list(self.datasets)
+        if dataset not in self.datasets:
+            raise ValueError(f"Unknown dataset '{dataset}'.")
+        return [dataset]
+
+    def load(
+        self,
+        names: List[str],
+        max_age: timedelta = timedelta(0),
+        deadline: timedelta = None
+    ):
+        """
+        Loads datasets at once, replacing the previously loaded ones.
+
+        :param names: The list of dataset names.
+        :param max_age: The maximum age of the cached schedules (None to never reload them).
+        :param deadline: The maximum duration to wait for the schedules (None to wait for all of them).
+        :return: The dictionary of hyperplannings, by dataset name.
+        """
+        hyperplannings = {}
+        errors = []
+
+        def load(name: str):
+            variables = self.datasets[name]
+            try:
+                hyperplannings[name] = Hyperplanning(
+                    variables["DATA_FOLDER"],
+                    variables["SCHEDULE_FOLDER"],
+                    variables["SCHEDULE_URL"],
+                    self.schedule_pools[0].workers,
+                    max_age,
+                    deadline,
+                    self.__parse_costs(variables["DISTANCE_COSTS"]) if variables["DISTANCE_COSTS"] else None,
+                    self.schedule_pools,
+                    timedelta(minutes=int(variables["AVAILABILITY_SLOT"])) if variables["AVAILABILITY_SLOT"] else None,
+                    *self.__parse_stream(variables["SCHEDULE_STREAM"]),
+                    variables["SCHEDULE_ARCHIVE"] or None
+                )
+            except Exception as e:
+                errors.append(e)
+
+        # Load the datasets in parallel.
+        loaders = [Thread(target=load, args=(name,), daemon=True) for name in names]
+        for loader in loaders:
+            loader.start()
+        for loader in loaders:
+            loader.join()
+        if errors:
+            raise errors[0]
+
+        self.hyperplannings.update(hyperplannings)
+        return {name: hyperplannings[name] for name in names}
+
+    def get(self, name: str):
+        """
+        Returns a loaded dataset.
+
+        :param name: The dataset name.
+        :return: The hyperplanning of the dataset, if it is loaded.
+        """
+        return self.hyperplannings.get(name)
+
+    def refresh(self, name: str = None):
+        """
+        Revalidates the outdated schedules of loaded datasets in the background.
+
+        :param name: The dataset name (None for all the loaded datasets).
+        :return: The list of background threads.
+        """
+        names = self.get_names(name)
+        return [
+            self.hyperplannings[name].refresh()
+            for name in names
+            if name in self.hyperplannings
+        ]
+
+    def join(self, name: str = None):
+        """
+        Waits for the schedules of loaded datasets loading in the background.
+
+        :param name: The dataset name (None for all the loaded datasets).
+        """
+        for name in self.get_names(name):
+            if name in self.hyperplannings:
+                self.hyperplannings[name].join()
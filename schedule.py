@@ -1,16 +1,29 @@
 # System.
 import os
-from urllib.request import urlretrieve
+from shutil import copyfileobj
+from threading import get_ident, Thread
+from queue import Queue
+from urllib.request import urlopen
 
 # Calendars.
 import icalendar
 
 # Courses.
 from course import Course
+from recurrence import Recurrence
 
 # Dates.
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from dateutil.tz import tz
+from helper import Helper
+
+# Cache.
+from collections import OrderedDict
+from threading import Lock
+
+# Search.
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 
 
 class Schedule:
@@ -18,43 +31,366 @@ class Schedule:
     Represents the schedule of a classroom.
     """
 
-    def __init__(self, identifier: str, folder: str, url: str, reload: bool = True):
+    # The timeout of the schedule downloads (in seconds).
+    TIMEOUT = 30
+
+    # The duration of the windows in which the recurring courses are expanded (in seconds).
+    WINDOW = 7 * 24 * 3600
+
+    # The maximum number of expanded windows kept in memory.
+    WINDOW_CACHE = 16
+
+    # The number of events parsed at once when the download is parsed as it arrives.
+    STREAM_EVENTS = 256
+
+    def __init__(
+        self,
+        identifier: str,
+        folder: str,
+        url: str,
+        max_age: timedelta = timedelta(0),
+        streaming: bool = False,
+        cache: bool = True
+    ):
         """
         Initializes the schedule.
+        The courses are only available once the schedule is loaded or revalidated.
 
         :param identifier: The schedule identifier.
         :param folder: The storage folder of the schedules.
         :param url: The URL pattern to download schedules.
-        :param reload: Whether to force the reloading of schedules.
+        :param max_age: The maximum age of a cached schedule before it is revalidated (None to never revalidate it).
+        :param streaming: Whether the downloads are parsed as they arrive, instead of being read back from the cache.
+        :param cache: Whether the streamed downloads are also written to the cache (in the background).
         """
         # Initialize the attributes.
         self.identifier = identifier
+        self.folder = folder
         self.path = "{folder}/{identifier}.ics".format(folder=folder, identifier=identifier)
         self.url = url.format(identifier=identifier)
+        self.max_age = max_age
+        self.streaming = streaming
+        self.cache = cache
+        self.loaded = False
+        self.error = None
+        self.__lock = Lock()
+        self.version = -1
+        self.__set_courses([], [])
+
+        # Get the age of the cached schedule, compared with the maximum age from the request time.
+        self.requested = datetime.now(tz.tzutc())
+        self.updated = None
+        self.data_updated = None
+        if os.path.exists(self.path):
+            self.updated = datetime.fromtimestamp(os.path.getmtime(self.path), tz.tzutc())
+
+    def __set_courses(self, courses: list, recurrences: list):
+        """
+        Sets the courses of the schedule.
 
-        # Download the schedule.
-        self.__download_schedule(self.url, self.path, folder, reload)
+        :param courses: The sorted list of one-off courses.
+        :param recurrences: The list of recurring courses.
+        """
+        # Index the courses.
+        starts = [course.start for course in courses]
+        ends = list(accumulate((course.end for course in courses), max))
+
+        # Replace the courses at once, so that concurrent queries see a consistent index.
+        self.__index = (courses, starts, ends, recurrences, OrderedDict())
+        self.courses = courses
+        self.recurrences = recurrences
+        self.version += 1
+
+    def load(self):
+        """
+        Loads the cached schedule file, if any.
+
+        :return: Whether the schedule has been loaded.
+        """
+        if self.updated is None:
+            return False
+        updated = self.updated
+        try:
+            courses = self.__load_schedule(self.path)
+        except (OSError, ValueError) as e:
+            self.error = e
+            return False
+
+        # Keep the courses of a download streamed meanwhile.
+        with self.__lock:
+            if self.updated == updated or not self.loaded:
+                self.__set_courses(*courses)
+                self.data_updated = updated
+                self.loaded = True
+        return True
+
+    def is_loaded(self):
+        """
+        Checks if the schedule has data.
+
+        :return: Whether the schedule has been loaded from a cache or a download.
+        """
+        return self.loaded
+
+    def is_stale(self, date: datetime = None):
+        """
+        Checks if the schedule needs to be revalidated.
+
+        :param date: The datetime to check (defaults to now).
+        :return: Whether the schedule is missing or older than its maximum age.
+        """
+        if self.updated is None:
+            return True
+        if self.max_age is None:
+            return False
+        date = date if date is not None else datetime.now(tz.tzutc())
+        return date - self.updated > self.max_age
+
+    def is_outdated(self):
+        """
+        Checks if the loaded schedule data was older than its maximum age when it was requested,
+        and has not been replaced by revalidated data since (even if a new version is being loaded).
+
+        :return: Whether the schedule data is outdated.
+        """
+        if self.data_updated is None or self.max_age is None:
+            return False
+        return self.requested - self.data_updated > self.max_age
+
+    def get_age(self, date: datetime = None):
+        """
+        Returns the age of the loaded schedule data.
+
+        :param date: The datetime to check (defaults to now).
+        :return: The age of the schedule data, if any.
+        """
+        if self.data_updated is None:
+            return None
+        date = date if date is not None else datetime.now(tz.tzutc())
+        return max(date - self.data_updated, timedelta(0))
 
-        # Load the schedule.
-        self.courses = self.__load_schedule(self.path)
+    def download(self):
+        """
+        Downloads the latest version of the schedule to the cache, without loading it.
+
+        :return: Whether the schedule has been downloaded.
+        """
+        try:
+            self.__download_schedule(self.url, self.path, self.folder)
+            self.updated = datetime.now(tz.tzutc())
+            self.error = None
+            return True
+        except OSError as e:
+            self.error = e
+            return False
+
+    def revalidate(self):
+        """
+        Downloads and loads the latest version of the schedule.
+        The previous courses are kept if the schedule cannot be downloaded.
+
+        :return: Whether the schedule has been revalidated.
+        """
+        if self.streaming:
+            return self.stream()
+        return self.download() and self.load()
+
+    def stream(self):
+        """
+        Downloads and loads the latest version of the schedule, parsing the events as they arrive.
+        The previous courses are kept if the schedule cannot be downloaded.
+
+        :return: Whether the schedule has been downloaded and loaded.
+        """
+        try:
+            courses = self.__stream_schedule(self.url, self.path if self.cache else None, self.folder)
+        except (OSError, ValueError) as e:
+            self.error = e
+            return False
+
+        with self.__lock:
+            self.__set_courses(*courses)
+            self.updated = datetime.now(tz.tzutc())
+            self.data_updated = self.updated
+            self.loaded = True
+            self.error = None
+        return True
 
     @staticmethod
-    def __download_schedule(url: str, path: str, folder: str, reload: bool = True):
+    def __download_schedule(url: str, path: str, folder: str):
         """
         Downloads a schedule file.
+        The file is replaced atomically, so that readers never see a partial file.
 
         :param url: The URL to download the schedule file.
         :param path: The storage path of the schedule file.
         :param folder: The storage folder of the schedules.
-        :param reload: Whether to force the reloading of schedules.
         """
         # Create the parent folder.
         if not os.path.exists(folder):
-            os.makedirs(folder)
+            os.makedirs(folder, exist_ok=True)
 
         # Download the schedule.
-        if not os.path.exists(path) or reload:
-            urlretrieve(url, path)
+        temporary_path = "{path}.{thread}.tmp".format(path=path, thread=get_ident())
+        try:
+            with urlopen(url, timeout=Schedule.TIMEOUT) as response, open(temporary_path, "wb") as file:
+                copyfileobj(response, file)
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    @staticmethod
+    def __write_schedule(chunks: Queue, path: str, folder: str, thread: int):
+        """
+        Writes a schedule file from the chunks of a streamed download.
+        The file is only replaced, atomically, once the download has been parsed successfully.
+
+        :param chunks: The queue of the chunks (then True if the download succeeded, False otherwise).
+        :param path: The storage path of the schedule file.
+        :param folder: The storage folder of the schedules.
+        :param thread: The identifier of the downloading thread.
+        """
+        temporary_path = "{path}.{thread}.tmp".format(path=path, thread=thread)
+        chunk = b""
+        try:
+            # Create the parent folder.
+            if not os.path.exists(folder):
+                os.makedirs(folder, exist_ok=True)
+
+            # Write the chunks.
+            with open(temporary_path, "wb") as file:
+                chunk = chunks.get()
+                while isinstance(chunk, bytes):
+                    file.write(chunk)
+                    chunk = chunks.get()
+            if chunk:
+                os.replace(temporary_path, path)
+
+        # The cache is optional, the schedule being loaded anyway.
+        except OSError:
+            while isinstance(chunk, bytes):
+                chunk = chunks.get()
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    @staticmethod
+    def __stream_schedule(url: str, path: str = None, folder: str = None):
+        """
+        Downloads and parses a schedule file by batches of events, as the response arrives.
+        Each batch is parsed with the calendar properties and timezones that precede its events.
+
+        :param url: The URL to download the schedule file.
+        :param path: The storage path of the schedule file (None to not write it).
+        :param folder: The storage folder of the schedules.
+        :return: The sorted list of one-off courses and the list of recurring courses.
+        """
+        # Write the download to the cache in the background.
+        chunks = None
+        if path is not None:
+            chunks = Queue()
+            Thread(target=Schedule.__write_schedule, args=(chunks, path, folder, get_ident())).start()
+
+        courses = []
+        recurrences = {}
+        overrides = []
+        succeeded = False
+        try:
+            header = []
+            events = []
+            event = None
+            count = 0
+            complete = False
+            data = []
+            with urlopen(url, timeout=Schedule.TIMEOUT) as response:
+                for line in response:
+                    data.append(line)
+                    text = line.decode("utf-8")
+                    name = text.strip().upper()
+
+                    # Lines of the events, and of the calendar properties and timezones.
+                    if event is not None:
+                        event.append(text)
+                        if name == "END:VEVENT":
+                            events.extend(event)
+                            event = None
+                            count += 1
+                    elif name == "BEGIN:VEVENT":
+                        event = [text]
+                    elif name == "END:VCALENDAR":
+                        complete = True
+                    else:
+                        header.append(text)
+
+                    # Parse a batch of events.
+                    if count == Schedule.STREAM_EVENTS or complete:
+                        schedule = icalendar.Calendar.from_ical("".join(header + events) + "END:VCALENDAR\r\n")
+                        Schedule.__read_events(schedule, courses, recurrences, overrides)
+                        events = []
+                        count = 0
+                        if chunks is not None:
+                            chunks.put(b"".join(data))
+                            data = []
+                    if complete:
+                        break
+
+            # Truncated download.
+            if not complete:
+                raise ValueError(f"Incomplete schedule file from '{url}'.")
+            succeeded = True
+        finally:
+            if chunks is not None:
+                chunks.put(succeeded)
+
+        return Schedule.__sort_courses(courses, recurrences, overrides)
+
+    @staticmethod
+    def __get_datetime(value):
+        """
+        Returns a timezone-aware datetime from a calendar date or datetime.
+        Dates and floating datetimes are considered in the local timezone.
+
+        :param value: The calendar date or datetime.
+        :return: The timezone-aware datetime.
+        """
+        if not isinstance(value, datetime):
+            value = datetime.combine(value, time())
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=Helper.get_timezone())
+        return value
+
+    @staticmethod
+    def __get_dates(value):
+        """
+        Returns the datetimes of a calendar date list property (RDATE, EXDATE).
+
+        :param value: The calendar property (or list of properties).
+        :return: The list of timezone-aware datetimes.
+        """
+        dates = []
+        for dates_property in (value if isinstance(value, list) else [value]):
+            for date_property in dates_property.dts:
+                if isinstance(date_property.dt, (date, datetime)):
+                    dates.append(Schedule.__get_datetime(date_property.dt))
+        return dates
+
+    @staticmethod
+    def __get_rule(value):
+        """
+        Returns the recurrence rule of a calendar event, with its end (UNTIL) in UTC.
+        An end date or floating datetime is considered in the local timezone, like the start of the event.
+
+        :param value: The calendar recurrence rule.
+        :return: The recurrence rule (RRULE).
+        """
+        rule = icalendar.vRecur(value)
+        if "UNTIL" in rule:
+            rule["UNTIL"] = [
+                Schedule.__get_datetime(until).astimezone(tz.tzutc())
+                for until in rule["UNTIL"] if isinstance(until, (date, datetime))
+            ]
+        return "RRULE:" + rule.to_ical().decode()
 
     @staticmethod
     def __load_schedule(path: str):
@@ -62,31 +398,263 @@ class Schedule:
         Loads the schedule from a schedule file.
 
         :param path: The storage path of the schedule file.
-        :return: The list of scheduled courses.
+        :return: The sorted list of one-off courses and the list of recurring courses.
         """
         # Read the schedule.
-        file = open(path, "r")
-        schedule = icalendar.Calendar.from_ical(file.read())
+        with open(path, "r") as file:
+            schedule = icalendar.Calendar.from_ical(file.read())
 
         # Save the courses.
         courses = []
-        for component in schedule.walk():
-            if component.name == "VEVENT":
-                # Get the course.
-                summary = component.get("summary")
-                start = component.get("dtstart").dt
-                end = component.get("dtend").dt
-
-                # Validate the course.
-                if isinstance(summary, str) and isinstance(start, datetime) and isinstance(end, datetime):
-                    course = Course(summary, start, end)
-                    courses.append(course)
+        recurrences = {}
+        overrides = []
+        Schedule.__read_events(schedule, courses, recurrences, overrides)
+
+        return Schedule.__sort_courses(courses, recurrences, overrides)
+
+    @staticmethod
+    def __read_events(schedule: icalendar.Calendar, courses: list, recurrences: dict, overrides: list):
+        """
+        Reads the courses of the events of a calendar.
+
+        :param schedule: The calendar.
+        :param courses: The list of one-off courses to extend.
+        :param recurrences: The recurring courses to extend, by identifier.
+        :param overrides: The list of overridden occurrences to extend (as identifier and date).
+        """
+        for component in schedule.walk("VEVENT"):
+            # Get the course.
+            summary = component.get("summary")
+            start = component.get("dtstart")
+            end = component.get("dtend")
+            duration = component.get("duration")
+
+            # Validate the course.
+            if not isinstance(summary, str) or start is None or not isinstance(start.dt, (date, datetime)):
+                continue
+
+            # Get the course dates (all-day courses last until the end of the day).
+            start = Schedule.__get_datetime(start.dt)
+            if end is not None and isinstance(end.dt, (date, datetime)):
+                end = Schedule.__get_datetime(end.dt)
+            elif duration is not None:
+                end = start + duration.dt
+            elif not isinstance(component.get("dtstart").dt, datetime):
+                end = Schedule.__get_datetime(component.get("dtstart").dt + timedelta(1))
+            else:
+                end = start
+            start_timestamp = int(start.timestamp())
+            end_timestamp = max(int(end.timestamp()), start_timestamp)
+
+            # Overridden occurrence.
+            identifier = str(component.get("uid", ""))
+            if component.get("recurrence-id") is not None:
+                overrides.append((identifier, Schedule.__get_datetime(component.get("recurrence-id").dt)))
+
+            # Recurring course (skipped if its rule is invalid).
+            rule = component.get("rrule")
+            dates = component.get("rdate")
+            if rule is not None or dates is not None:
+                try:
+                    recurrence = Recurrence(
+                        identifier,
+                        summary,
+                        start,
+                        end_timestamp - start_timestamp,
+                        Schedule.__get_rule(rule) if rule is not None else None
+                    )
+                except ValueError:
+                    continue
+                if dates is not None:
+                    for recurrence_date in Schedule.__get_dates(dates):
+                        recurrence.add_date(recurrence_date)
+                if component.get("exdate") is not None:
+                    for exception_date in Schedule.__get_dates(component.get("exdate")):
+                        recurrence.add_exception(exception_date)
+                recurrences[identifier] = recurrence
+
+            # One-off course.
+            else:
+                courses.append(Course(summary, start_timestamp, end_timestamp))
+
+    @staticmethod
+    def __sort_courses(courses: list, recurrences: dict, overrides: list):
+        """
+        Returns the courses of a schedule once all its events are read.
+
+        :param courses: The list of one-off courses.
+        :param recurrences: The recurring courses, by identifier.
+        :param overrides: The list of overridden occurrences (as identifier and date).
+        :return: The sorted list of one-off courses and the list of recurring courses.
+        """
+        # Remove the overridden occurrences.
+        for identifier, recurrence_date in overrides:
+            if identifier in recurrences:
+                recurrences[identifier].add_exception(recurrence_date)
 
         # Sort the courses by start date.
         courses.sort(key=lambda x: x.start)
-        file.close()
 
-        return courses
+        return courses, list(recurrences.values())
+
+    def __get_window(self, index: tuple, window: int):
+        """
+        Returns the expanded recurring courses of a window.
+        The window also holds the occurrences that started before it and may still be running.
+
+        :param index: The index of the schedule.
+        :param window: The window number.
+        :return: The sorted list of courses, their starts and the running maximum of their ends.
+        """
+        _, _, _, recurrences, windows = index
+
+        # Cached window.
+        with self.__lock:
+            if window in windows:
+                windows.move_to_end(window)
+                return windows[window]
+
+        # Expand the recurring courses.
+        start = window * self.WINDOW
+        end = start + self.WINDOW
+        courses = sorted(
+            (
+                course
+                for recurrence in recurrences
+                for course in recurrence.get_courses(start - recurrence.duration, end)
+            ),
+            key=lambda x: x.start
+        )
+        result = (
+            courses,
+            [course.start for course in courses],
+            list(accumulate((course.end for course in courses), max))
+        )
+
+        # Cache the window.
+        with self.__lock:
+            windows[window] = result
+            while len(windows) > self.WINDOW_CACHE:
+                windows.popitem(last=False)
+
+        return result
+
+    @staticmethod
+    def __find_courses(courses: list, starts: list, ends: list, timestamp: int):
+        """
+        Returns the current and the next courses at a given time from sorted courses.
+
+        :param courses: The sorted list of courses.
+        :param starts: The starts of the courses.
+        :param ends: The running maximum of the ends of the courses.
+        :param timestamp: The UTC timestamp to check.
+        :return: The current course and the next course, if any.
+        """
+        # Courses that started before the time.
+        index = bisect_right(starts, timestamp)
+
+        # First of these courses that has not ended yet.
+        current_index = bisect_right(ends, timestamp, 0, index)
+        current_course = courses[current_index] if current_index < index else None
+
+        # First course that starts after the time.
+        next_course = courses[index] if index < len(courses) else None
+
+        return current_course, next_course
+
+    @staticmethod
+    def __get_first(first, second):
+        """
+        Returns the course that starts first.
+
+        :param first: The first course, if any.
+        :param second: The second course, if any.
+        :return: The course that starts first, if any.
+        """
+        if first is None or (second is not None and second.start < first.start):
+            return second
+        return first
+
+    def get_courses_between(self, start: int, end: int):
+        """
+        Returns the courses that overlap a time window, including the recurring ones.
+
+        :param start: The window start (as a UTC timestamp).
+        :param end: The window end (as a UTC timestamp).
+        :return: The sorted list of courses.
+        """
+        index = self.__index
+        courses, starts, ends, recurrences, _ = index
+
+        # One-off courses.
+        results = [
+            course for course in courses[bisect_right(ends, start):bisect_left(starts, end)]
+            if course.end > start
+        ]
+
+        # Recurring courses.
+        if recurrences:
+            for window in range(start // self.WINDOW, (end - 1) // self.WINDOW + 1):
+                window_start = window * self.WINDOW
+                window_courses, window_starts, window_ends = self.__get_window(index, window)
+                results.extend(
+                    course for course in window_courses
+                    if course.end > start and course.start < end and
+                    (course.start >= window_start or window == start // self.WINDOW)
+                )
+            results.sort(key=lambda x: x.start)
+
+        return results
+
+    def get_all_courses(self, horizon: timedelta = timedelta(365), anchor: datetime = None):
+        """
+        Returns all the courses, with the recurring courses expanded until their end,
+        or until a horizon after an anchor for the ones without end.
+        By default, the anchor is the first occurrence of each recurring course, so that the courses only depend on
+        the schedule data.
+
+        :param horizon: The duration after the anchor until which a recurring course without end is expanded.
+        :param anchor: The datetime from which the horizon starts, the first occurrence by default.
+        :return: The sorted list of courses.
+        """
+        courses, _, _, recurrences, _ = self.__index
+        if not recurrences:
+            return courses
+
+        # Expand the recurring courses.
+        results = list(courses)
+        for recurrence in recurrences:
+            results.extend(recurrence.get_all_courses(horizon, anchor))
+        results.sort(key=lambda x: x.start)
+        return results
+
+    def get_courses(self, timestamp: int):
+        """
+        Returns the current and the next courses at a given time.
+
+        :param timestamp: The UTC timestamp to check.
+        :return: The current course and the next course, if any.
+        """
+        index = self.__index
+        courses, starts, ends, recurrences, _ = index
+
+        # One-off courses.
+        current_course, next_course = self.__find_courses(courses, starts, ends, timestamp)
+
+        # Recurring courses.
+        if recurrences:
+            window = self.__get_window(index, timestamp // self.WINDOW)
+            current_recurrence, next_recurrence = self.__find_courses(*window, timestamp)
+
+            # Next occurrence after the window.
+            if next_recurrence is None:
+                for recurrence in recurrences:
+                    next_recurrence = self.__get_first(next_recurrence, recurrence.get_next_course(timestamp))
+
+            current_course = self.__get_first(current_course, current_recurrence)
+            next_course = self.__get_first(next_course, next_recurrence)
+
+        return current_course, next_course
 
     def is_available(self, date: datetime = datetime.now()):
         """
@@ -95,19 +663,9 @@ class Schedule:
         :param date: The datetime to check.
         :return: Whether the schedule is free at the given datetime.
         """
-        # Convert datetime to UTC timezone.
-        date = date.astimezone(tz.tzutc())
-
-        # Browse sorted courses.
-        for course in self.courses:
-            # Current course.
-            if course.start <= date < course.end:
-                return False
-            # No current course.
-            if date < course.start:
-                return True
         # No current course.
-        return True
+        current_course, _ = self.get_courses(int(date.timestamp()))
+        return current_course is None
 
     def get_current_course(self, date: datetime = datetime.now()):
         """
@@ -116,19 +674,9 @@ class Schedule:
         :param date: The datetime to check.
         :return: The current course, if any.
         """
-        # Convert datetime to UTC timezone.
-        date = date.astimezone(tz.tzutc())
-
-        # Browse sorted courses.
-        for course in self.courses:
-            # Current course.
-            if course.start <= date < course.end:
-                return course
-            # No current course.
-            if date < course.start:
-                return None
-        # No current course.
-        return None
+        # Current course.
+        current_course, _ = self.get_courses(int(date.timestamp()))
+        return current_course
 
     def get_next_course(self, date: datetime = datetime.now()):
         """
@@ -137,14 +685,9 @@ class Schedule:
         :param date: The datetime to check.
         :return: The next course, if any.
         """
-        # Convert datetime to UTC timezone.
-        date = date.astimezone(tz.tzutc())
-
-        # Browse sorted courses.
-        for course in self.courses:
-            if date < course.start:
-                return course
-        return None
+        # Next course.
+        _, next_course = self.get_courses(int(date.timestamp()))
+        return next_course
 
     def get_available_duration(self, date: datetime = datetime.now()):
         """
@@ -154,13 +697,11 @@ class Schedule:
         :param date: The datetime to check.
         :return: The duration until the next course, if any.
         """
-        # Convert datetime to UTC timezone.
-        date = date.astimezone(tz.tzutc())
-
         # Duration until the next course.
-        next_course = self.get_next_course(date)
+        timestamp = int(date.timestamp())
+        _, next_course = self.get_courses(timestamp)
         if next_course is not None:
-            return next_course.start - date
+            return timedelta(seconds=next_course.start - timestamp)
 
         # No next course.
         return timedelta(365)
@@ -173,13 +714,11 @@ class Schedule:
         :param date: The datetime to check.
         :return: The duration until the end of the current course, if any.
         """
-        # Convert datetime to UTC timezone.
-        date = date.astimezone(tz.tzutc())
-
         # Duration until the end of the current course.
-        current_course = self.get_current_course(date)
+        timestamp = int(date.timestamp())
+        current_course, _ = self.get_courses(timestamp)
         if current_course is not None:
-            return current_course.end - date
+            return timedelta(seconds=current_course.end - timestamp)
 
         # No current course.
         return timedelta(0)
@@ -0,0 +1,163 @@
+# Data.
+import numpy as np
+
+# Types.
+from typing import List
+
+# Classrooms.
+from classroom import Classroom
+from schedule import Schedule
+
+# Dates.
+from datetime import timedelta
+from time import time
+
+# Threading.
+from threading import Lock
+
+
+class SlotIndex:
+    """
+    Represents the availability of the classrooms over the coming weeks, in fixed slots.
+
+    Each slot holds a bitset of the classrooms available at its start, and a table holds the number of slots
+    each classroom stays available from the start of each slot, so that the availability filters at slot boundaries
+    are answered without the schedules. The slots of a classroom are only computed again when its schedule changes.
+    """
+
+    # The maximum number of available slots stored (longer durations are checked on the schedules).
+    MAX_RUN = 255
+
+    # The duration after which the slots are computed again from the current time.
+    SHIFT = timedelta(1)
+
+    def __init__(
+        self,
+        classrooms: List[Classroom],
+        slot: timedelta = timedelta(minutes=15),
+        horizon: timedelta = timedelta(weeks=4)
+    ):
+        """
+        Initializes the slot index.
+
+        :param classrooms: The list of classrooms.
+        :param slot: The duration of a slot.
+        :param horizon: The duration after now covered by the slots.
+        """
+        self.classrooms = classrooms
+        self.slot = int(slot.total_seconds())
+        self.slots = int(horizon.total_seconds()) // self.slot
+        self.start = None
+        self.versions = [None] * len(classrooms)
+        self.known = np.zeros(len(classrooms), dtype=bool)
+        self.available = np.zeros((self.slots, (len(classrooms) + 7) // 8), dtype=np.uint8)
+        self.runs = np.zeros((self.slots, len(classrooms)), dtype=np.uint8)
+        self.__lock = Lock()
+
+    def __get_slots(self, schedule: Schedule):
+        """
+        Returns the availability of a schedule at the start of each slot,
+        and the number of slots during which it stays available.
+
+        :param schedule: The classroom schedule.
+        :return: The availability and the number of available slots, for each slot.
+        """
+        times = self.start + self.slot * np.arange(self.slots, dtype=np.int64)
+        end = self.start + self.slot * self.slots
+
+        # Courses within the slots.
+        courses = schedule.get_courses_between(self.start, end)
+        starts = np.sort(np.array([course.start for course in courses], dtype=np.int64))
+        ends = np.sort(np.array([course.end for course in courses], dtype=np.int64))
+
+        # Available at the start of the slot (no course started and not ended yet).
+        started = np.searchsorted(starts, times, side="right")
+        available = started == np.searchsorted(ends, times, side="right")
+
+        # Available slots until the next course (unknown after the last slot).
+        next_starts = np.append(starts, np.iinfo(np.int64).max)[started]
+        runs = np.where(next_starts < end, (next_starts - times) // self.slot, self.MAX_RUN)
+        runs = np.where(available, np.minimum(runs, self.MAX_RUN), 0)
+
+        return available, runs.astype(np.uint8)
+
+    def update(self):
+        """
+        Updates the slots of the classrooms whose schedule has changed,
+        or of all the classrooms once the slots start too long ago.
+
+        :return: Whether the slots have changed.
+        """
+        with self.__lock:
+            # Start the slots from now.
+            start = int(time()) // self.slot * self.slot
+            if self.start is None or start - self.start >= self.SHIFT.total_seconds():
+                self.start = start
+                self.versions = [None] * len(self.classrooms)
+
+            # Changed schedules.
+            changed = {
+                position: classroom.schedule.version
+                for position, classroom in enumerate(self.classrooms)
+                if classroom.schedule is not None and classroom.schedule.version != self.versions[position]
+            }
+            if not changed:
+                return False
+
+            for position, version in changed.items():
+                schedule = self.classrooms[position].schedule
+                self.versions[position] = version
+
+                # Compute the slots of the classroom.
+                self.known[position] = schedule.is_loaded()
+                if self.known[position]:
+                    available, runs = self.__get_slots(schedule)
+                else:
+                    available, runs = np.zeros(self.slots, dtype=bool), np.zeros(self.slots, dtype=np.uint8)
+
+                # Set the bit of the classroom in each slot.
+                byte, bit = divmod(position, 8)
+                mask = np.uint8(0x80 >> bit)
+                bits = np.where(available, mask, 0).astype(np.uint8)
+                self.available[:, byte] = (self.available[:, byte] & ~mask) | bits
+                self.runs[:, position] = runs
+            return True
+
+    def get_mask(self, timestamp: int, available: bool = True, duration: timedelta = None):
+        """
+        Returns the classrooms matching the availability filters at a slot boundary.
+
+        :param timestamp: The UTC timestamp to check.
+        :param available: Whether the classrooms must be available (None for all the classrooms).
+        :param duration: The minimum availability duration, if any.
+        :return: The boolean array of the matching classrooms, or None if the time or duration does not fit the slots.
+        """
+        self.update()
+
+        # Time on a slot boundary.
+        if timestamp % self.slot != 0:
+            return None
+        index = (timestamp - self.start) // self.slot
+        if index < 0 or index >= self.slots:
+            return None
+
+        # Availability.
+        if duration is None:
+            if available is None:
+                return np.ones(len(self.classrooms), dtype=bool)
+            mask = np.unpackbits(self.available[index], count=len(self.classrooms)).astype(bool)
+            return mask if available else self.known & ~mask
+
+        # Duration as a number of slots within the slots.
+        seconds = int(duration.total_seconds())
+        if seconds % self.slot != 0 or seconds // self.slot >= self.MAX_RUN:
+            return None
+        if index + seconds // self.slot > self.slots:
+            return None
+
+        # Minimum availability duration (never matching unavailable classrooms).
+        if available is False:
+            return np.zeros(len(self.classrooms), dtype=bool)
+        if seconds == 0:
+            return np.unpackbits(self.available[index], count=len(self.classrooms)).astype(bool)
+        return self.runs[index] >= seconds // self.slot
@@ -0,0 +1,295 @@
+# System.
+import os
+import struct
+
+# Data.
+import numpy as np
+
+# Hyperplanning.
+from hyperplanning import Hyperplanning
+
+# Dates.
+from datetime import datetime, timedelta
+from time import time_ns
+
+
+class Snapshot:
+    """
+    Represents a read-only columnar snapshot of the schedules shared across processes.
+
+    The snapshot file is made of a header followed by 8-byte aligned sections:
+    - the room table (offsets of the courses of each room),
+    - the loaded flags of the room schedules (the rooms without schedule data having no courses),
+    - the time of the schedule data of each room (as UTC timestamps),
+    - the course starts, ends and running maximum of ends (as UTC timestamps),
+    - the course summaries (as identifiers of the string table),
+    - the string table (offsets and UTF-8 data), starting with the room names.
+    """
+
+    # The magic number of the snapshot files.
+    MAGIC = b"HPSNAP\0\0"
+
+    # The version of the snapshot format.
+    VERSION = 3
+
+    # The header format: magic, version, generation, rooms, courses, strings, string bytes.
+    HEADER = struct.Struct("<8sIxxxxqqqqq")
+
+    def __init__(self, path: str):
+        """
+        Initializes the snapshot.
+
+        :param path: The storage path of the snapshot file.
+        """
+        self.path = path
+        self.stat = None
+        self.__open()
+
+    def __open(self):
+        """
+        Maps the snapshot file into memory.
+        """
+        # Map the file.
+        stat = os.stat(self.path)
+        data = np.memmap(self.path, dtype=np.uint8, mode="r")
+
+        # Read the header.
+        magic, version, generation, rooms, courses, strings, string_bytes = \
+            self.HEADER.unpack_from(data[:self.HEADER.size].tobytes())
+        if magic != self.MAGIC:
+            raise ValueError(f"Invalid snapshot file '{self.path}'.")
+        if version != self.VERSION:
+            raise ValueError(f"Unsupported snapshot version {version} in '{self.path}'.")
+
+        # Map the sections.
+        sections = self.__get_sections(rooms, courses, strings, string_bytes)
+        self.generation = generation
+        self.room_offsets = self.__get_section(data, sections["room_offsets"], np.int64)
+        self.loaded = self.__get_section(data, sections["loaded"], np.uint8)
+        self.updated = self.__get_section(data, sections["updated"], np.int64)
+        self.starts = self.__get_section(data, sections["starts"], np.int64)
+        self.ends = self.__get_section(data, sections["ends"], np.int64)
+        self.max_ends = self.__get_section(data, sections["max_ends"], np.int64)
+        self.summaries = self.__get_section(data, sections["summaries"], np.int64)
+        self.string_offsets = self.__get_section(data, sections["string_offsets"], np.int64)
+        self.string_data = self.__get_section(data, sections["string_data"], np.uint8)
+        self.names = [self.get_string(index) for index in range(rooms)]
+        self.stat = stat
+
+    @staticmethod
+    def __get_section(data: np.memmap, section: tuple, dtype):
+        """
+        Returns a read-only view of a section of the snapshot file.
+
+        :param data: The mapped snapshot file.
+        :param section: The offset and the size (in bytes) of the section.
+        :param dtype: The type of the section items.
+        :return: The view of the section.
+        """
+        offset, size = section
+        return data[offset:offset + size].view(dtype)
+
+    @staticmethod
+    def __get_sections(rooms: int, courses: int, strings: int, string_bytes: int):
+        """
+        Returns the location of the sections of a snapshot file.
+
+        :param rooms: The number of rooms.
+        :param courses: The number of courses.
+        :param strings: The number of strings.
+        :param string_bytes: The size of the string data.
+        :return: The dictionary of section offsets and sizes (in bytes).
+        """
+        sizes = [
+            ("room_offsets", (rooms + 1) * 8),
+            ("loaded", rooms),
+            ("updated", rooms * 8),
+            ("starts", courses * 8),
+            ("ends", courses * 8),
+            ("max_ends", courses * 8),
+            ("summaries", courses * 8),
+            ("string_offsets", (strings + 1) * 8),
+            ("string_data", string_bytes)
+        ]
+
+        sections = {}
+        offset = Snapshot.HEADER.size
+        for name, size in sizes:
+            offset = (offset + 7) // 8 * 8
+            sections[name] = (offset, size)
+            offset += size
+        return sections
+
+    @staticmethod
+    def write(hyperplanning: Hyperplanning, path: str):
+        """
+        Writes a snapshot of the schedules of the hyperplanning.
+        The snapshot is published by an atomic rename, so readers never see a partial file.
+
+        :param hyperplanning: The hyperplanning object.
+        :param path: The storage path of the snapshot file.
+        """
+        # Build the string table.
+        strings = [classroom.name for classroom in hyperplanning.classrooms]
+        string_ids = {}
+
+        # Build the course columns.
+        room_offsets = [0]
+        loaded = []
+        updated = []
+        starts, ends, max_ends, summaries = [], [], [], []
+        for classroom in hyperplanning.classrooms:
+            max_end = None
+            loaded.append(classroom.schedule is not None and classroom.schedule.is_loaded())
+            updated.append(int(classroom.schedule.data_updated.timestamp()) if loaded[-1] else 0)
+            courses = classroom.schedule.get_all_courses(anchor=classroom.schedule.data_updated) if loaded[-1] else []
+            for course in courses:
+                max_end = course.end if max_end is None else max(max_end, course.end)
+                if course.description not in string_ids:
+                    string_ids[course.description] = len(strings)
+                    strings.append(course.description)
+                starts.append(course.start)
+                ends.append(course.end)
+                max_ends.append(max_end)
+                summaries.append(string_ids[course.description])
+            room_offsets.append(len(starts))
+
+        # Encode the string table.
+        encoded = [string.encode("utf-8") for string in strings]
+        string_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(string) for string in encoded], out=string_offsets[1:])
+        string_data = b"".join(encoded)
+
+        # Write the sections.
+        sections = Snapshot.__get_sections(len(hyperplanning.classrooms), len(starts), len(strings), len(string_data))
+        contents = {
+            "room_offsets": np.asarray(room_offsets, dtype=np.int64).tobytes(),
+            "loaded": np.asarray(loaded, dtype=np.uint8).tobytes(),
+            "updated": np.asarray(updated, dtype=np.int64).tobytes(),
+            "starts": np.asarray(starts, dtype=np.int64).tobytes(),
+            "ends": np.asarray(ends, dtype=np.int64).tobytes(),
+            "max_ends": np.asarray(max_ends, dtype=np.int64).tobytes(),
+            "summaries": np.asarray(summaries, dtype=np.int64).tobytes(),
+            "string_offsets": string_offsets.tobytes(),
+            "string_data": string_data
+        }
+
+        # Write a temporary file.
+        folder = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        temporary_path = "{path}.{pid}.tmp".format(path=path, pid=os.getpid())
+        with open(temporary_path, "wb") as file:
+            file.write(Snapshot.HEADER.pack(
+                Snapshot.MAGIC,
+                Snapshot.VERSION,
+                time_ns(),
+                len(hyperplanning.classrooms),
+                len(starts),
+                len(strings),
+                len(string_data)
+            ))
+            for name, (offset, size) in sections.items():
+                file.write(b"\0" * (offset - file.tell()))
+                file.write(contents[name])
+            file.flush()
+            os.fsync(file.fileno())
+
+        # Publish the snapshot.
+        os.replace(temporary_path, path)
+
+    def refresh(self):
+        """
+        Maps the latest published snapshot, if it has changed.
+
+        :return: Whether a new snapshot has been mapped.
+        """
+        stat = os.stat(self.path)
+        if (stat.st_ino, stat.st_mtime_ns) == (self.stat.st_ino, self.stat.st_mtime_ns):
+            return False
+        self.__open()
+        return True
+
+    def get_string(self, index: int):
+        """
+        Returns a string of the string table.
+
+        :param index: The string identifier.
+        :return: The string.
+        """
+        return self.string_data[self.string_offsets[index]:self.string_offsets[index + 1]].tobytes().decode("utf-8")
+
+    def get_courses(self, name: str):
+        """
+        Returns the courses of a room.
+
+        :param name: The room name.
+        :return: The list of courses (as description, start and end UTC timestamps), if the schedule is known.
+        """
+        room = self.names.index(name)
+        if not self.loaded[room]:
+            return None
+        start, end = self.room_offsets[room], self.room_offsets[room + 1]
+        return [
+            (self.get_string(self.summaries[index]), int(self.starts[index]), int(self.ends[index]))
+            for index in range(start, end)
+        ]
+
+    def get_updated(self, name: str):
+        """
+        Returns the time of the schedule data of a room.
+
+        :param name: The room name.
+        :return: The UTC timestamp of the schedule data, if the schedule is known.
+        """
+        room = self.names.index(name)
+        return int(self.updated[room]) if self.loaded[room] else None
+
+    def is_available(self, room: int, timestamp: int, duration: int = 0):
+        """
+        Checks if a room is free at a given time.
+
+        :param room: The room index.
+        :param timestamp: The UTC timestamp to check.
+        :param duration: The minimum availability duration (in seconds).
+        :return: Whether the room is free at the given time for the given duration (None if its schedule is unknown).
+        """
+        # No schedule data.
+        if not self.loaded[room]:
+            return None
+
+        start, end = self.room_offsets[room], self.room_offsets[room + 1]
+
+        # Courses that started before the time.
+        index = start + np.searchsorted(self.starts[start:end], timestamp, side="right")
+
+        # Current course.
+        if index > start and self.max_ends[index - 1] > timestamp:
+            return False
+
+        # Next course.
+        return index == end or self.starts[index] - timestamp >= duration
+
+    def get_classrooms(self, available: bool = True, duration: timedelta = None, date: datetime = datetime.now()):
+        """
+        Returns the names of the rooms with a given availability.
+
+        :param available: Whether the rooms must be available (None for all the rooms, even with unknown schedules).
+        :param duration: The minimum availability duration.
+        :param date: The datetime to check for availability.
+        :return: The list of room names.
+        """
+        timestamp = int(date.timestamp())
+        seconds = int(duration.total_seconds()) if duration is not None else 0
+        results = []
+        for room, name in enumerate(self.names):
+            # Filter by availability.
+            if available is not None and self.is_available(room, timestamp) != available:
+                continue
+
+            # Filter by duration.
+            if duration is not None and not self.is_available(room, timestamp, seconds):
+                continue
+
+            results.append(name)
+        return results
@@ -0,0 +1,317 @@
+# System.
+import sqlite3
+
+# Data.
+import pandas as pd
+
+# Hyperplanning.
+from hyperplanning import Hyperplanning
+
+# Dates.
+from datetime import datetime, timedelta
+
+
+class Store:
+    """
+    Represents a SQLite storage of the schedule system.
+    """
+
+    # The database schema.
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS locations (
+            type TEXT NOT NULL,
+            alias TEXT NOT NULL,
+            name TEXT,
+            indication TEXT,
+            PRIMARY KEY (type, alias)
+        );
+        CREATE TABLE IF NOT EXISTS classrooms (
+            name TEXT PRIMARY KEY,
+            description TEXT,
+            floor INTEGER,
+            sub_building TEXT,
+            building TEXT,
+            location TEXT,
+            places INTEGER,
+            outlets INTEGER,
+            computers INTEGER,
+            projector INTEGER NOT NULL,
+            audio INTEGER NOT NULL,
+            schedule_id TEXT
+        );
+        CREATE TABLE IF NOT EXISTS courses (
+            room TEXT NOT NULL,
+            start_time INTEGER NOT NULL,
+            end_time INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            PRIMARY KEY (room, start_time, end_time, description)
+        );
+        CREATE INDEX IF NOT EXISTS courses_room_start ON courses (room, start_time);
+        CREATE INDEX IF NOT EXISTS courses_room_end ON courses (room, end_time);
+    """
+
+    # The location types.
+    LOCATION_TYPES = ["sub_building", "building", "location"]
+
+    def __init__(self, path: str):
+        """
+        Initializes the store.
+
+        :param path: The storage path of the database.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(self.SCHEMA)
+
+    def close(self):
+        """
+        Closes the store.
+        """
+        self.connection.close()
+
+    @staticmethod
+    def __get_value(value):
+        """
+        Returns a value that can be stored in the database.
+
+        :param value: The value.
+        :return: The value, or None if the value is not defined.
+        """
+        if value is None or pd.isna(value):
+            return None
+        return value
+
+    @staticmethod
+    def __get_number(value):
+        """
+        Returns a number that can be stored in the database.
+
+        :param value: The number.
+        :return: The integer number, or None if the number is not defined.
+        """
+        value = Store.__get_value(value)
+        return int(value) if value is not None else None
+
+    def save(self, hyperplanning: Hyperplanning):
+        """
+        Saves the locations, the classrooms and the courses of the hyperplanning.
+        The refresh is done in a single transaction.
+
+        :param hyperplanning: The hyperplanning object.
+        """
+        with self.connection:
+            # Save the locations.
+            for location_type, locations in zip(
+                self.LOCATION_TYPES,
+                [hyperplanning.sub_buildings, hyperplanning.buildings, hyperplanning.locations]
+            ):
+                self.connection.executemany(
+                    """
+                    INSERT INTO locations (type, alias, name, indication) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (type, alias) DO UPDATE SET name = excluded.name, indication = excluded.indication
+                    """,
+                    [
+                        (location_type, location.alias, location.name, self.__get_value(location.indication))
+                        for location in locations.values() if location is not None
+                    ]
+                )
+
+            # Save the classrooms.
+            self.connection.executemany(
+                """
+                INSERT INTO classrooms (name, description, floor, sub_building, building, location, places, outlets,
+                    computers, projector, audio, schedule_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    description = excluded.description,
+                    floor = excluded.floor,
+                    sub_building = excluded.sub_building,
+                    building = excluded.building,
+                    location = excluded.location,
+                    places = excluded.places,
+                    outlets = excluded.outlets,
+                    computers = excluded.computers,
+                    projector = excluded.projector,
+                    audio = excluded.audio,
+                    schedule_id = excluded.schedule_id
+                """,
+                [
+                    (
+                        classroom.name,
+                        self.__get_value(classroom.description),
+                        self.__get_number(classroom.floor),
+                        classroom.sub_building.alias if classroom.sub_building is not None else None,
+                        classroom.building.alias if classroom.building is not None else None,
+                        classroom.location.alias if classroom.location is not None else None,
+                        self.__get_number(classroom.places),
+                        self.__get_number(classroom.outlets),
+                        self.__get_number(classroom.computers),
+                        int(classroom.projector),
+                        int(classroom.audio),
+                        classroom.schedule.identifier if classroom.schedule is not None else None
+                    )
+                    for classroom in hyperplanning.classrooms
+                ]
+            )
+
+            # Stage the courses of the loaded schedules (the other classrooms keep their stored courses).
+            loaded = [
+                classroom for classroom in hyperplanning.classrooms
+                if classroom.schedule is not None and classroom.schedule.is_loaded()
+            ]
+            self.connection.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS new_courses (
+                    room TEXT NOT NULL,
+                    start_time INTEGER NOT NULL,
+                    end_time INTEGER NOT NULL,
+                    description TEXT NOT NULL,
+                    PRIMARY KEY (room, start_time, end_time, description)
+                )
+                """
+            )
+            self.connection.execute("DELETE FROM new_courses")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO new_courses (room, start_time, end_time, description) VALUES (?, ?, ?, ?)",
+                [
+                    (classroom.name, course.start, course.end, course.description)
+                    for classroom in loaded
+                    for course in classroom.schedule.get_all_courses(anchor=classroom.schedule.data_updated)
+                ]
+            )
+
+            # Stage the classrooms of the loaded schedules.
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS new_rooms (room TEXT PRIMARY KEY)")
+            self.connection.execute("DELETE FROM new_rooms")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO new_rooms (room) VALUES (?)",
+                [(classroom.name,) for classroom in loaded]
+            )
+
+            # Remove the courses that are not scheduled anymore.
+            self.connection.execute(
+                """
+                DELETE FROM courses
+                WHERE room IN (SELECT room FROM new_rooms)
+                AND NOT EXISTS (
+                    SELECT 1 FROM new_courses AS new
+                    WHERE new.room = courses.room
+                    AND new.start_time = courses.start_time
+                    AND new.end_time = courses.end_time
+                    AND new.description = courses.description
+                )
+                """
+            )
+
+            # Add the new courses.
+            self.connection.execute(
+                """
+                INSERT INTO courses (room, start_time, end_time, description)
+                SELECT room, start_time, end_time, description FROM new_courses WHERE true
+                ON CONFLICT DO NOTHING
+                """
+            )
+
+    def get_classrooms(
+        self,
+        name: str = None,
+        floor: int = None,
+        sub_building: str = None,
+        building: str = None,
+        location: str = None,
+        places: int = None,
+        outlets: int = None,
+        computers: int = None,
+        projector: bool = None,
+        audio: bool = None,
+        available: bool = True,
+        duration: timedelta = None,
+        date: datetime = datetime.now(),
+    ):
+        """
+        Returns a filtered list of classrooms from the database.
+        The filters are the same as the ones of the hyperplanning.
+
+        :param name: The name to find.
+        :param floor: The floor to find.
+        :param sub_building: The sub-building to find.
+        :param building: The building to find.
+        :param location: The location to find.
+        :param places: The minimum number of places.
+        :param outlets: The minimum number of outlets.
+        :param computers: The minimum number of computers.
+        :param projector: Whether the classroom has a projector.
+        :param audio: Whether the classroom has an audio system.
+        :param available: Whether the classroom must be available.
+        :param duration: The minimum availability duration.
+        :param date: The datetime to check for availability.
+        :return: The list of filtered classrooms (as database rows).
+        """
+        conditions = []
+        parameters = {"date": int(date.timestamp())}
+
+        # Filter by name.
+        if name is not None:
+            conditions.append("c.name = :name")
+            parameters["name"] = name
+
+        # Filter by floor.
+        if floor is not None:
+            conditions.append("c.floor = :floor")
+            parameters["floor"] = floor
+
+        # Filter by location.
+        for location_type, location_value in zip(self.LOCATION_TYPES, [sub_building, building, location]):
+            if location_value is not None:
+                conditions.append(
+                    f"""
+                    EXISTS (
+                        SELECT 1 FROM locations AS l
+                        WHERE l.type = '{location_type}' AND l.alias = c.{location_type}
+                        AND (l.alias = :{location_type} OR l.name = :{location_type})
+                    )
+                    """
+                )
+                parameters[location_type] = location_value
+
+        # Filter by minimum values.
+        for value_name, min_value in [("places", places), ("outlets", outlets), ("computers", computers)]:
+            if min_value is not None:
+                conditions.append(f"c.{value_name} >= :{value_name}")
+                parameters[value_name] = min_value
+
+        # Filter by equipment.
+        for value_name, expected_value in [("projector", projector), ("audio", audio)]:
+            if expected_value is not None:
+                conditions.append(f"c.{value_name} = :{value_name}")
+                parameters[value_name] = int(expected_value)
+
+        # Filter by availability.
+        busy = """
+            EXISTS (
+                SELECT 1 FROM courses AS s
+                WHERE s.room = c.name AND s.end_time > :date AND s.start_time <= :date
+            )
+        """
+        if available is not None:
+            conditions.append(("NOT " if available else "") + busy)
+
+        # Filter by duration.
+        if duration is not None:
+            conditions.append(
+                """
+                NOT EXISTS (
+                    SELECT 1 FROM courses AS s
+                    WHERE s.room = c.name AND s.end_time > :date AND s.start_time < :date_end
+                )
+                """
+            )
+            parameters["date_end"] = parameters["date"] + int(duration.total_seconds())
+
+        # Query the classrooms.
+        query = "SELECT c.* FROM classrooms AS c"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY c.rowid"
+        return self.connection.execute(query, parameters).fetchall()
@@ -0,0 +1,178 @@
+# Data.
+import numpy as np
+
+# Types.
+from typing import List
+
+# Classrooms.
+from classroom import Classroom
+from schedule import Schedule
+
+# Dates.
+from datetime import timedelta
+
+# Threading.
+from threading import Lock
+
+
+class TransitionIndex:
+    """
+    Represents the campus-wide sorted list of the changes of availability of the classrooms.
+    The transitions of a classroom are only computed again when its schedule changes.
+    """
+
+    # The classroom becomes available.
+    AVAILABLE = 0
+
+    # The classroom becomes unavailable.
+    UNAVAILABLE = 1
+
+    # The number of transitions checked at once when looking for the next transition.
+    CHUNK = 256
+
+    def __init__(self, classrooms: List[Classroom], horizon: timedelta = timedelta(365)):
+        """
+        Initializes the transition index.
+
+        :param classrooms: The list of classrooms.
+        :param horizon: The duration after the schedule data time until which the recurring courses are expanded.
+        """
+        self.classrooms = classrooms
+        self.horizon = horizon
+        self.positions = {classroom: position for position, classroom in enumerate(classrooms)}
+        self.versions = [None] * len(classrooms)
+        self.__index = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int8))
+        self.__lock = Lock()
+
+    @staticmethod
+    def __get_transitions(schedule: Schedule, horizon: timedelta):
+        """
+        Returns the transitions of a schedule, from its merged busy periods.
+
+        :param schedule: The classroom schedule.
+        :param horizon: The duration after the schedule data time until which the recurring courses are expanded.
+        :return: The list of transitions (as UTC timestamp and kind).
+        """
+        transitions = []
+        start, end = None, None
+        for course in schedule.get_all_courses(horizon, schedule.data_updated):
+            # Overlapping or consecutive course.
+            if end is not None and course.start <= end:
+                end = max(end, course.end)
+                continue
+
+            # New busy period.
+            if end is not None:
+                transitions.append((start, TransitionIndex.UNAVAILABLE))
+                transitions.append((end, TransitionIndex.AVAILABLE))
+            start, end = course.start, course.end
+
+        if end is not None:
+            transitions.append((start, TransitionIndex.UNAVAILABLE))
+            transitions.append((end, TransitionIndex.AVAILABLE))
+        return transitions
+
+    def update(self):
+        """
+        Updates the transitions of the classrooms whose schedule has changed.
+
+        :return: Whether the transitions have changed.
+        """
+        with self.__lock:
+            # Changed schedules.
+            changed = {
+                position: classroom.schedule.version
+                for position, classroom in enumerate(self.classrooms)
+                if classroom.schedule is not None and classroom.schedule.version != self.versions[position]
+            }
+            if not changed:
+                return False
+
+            # Remove the previous transitions.
+            timestamps, rooms, kinds = self.__index
+            kept = ~np.isin(rooms, list(changed))
+            timestamps, rooms, kinds = timestamps[kept], rooms[kept], kinds[kept]
+
+            # Compute the new transitions.
+            new_timestamps, new_rooms, new_kinds = [], [], []
+            for position, version in changed.items():
+                for timestamp, kind in self.__get_transitions(self.classrooms[position].schedule, self.horizon):
+                    new_timestamps.append(timestamp)
+                    new_rooms.append(position)
+                    new_kinds.append(kind)
+                self.versions[position] = version
+            new_timestamps = np.asarray(new_timestamps, dtype=np.int64)
+            order = np.argsort(new_timestamps, kind="stable")
+
+            # Merge the new transitions into the sorted transitions.
+            indexes = np.searchsorted(timestamps, new_timestamps[order], side="right")
+            self.__index = (
+                np.insert(timestamps, indexes, new_timestamps[order]),
+                np.insert(rooms, indexes, np.asarray(new_rooms, dtype=np.int64)[order]),
+                np.insert(kinds, indexes, np.asarray(new_kinds, dtype=np.int8)[order])
+            )
+            return True
+
+    def __get_mask(self, classrooms: List[Classroom]):
+        """
+        Returns the mask of some classrooms.
+
+        :param classrooms: The list of classrooms (None for all the classrooms).
+        :return: The boolean array of the selected classroom positions, if any.
+        """
+        if classrooms is None:
+            return None
+        mask = np.zeros(len(self.classrooms), dtype=bool)
+        mask[[self.positions[classroom] for classroom in classrooms]] = True
+        return mask
+
+    def get_transitions(self, start: int, end: int, classrooms: List[Classroom] = None, kind: int = None):
+        """
+        Returns the transitions within a time range.
+
+        :param start: The range start (as a UTC timestamp, inclusive).
+        :param end: The range end (as a UTC timestamp, exclusive).
+        :param classrooms: The list of classrooms to consider (None for all the classrooms).
+        :param kind: The kind of transitions to consider (None for all the transitions).
+        :return: The list of transitions (as UTC timestamp, classroom and kind).
+        """
+        self.update()
+        timestamps, rooms, kinds = self.__index
+
+        # Transitions within the range.
+        first, last = np.searchsorted(timestamps, [start, end], side="left")
+        selected = np.arange(first, last)
+
+        # Filter by classroom and kind.
+        mask = self.__get_mask(classrooms)
+        if mask is not None:
+            selected = selected[mask[rooms[first:last]]]
+        if kind is not None:
+            selected = selected[kinds[selected] == kind]
+
+        return [(int(timestamps[index]), self.classrooms[rooms[index]], int(kinds[index])) for index in selected]
+
+    def get_next_transition(self, timestamp: int, classrooms: List[Classroom] = None, kind: int = None):
+        """
+        Returns the time of the first transition after a given time.
+
+        :param timestamp: The UTC timestamp.
+        :param classrooms: The list of classrooms to consider (None for all the classrooms).
+        :param kind: The kind of transitions to consider (None for all the transitions).
+        :return: The UTC timestamp of the next transition, if any.
+        """
+        self.update()
+        timestamps, rooms, kinds = self.__index
+        mask = self.__get_mask(classrooms)
+
+        # Check the following transitions by chunks.
+        first = int(np.searchsorted(timestamps, timestamp, side="right"))
+        for chunk in range(first, len(timestamps), self.CHUNK):
+            matching = np.ones(min(self.CHUNK, len(timestamps) - chunk), dtype=bool)
+            if mask is not None:
+                matching &= mask[rooms[chunk:chunk + self.CHUNK]]
+            if kind is not None:
+                matching &= kinds[chunk:chunk + self.CHUNK] == kind
+            if matching.any():
+                return int(timestamps[chunk + int(np.argmax(matching))])
+        return None